@@ -0,0 +1,92 @@
+"""Synthetic corpora of varied shapes for benchmarking.
+
+Each corpus is generated deterministically into a folder such that runs on different machines, or
+revisions, analyze exactly the same code. `scale` multiplies the amount of generated code.
+"""
+import os
+
+MODULES = ("abc", "argparse", "asyncio", "collections", "contextlib", "dataclasses", "enum",
+           "functools", "importlib", "itertools", "json", "pathlib", "re", "typing", "zoneinfo")
+
+MEMBERS = ("abc.ABC", "argparse.ArgumentParser", "asyncio.run", "collections.OrderedDict",
+           "contextlib.nullcontext", "dataclasses.dataclass", "enum.auto", "functools.lru_cache",
+           "importlib.metadata", "itertools.accumulate", "json.JSONDecodeError", "pathlib.Path",
+           "re.fullmatch", "typing.Final", "zoneinfo.ZoneInfo")
+
+def write(folder, name, text):
+  with open(os.path.join(folder, name), mode="w", encoding="utf-8") as fp:
+    fp.write(text)
+
+def function_source(i):
+  """Returns source of a function using a mix of language features."""
+  return """
+@decorator
+def func_{i}(a, b=None, *args, c: int = {i}, **kwargs) -> dict:
+  \"\"\"Docstring of function {i}.\"\"\"
+  values = {{x: y for (x, y) in zip(args, range({i}))}}
+  with open(a) as fp, open(b) as fp2:
+    data = fp.read() + fp2.read()
+  try:
+    result = [v ** 2 for v in values if v % 2 == 0]
+  except (ValueError, TypeError) as ex:
+    raise RuntimeError("failed") from ex
+  finally:
+    pass
+  if (n := len(result)) > {i}:
+    return {{**kwargs, "n": n, "data": data}}
+  return dict(result=result)
+""".format(i=i)
+
+def tiny_files(folder, scale):
+  """Many tiny files."""
+  for i in range(1000 * scale):
+    module = MODULES[i % len(MODULES)]
+    write(folder, "tiny_{}.py".format(i), "import {}\nx = {}\n".format(module, i))
+
+def huge_files(folder, scale):
+  """A few huge files."""
+  for i in range(3):
+    write(folder, "huge_{}.py".format(i),
+          "".join(function_source(j) for j in range(300 * scale)))
+
+def deep_tree(folder, scale):
+  """Deeply nested folders with few files each."""
+  for i in range(10 * scale):
+    path = os.path.join(folder, *["level_{}_{}".format(i, depth) for depth in range(20)])
+    os.makedirs(path)
+    for depth in range(20):
+      path = os.path.dirname(path) if depth > 0 else path
+      write(path, "mod_{}.py".format(depth), function_source(depth))
+
+def import_heavy(folder, scale):
+  """Files with lots of imports and attribute accesses of imported modules."""
+  lines = []
+  for i in range(1000 * scale):
+    module = "pkg_{}.mod_{}".format(i % 50, i)
+    lines.append("import {} as m{}".format(module, i))
+    lines.append("from {} import {}".format(*MEMBERS[i % len(MEMBERS)].rsplit(".", 1)))
+    lines.append("m{}.attr.value = {}".format(i, MEMBERS[i % len(MEMBERS)]))
+  for i in range(5):
+    write(folder, "imports_{}.py".format(i), "\n".join(lines) + "\n")
+
+def fstring_heavy(folder, scale):
+  """Files with lots of f-strings, including nested and self-documenting ones."""
+  lines = []
+  for i in range(1000 * scale):
+    lines.append("s{i} = f'{{a{i}}} {{b!r:>{{width}}}} {{c=}} {{f\"{{d}}\"}} {{x + {i}:08.3f}}'".
+                 format(i=i))
+  for i in range(5):
+    write(folder, "fstrings_{}.py".format(i), "\n".join(lines) + "\n")
+
+# Name -> generator function of each corpus.
+CORPORA = {
+  "tiny_files": tiny_files,
+  "huge_files": huge_files,
+  "deep_tree": deep_tree,
+  "import_heavy": import_heavy,
+  "fstring_heavy": fstring_heavy,
+}
+
+def generate(name, folder, scale=1):
+  """Generates corpus `name` into `folder`, which must exist and be empty."""
+  CORPORA[name](folder, scale)
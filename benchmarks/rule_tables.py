@@ -0,0 +1,36 @@
+"""Benchmarks the per-file setup cost of rule tables.
+
+Compares building the module, member, and kwargs rule tables for every analyzed file, which was done
+before, with fetching them from the per-process cache via `SourceState`.
+
+Run from the repository root: python -m benchmarks.rule_tables [iterations]
+"""
+import sys
+from timeit import timeit
+
+from vermin import Config, MOD_REQS, MOD_MEM_REQS, KWARGS_REQS
+from vermin.source_state import SourceState
+
+def build_tables(config):
+  return (MOD_REQS(config), MOD_MEM_REQS(config), KWARGS_REQS(config))
+
+def run(iterations=200):
+  config = Config()
+
+  # Warm the cache such that only the per-file cost is measured.
+  SourceState(config)
+
+  uncached = timeit(lambda: (build_tables(config), SourceState(config)), number=iterations)
+  cached = timeit(lambda: SourceState(config), number=iterations)
+  return (uncached / iterations, cached / iterations)
+
+def main():
+  iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+  (uncached, cached) = run(iterations)
+  print("Per-file setup with rule tables built: {:.3f} ms".format(uncached * 1000))
+  print("Per-file setup with cached rule tables: {:.3f} ms".format(cached * 1000))
+  print("Saving per file: {:.3f} ms ({:.1f}x)".format((uncached - cached) * 1000,
+                                                      uncached / cached))
+
+if __name__ == "__main__":
+  main()
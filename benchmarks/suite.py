@@ -0,0 +1,140 @@
+"""Benchmarks the phases of analysis on synthetic corpora of varied shapes.
+
+For each corpus of `benchmarks.corpora`, times `detect_paths()`, `Parser.detect()`,
+`SourceVisitor.tour()`, and `SourceVisitor.minimum_versions()` separately. Each phase is run a
+number of times and the fastest run is kept to reduce noise. Results are written as JSON such that
+they can be saved as a baseline and later runs compared against it, failing if any phase got slower
+than allowed.
+
+Run from the repository root:
+  python -m benchmarks.suite --output baseline.json
+  python -m benchmarks.suite --baseline baseline.json [--tolerance 0.2]
+"""
+import sys
+import json
+import platform
+from argparse import ArgumentParser
+from shutil import rmtree
+from tempfile import mkdtemp
+from timeit import default_timer
+
+from vermin import Config, Parser, SourceVisitor, detect_paths
+from vermin.constants import VERSION
+
+from .corpora import CORPORA, generate
+
+PHASES = ("detect_paths", "parse", "tour", "minimum_versions")
+
+# Phases faster than this in the baseline, in seconds, are too noisy to compare.
+MIN_COMPARED_SECONDS = 0.005
+
+def time_phases(folder, config):
+  """Returns dictionary of phase -> seconds spent analyzing all files in folder once."""
+  timings = dict((phase, 0.0) for phase in PHASES)
+
+  start = default_timer()
+  paths = sorted(detect_paths([folder], processes=1, config=config))
+  timings["detect_paths"] = default_timer() - start
+
+  for path in paths:
+    with open(path, mode="rb") as fp:
+      source = fp.read()
+
+    start = default_timer()
+    (node, _, novermin) = Parser(source, path).detect(config)
+    timings["parse"] += default_timer() - start
+    if node is None:
+      continue
+
+    visitor = SourceVisitor(config, path, source)
+    visitor.set_no_lines(novermin)
+    start = default_timer()
+    visitor.tour(node)
+    timings["tour"] += default_timer() - start
+
+    start = default_timer()
+    visitor.minimum_versions()
+    timings["minimum_versions"] += default_timer() - start
+  return timings
+
+def run(corpora, scale=1, repeat=3):
+  """Returns results of benchmarking corpora with the fastest timings of `repeat` runs."""
+  config = Config()
+  config.set_quiet(True)
+  results = {}
+  for name in corpora:
+    folder = mkdtemp(prefix="vermin_bench_")
+    try:
+      generate(name, folder, scale)
+      runs = [time_phases(folder, config) for _ in range(repeat)]
+    finally:
+      rmtree(folder)
+    results[name] = dict((phase, min(timings[phase] for timings in runs)) for phase in PHASES)
+  return {
+    "vermin": VERSION,
+    "python": platform.python_version(),
+    "scale": scale,
+    "repeat": repeat,
+    "results": results,
+  }
+
+def compare(results, baseline, tolerance):
+  """Returns list of `(corpus, phase, baseline seconds, seconds)` of phases that are more than
+`tolerance` slower than in the baseline, as a fraction. Corpora or phases missing in either are
+ignored."""
+  regressions = []
+  for (name, timings) in sorted(results["results"].items()):
+    base_timings = baseline["results"].get(name, {})
+    for phase in PHASES:
+      if phase not in timings or phase not in base_timings:
+        continue
+      (base, secs) = (base_timings[phase], timings[phase])
+      if base >= MIN_COMPARED_SECONDS and secs > base * (1 + tolerance):
+        regressions.append((name, phase, base, secs))
+  return regressions
+
+def print_results(results, baseline=None):
+  print("Vermin {} on Python {} (scale {}, best of {}):".
+        format(results["vermin"], results["python"], results["scale"], results["repeat"]))
+  print("{:<15} {:<17} {:>10} {:>10}".format("corpus", "phase", "ms", "baseline"))
+  for (name, timings) in sorted(results["results"].items()):
+    for phase in PHASES:
+      base = ""
+      if baseline is not None and phase in baseline["results"].get(name, {}):
+        base = "{:.1f}".format(baseline["results"][name][phase] * 1000)
+      print("{:<15} {:<17} {:>10.1f} {:>10}".format(name, phase, timings[phase] * 1000, base))
+
+def main():
+  parser = ArgumentParser(description="Benchmark analysis phases on synthetic corpora.")
+  parser.add_argument("--corpus", action="append", choices=sorted(CORPORA),
+                      help="Corpus to benchmark. Can be repeated. Defaults to all.")
+  parser.add_argument("--scale", type=int, default=1, help="Size multiplier of corpora.")
+  parser.add_argument("--repeat", type=int, default=3, help="Runs per corpus, fastest is kept.")
+  parser.add_argument("--output", help="Write JSON results to file.")
+  parser.add_argument("--baseline", help="Compare against JSON results of earlier run.")
+  parser.add_argument("--tolerance", type=float, default=0.2,
+                      help="Allowed slowdown fraction versus the baseline (default 0.2).")
+  args = parser.parse_args()
+
+  baseline = None
+  if args.baseline is not None:
+    with open(args.baseline, mode="r", encoding="utf-8") as fp:
+      baseline = json.load(fp)
+
+  results = run(args.corpus or sorted(CORPORA), args.scale, args.repeat)
+  print_results(results, baseline)
+
+  if args.output is not None:
+    with open(args.output, mode="w", encoding="utf-8") as fp:
+      json.dump(results, fp, indent=2, sort_keys=True)
+
+  if baseline is not None:
+    regressions = compare(results, baseline, args.tolerance)
+    for (name, phase, base, secs) in regressions:
+      print("Regression: {} {} took {:.1f} ms vs. {:.1f} ms in baseline (+{:.0f}%)".
+            format(name, phase, secs * 1000, base * 1000, (secs / base - 1) * 100))
+    if len(regressions) > 0:
+      sys.exit(1)
+
+if __name__ == "__main__":
+  main()
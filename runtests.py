@@ -30,6 +30,12 @@ SUITES = (
   "backports",
   "bytes_directive",
   "violations",
+  "cache",
+  "git",
+  "daemon",
+  "watch",
+  "fingerprint",
+  "shard",
 )
 
 def runsuite(suite):
@@ -41,13 +41,15 @@ setup(
 
   keywords="version detection analysis ast development",
 
-  packages=find_packages(exclude=["tests"]),
+  packages=find_packages(exclude=["tests", "benchmarks"]),
+  py_modules=["vermin_client"],
 
   python_requires=">=3.0",
 
   entry_points={
     "console_scripts": [
       "vermin=vermin:main",
+      "vermin-client=vermin_client:main",
     ],
   },
 
@@ -509,3 +509,107 @@ pessimistic = yes
     self.config.set_scan_symlink_folders(True)
     self.assertContainsDict({"code": 0, "paths": []}, self.parse_args(["--no-symlink-folders"]))
     self.assertFalse(self.config.scan_symlink_folders())
+
+  def test_cache_dir(self):
+    self.assertContainsDict({"code": 1}, self.parse_args(["--cache-dir"]))  # Needs <path> part.
+    self.assertIsNone(self.config.cache_dir())
+
+    self.assertContainsDict({"code": 0, "paths": ["file.py"]},
+                            self.parse_args(["--cache-dir", "cache", "file.py"]))
+    self.assertEqual("cache", self.config.cache_dir())
+
+  def test_no_cache_dir(self):
+    self.config.set_cache_dir("cache")
+    self.assertContainsDict({"code": 0, "paths": []}, self.parse_args(["--no-cache-dir"]))
+    self.assertIsNone(self.config.cache_dir())
+
+  def test_stream(self):
+    self.config.set_stream(False)
+    self.assertContainsDict({"code": 0, "paths": []}, self.parse_args(["--stream"]))
+    self.assertTrue(self.config.stream())
+
+  def test_no_stream(self):
+    self.config.set_stream(True)
+    self.assertContainsDict({"code": 0, "paths": []}, self.parse_args(["--no-stream"]))
+    self.assertFalse(self.config.stream())
+
+  def test_unordered(self):
+    self.config.set_unordered_output(False)
+    self.assertContainsDict({"code": 0, "paths": []}, self.parse_args(["--unordered"]))
+    self.assertTrue(self.config.unordered_output())
+
+  def test_ordered(self):
+    self.config.set_unordered_output(True)
+    self.assertContainsDict({"code": 0, "paths": []}, self.parse_args(["--ordered"]))
+    self.assertFalse(self.config.unordered_output())
+
+  def test_timings(self):
+    self.assertContainsDict({"code": 0, "paths": []}, self.parse_args(["--timings"]))
+    self.assertEqual(10, self.config.timings())
+
+    self.assertContainsDict({"code": 0, "paths": []}, self.parse_args(["--timings=3"]))
+    self.assertEqual(3, self.config.timings())
+
+    for value in ("0", "-1", "a"):
+      self.assertContainsDict({"code": 1}, self.parse_args(["--timings=" + value]))
+
+  def test_no_timings(self):
+    self.config.set_timings(10)
+    self.assertContainsDict({"code": 0, "paths": []}, self.parse_args(["--no-timings"]))
+    self.assertEqual(0, self.config.timings())
+
+  def test_git_base(self):
+    self.assertContainsDict({"code": 1}, self.parse_args(["--git-base"]))  # Needs <rev> part.
+    self.assertIsNone(self.config.git_base())
+
+    self.assertContainsDict({"code": 0, "paths": ["src"]},
+                            self.parse_args(["--git-base", "origin/main", "src"]))
+    self.assertEqual("origin/main", self.config.git_base())
+
+  def test_daemon(self):
+    self.assertContainsDict({"code": 1}, self.parse_args(["--daemon"]))  # Needs <path> part.
+    self.assertContainsDict({"code": 0, "daemon": None}, self.parse_args(["file.py"]))
+    self.assertContainsDict({"code": 0, "paths": [], "daemon": "vermin.sock"},
+                            self.parse_args(["--daemon", "vermin.sock"]))
+
+  def test_watch(self):
+    self.assertContainsDict({"code": 0, "watch": False}, self.parse_args(["file.py"]))
+    self.assertContainsDict({"code": 0, "paths": ["file.py"], "watch": True},
+                            self.parse_args(["--watch", "file.py"]))
+
+  def test_matrix(self):
+    self.assertContainsDict({"code": 0, "matrix": []}, self.parse_args(["file.py"]))
+    self.assertContainsDict({"code": 1}, self.parse_args(["--matrix=2.7-:3.6-:3.8"]))
+    self.assertContainsDict({"code": 1}, self.parse_args(["--matrix=x"]))
+    self.assertContainsDict(
+      {"code": 0, "paths": ["file.py"],
+       "matrix": [[(False, (2, 7)), (False, (3, 6))], [(True, (3, 8))]]},
+      self.parse_args(["--matrix=2.7-:3.6-", "--matrix=3.8", "file.py"]))
+
+  def test_fingerprints(self):
+    self.assertContainsDict({"code": 1}, self.parse_args(["--save-fingerprints"]))
+    self.assertContainsDict({"code": 1}, self.parse_args(["--fingerprints"]))
+    self.assertContainsDict({"code": 0, "save_fingerprints": None, "fingerprints": None},
+                            self.parse_args(["file.py"]))
+    self.assertContainsDict({"code": 0, "paths": ["file.py"], "save_fingerprints": "fp.json"},
+                            self.parse_args(["--save-fingerprints", "fp.json", "file.py"]))
+    self.assertContainsDict({"code": 0, "paths": [], "fingerprints": "fp.json"},
+                            self.parse_args(["--fingerprints", "fp.json"]))
+
+  def test_shard(self):
+    self.assertContainsDict({"code": 1}, self.parse_args(["--shard"]))
+    self.assertContainsDict({"code": 1}, self.parse_args(["--shard", "0/2", "file.py"]))
+    self.assertContainsDict({"code": 1}, self.parse_args(["--save-partial"]))
+    self.assertContainsDict({"code": 0, "shard": None, "save_partial": None, "merge": False},
+                            self.parse_args(["file.py"]))
+    self.assertContainsDict({"code": 0, "paths": ["file.py"], "shard": (2, 3),
+                             "save_partial": "partial.json"},
+                            self.parse_args(["--shard", "2/3", "--save-partial", "partial.json",
+                                             "file.py"]))
+    self.assertContainsDict({"code": 0, "paths": ["a.json", "b.json"], "merge": True},
+                            self.parse_args(["--merge", "a.json", "b.json"]))
+
+  def test_no_git_base(self):
+    self.config.set_git_base("origin/main")
+    self.assertContainsDict({"code": 0, "paths": []}, self.parse_args(["--no-git-base"]))
+    self.assertIsNone(self.config.git_base())
@@ -0,0 +1,118 @@
+import os
+from tempfile import mkdtemp
+from shutil import rmtree
+
+from vermin import Processor
+from vermin.cache import ResultCache
+
+from .testutils import VerminTest, ScopedTemporaryFile
+
+class VerminResultCacheTests(VerminTest):
+  def setUp(self):
+    super().setUp()
+    self.cache_dir = mkdtemp()
+    self.config.set_cache_dir(self.cache_dir)
+
+  def tearDown(self):
+    rmtree(self.cache_dir)
+
+  def entries(self):
+    res = []
+    for (root, _dirs, files) in os.walk(self.cache_dir):
+      res += [os.path.join(root, f) for f in files]
+    return res
+
+  def test_key_depends_on_path_source_and_config(self):
+    cache = ResultCache(self.cache_dir, self.config)
+    key = cache.key("a.py", b"import abc")
+    self.assertEqual(key, cache.key("a.py", b"import abc"))
+    self.assertNotEqual(key, cache.key("b.py", b"import abc"))
+    self.assertNotEqual(key, cache.key("a.py", b"import ast"))
+
+    self.config.add_backport("typing")
+    self.assertNotEqual(key, ResultCache(self.cache_dir, self.config).key("a.py", b"import abc"))
+
+    # Options not affecting results don't change the key.
+    self.config.clear_backports()
+    self.config.set_processes(self.config.processes() + 1)
+    self.config.set_show_tips(False)
+    self.assertEqual(key, ResultCache(self.cache_dir, self.config).key("a.py", b"import abc"))
+
+  def test_store_and_load(self):
+    fp = ScopedTemporaryFile()
+    fp.writeln(b"import typing  # novm")
+    fp.writeln(b"import argparse")
+    fp.close()
+    self.config.set_verbose(2)
+
+    res = Processor.process_individual((fp.path(), self.config))
+    self.assertEqual(1, len(self.entries()))
+
+    cached = Processor.process_individual((fp.path(), self.config))
+    self.assertIsNone(cached.node)
+    self.assertEqual(res.mins, cached.mins)
+    self.assertEqual(res.text, cached.text)
+    self.assertEqual(res.novermin, cached.novermin)
+    self.assertEqual(res.bps, cached.bps)
+    self.assertEqual(res.maybe_annotations, cached.maybe_annotations)
+    self.assertEqual(res.fingerprint, cached.fingerprint)
+
+  def test_cached_result_skips_analysis(self):
+    fp = ScopedTemporaryFile()
+    fp.writeln(b"import argparse")
+    fp.close()
+    path = fp.path()
+
+    cache = ResultCache(self.cache_dir, self.config)
+    with open(path, mode="rb") as f:
+      key = cache.key(path, f.read())
+    res = Processor.process_individual((path, self.config))
+    res.mins = [(2, 1), (3, 1)]
+    cache.store(key, res)
+
+    # The tampered entry is yielded instead of analyzing the unchanged file again.
+    self.assertEqual([(2, 1), (3, 1)], Processor.process_individual((path, self.config)).mins)
+
+    # Changing contents invalidates the entry.
+    with open(path, mode="ab") as f:
+      f.write(b"import abc\n")
+    self.assertEqual([(2, 7), (3, 2)], Processor.process_individual((path, self.config)).mins)
+
+  def test_non_python_file_entry(self):
+    cache = ResultCache(self.cache_dir, self.config)
+    key = cache.key("a.bin", b"\0")
+    self.assertEqual((False, 42), cache.load(key, 42))
+    cache.store(key, None)
+    self.assertEqual((True, None), cache.load(key, 42))
+
+  def test_invalid_entries_are_misses(self):
+    fp = ScopedTemporaryFile()
+    fp.writeln(b"import argparse")
+    fp.close()
+    Processor.process_individual((fp.path(), self.config))
+    (entry,) = self.entries()
+
+    for contents in ('{"python": true, "mins": [[2, 7], [3, 2]]}', '{"mins": null}', "[]",
+                     '{"python": true, "mins": 42, "text": ""}', '{"python": tr'):
+      with open(entry, mode="w", encoding="utf-8") as f:
+        f.write(contents)
+      res = Processor.process_individual((fp.path(), self.config))
+      self.assertEqual([(2, 7), (3, 2)], res.mins)
+      self.assertEqual({"argparse"}, res.bps)
+
+  def test_syntax_error_not_cached(self):
+    fp = ScopedTemporaryFile()
+    fp.write(b"(")
+    fp.close()
+    Processor.process_individual((fp.path(), self.config))
+    self.assertEmpty(self.entries())
+
+  def test_process_with_cache(self):
+    fp = ScopedTemporaryFile()
+    fp.writeln(b"import argparse")
+    fp.close()
+    processor = Processor()
+    first = processor.process([fp.path()], self.config, processes=1)
+    second = processor.process([fp.path()], self.config, processes=1)
+    self.assertEqual(first, second)
+    self.assertEqual([(2, 7), (3, 2)], second[0])
@@ -166,3 +166,16 @@ EF('f.txt', data_encoding='koi8_t', file_encoding='utf-8')
   ])
   def test_function_EncodedFile(self, source, min_versions):
     self.assertDetectMinVersions(source, min_versions)
+
+  @VerminTest.parameterized_args([
+    # Parts of encoding names aren't encodings themselves.
+    ("import codecs\ncodecs.encode('test', 'z')", [(2, 4), (3, 0)]),
+    ("import codecs\ncodecs.encode('test', 'he')", [(2, 4), (3, 0)]),
+    ("import codecs\ncodecs.encode('test', 'rot')", [(2, 4), (3, 0)]),
+
+    # Case is ignored and hyphens are equivalent to underscores.
+    ("import codecs\ncodecs.encode('test', 'BZ2-Codec')", (3, 2)),
+    ("import codecs\ncodecs.encode('test', 'KOI8-T')", (3, 5)),
+  ])
+  def test_encoding_names_are_matched_exactly(self, source, min_versions):
+    self.assertDetectMinVersions(source, min_versions)
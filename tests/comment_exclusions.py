@@ -1,3 +1,5 @@
+from vermin import Parser
+
 from .testutils import VerminTest, current_version
 
 class VerminCommentsExclusionsTests(VerminTest):
@@ -501,3 +503,15 @@ def foo():
 """)
     self.assertIn(5, visitor.no_lines())
     self.assertEqual([(0, 0), (0, 0)], visitor.minimum_versions())
+
+  def test_comment_markers_prescan(self):
+    for source in ("import abc  # novm", "import abc  # novermin", "# novm\nimport abc"):
+      self.assertTrue(Parser.has_comment_markers(source))
+      self.assertTrue(Parser.has_comment_markers(source.encode()))
+    for source in ("import abc", "import abc  # noqa", "# nov\nimport abc"):
+      self.assertFalse(Parser.has_comment_markers(source))
+      self.assertFalse(Parser.has_comment_markers(source.encode()))
+
+    # Without markers comments aren't tokenized, not even invalid code that would fail to tokenize.
+    self.assertEmpty(Parser(b"import abc  # noqa\n\"\"\"").comments())
+    self.assertEqual({1}, Parser(b"import abc  # novm\n").comments())
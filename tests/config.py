@@ -27,6 +27,12 @@ class VerminConfigTests(VerminTest):
     self.assertFalse(self.config.only_show_violations())
     self.assertTrue(self.config.parse_comments())
     self.assertFalse(self.config.scan_symlink_folders())
+    self.assertIsNone(self.config.cache_dir())
+    self.assertFalse(self.config.stream())
+    self.assertFalse(self.config.unordered_output())
+    self.assertEqual(0, self.config.timings())
+    self.assertIsNone(self.config.git_base())
+    self.assertFalse(self.config.record_fingerprints())
 
   def test_override_from(self):
     other = Config()
@@ -47,6 +53,12 @@ class VerminConfigTests(VerminTest):
     other.set_only_show_violations(True)
     other.set_parse_comments(False)
     other.set_scan_symlink_folders(True)
+    other.set_cache_dir("cache")
+    other.set_stream(True)
+    other.set_unordered_output(True)
+    other.set_timings(5)
+    other.set_git_base("origin/main")
+    other.set_record_fingerprints(True)
 
     self.config.override_from(other)
     self.assertEqual(other.quiet(), self.config.quiet())
@@ -66,6 +78,12 @@ class VerminConfigTests(VerminTest):
     self.assertEqual(other.only_show_violations(), self.config.only_show_violations())
     self.assertEqual(other.parse_comments(), self.config.parse_comments())
     self.assertEqual(other.scan_symlink_folders(), self.config.scan_symlink_folders())
+    self.assertEqual(other.cache_dir(), self.config.cache_dir())
+    self.assertEqual(other.stream(), self.config.stream())
+    self.assertEqual(other.unordered_output(), self.config.unordered_output())
+    self.assertEqual(other.timings(), self.config.timings())
+    self.assertEqual(other.git_base(), self.config.git_base())
+    self.assertEqual(other.record_fingerprints(), self.config.record_fingerprints())
 
   def test_repr(self):
     self.assertEqual(str(self.config), """{}(
@@ -87,6 +105,12 @@ class VerminConfigTests(VerminTest):
   only_show_violations = {}
   parse_comments = {}
   scan_symlink_folders = {}
+  cache_dir = {}
+  stream = {}
+  unordered_output = {}
+  timings = {}
+  git_base = {}
+  record_fingerprints = {}
   format = {}
 )""".format(self.config.__class__.__name__, self.config.quiet(), self.config.verbose(),
             self.config.print_visits(), self.config.processes(), self.config.ignore_incomp(),
@@ -95,7 +119,10 @@ class VerminConfigTests(VerminTest):
             self.config.make_paths_absolute(), list(self.config.backports()),
             list(self.config.features()), self.config.targets(), self.config.eval_annotations(),
             self.config.only_show_violations(), self.config.parse_comments(),
-            self.config.scan_symlink_folders(), self.config.format().name()))
+            self.config.scan_symlink_folders(), self.config.cache_dir(),
+            self.config.stream(), self.config.unordered_output(), self.config.timings(),
+            self.config.git_base(), self.config.record_fingerprints(),
+            self.config.format().name()))
 
   @VerminTest.parameterized_args([
     [""],
@@ -649,3 +676,77 @@ scan_symlink_folders = False
     config = Config.parse_data(data)
     self.assertIsNotNone(config)
     self.assertEqual(config.scan_symlink_folders(), expected)
+
+  @VerminTest.parameterized_args([
+    ["""[vermin]
+cache_dir =
+""", None],
+    ["""[vermin]
+#cache_dir = .vermin_cache
+""", None],
+    ["""[vermin]
+cache_dir = .vermin_cache
+""", ".vermin_cache"],
+  ])
+  def test_parse_cache_dir(self, data, expected):
+    config = Config.parse_data(data)
+    self.assertIsNotNone(config)
+    self.assertEqual(config.cache_dir(), expected)
+
+  @VerminTest.parameterized_args([
+    ["""[vermin]
+stream =
+""", False],
+    ["""[vermin]
+stream = yes
+""", True],
+    ["""[vermin]
+stream = no
+""", False],
+  ])
+  def test_parse_stream(self, data, expected):
+    config = Config.parse_data(data)
+    self.assertIsNotNone(config)
+    self.assertEqual(config.stream(), expected)
+
+  @VerminTest.parameterized_args([
+    ["""[vermin]
+unordered_output =
+""", False],
+    ["""[vermin]
+unordered_output = yes
+""", True],
+    ["""[vermin]
+unordered_output = no
+""", False],
+  ])
+  def test_parse_unordered_output(self, data, expected):
+    config = Config.parse_data(data)
+    self.assertIsNotNone(config)
+    self.assertEqual(config.unordered_output(), expected)
+
+  @VerminTest.parameterized_args([
+    ["""[vermin]
+timings =
+""", 0],
+    ["""[vermin]
+timings = 5
+""", 5],
+  ])
+  def test_parse_timings(self, data, expected):
+    config = Config.parse_data(data)
+    self.assertIsNotNone(config)
+    self.assertEqual(config.timings(), expected)
+
+  @VerminTest.parameterized_args([
+    ["""[vermin]
+git_base =
+""", None],
+    ["""[vermin]
+git_base = origin/main
+""", "origin/main"],
+  ])
+  def test_parse_git_base(self, data, expected):
+    config = Config.parse_data(data)
+    self.assertIsNotNone(config)
+    self.assertEqual(config.git_base(), expected)
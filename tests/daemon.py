@@ -0,0 +1,135 @@
+import io
+import os
+import sys
+import socket
+import multiprocessing as mp
+from copy import deepcopy
+from os.path import join
+from tempfile import mkdtemp
+from shutil import rmtree
+from threading import Thread
+from time import sleep
+
+import vermin_client
+from vermin import Processor, main
+from vermin.daemon import Daemon
+
+from .testutils import VerminTest, touch
+
+class VerminDaemonTests(VerminTest):
+  def setUp(self):
+    super().setUp()
+    if getattr(socket, "AF_UNIX", None) is None:  # pragma: no cover
+      self.skipTest("Unix sockets are unsupported")
+
+    self.folder = mkdtemp()
+    self.path = join(self.folder, "vermin.sock")
+    touch(self.folder, "a.py", "import argparse\n")
+    self.config.set_quiet(True)
+    self.config.set_processes(1)
+    self.codes = []
+    self.thread = Thread(target=lambda: self.codes.append(Daemon(self.path, self.config).
+                                                          serve(main)))
+    self.thread.start()
+    for _ in range(500):
+      if Daemon.is_listening(self.path):
+        break
+      sleep(0.01)
+
+  def tearDown(self):
+    if self.thread.is_alive():
+      vermin_client.shutdown(self.path)
+      self.thread.join()
+    rmtree(self.folder)
+
+  def test_request(self):
+    (code, output) = vermin_client.request(self.path, ["--no-tips", "-v", "a.py"], self.folder)
+    self.assertEqual(0, code)
+    self.assertIn("Minimum required versions: 2.7, 3.2", output)
+    self.assertIn(join(self.folder, "a.py"), output)
+
+    # Config is detected and targets are checked per request.
+    with open(join(self.folder, "vermin.ini"), mode="w", encoding="utf-8") as fp:
+      fp.write("[vermin]\ntargets = 2.6\n")
+    (code, output) = vermin_client.request(self.path, ["--no-tips", "a.py"], self.folder)
+    self.assertEqual(1, code)
+    self.assertIn("Target versions not met:   2.6", output)
+
+  def test_relative_paths_with_shared_pool(self):
+    # Workers don't have the working folder of the request.
+    os.mkdir(join(self.folder, "sub"))
+    touch(join(self.folder, "sub"), "b.py", "import argparse\n")
+    path = join(self.folder, "pool.sock")
+    config = deepcopy(self.config)
+    config.set_processes(2)
+    thread = Thread(target=lambda: Daemon(path, config).serve(main))
+    thread.start()
+    try:
+      for _ in range(500):
+        if Daemon.is_listening(path):
+          break
+        sleep(0.01)
+      args = ["--no-tips", "--no-make-paths-absolute", "-v", "-p=2", "a.py", "sub"]
+      (code, output) = vermin_client.request(path, args, self.folder)
+      self.assertEqual(0, code)
+      self.assertIn("Minimum required versions: 2.7, 3.2", output)
+      self.assertIn(join(self.folder, "sub", "b.py"), output)
+    finally:
+      vermin_client.shutdown(path)
+      thread.join()
+
+  def test_unsupported_options(self):
+    for option in (["--watch"], ["--daemon", "other.sock"]):
+      (code, output) = vermin_client.request(self.path, option + ["a.py"], self.folder)
+      self.assertEqual(1, code)
+      self.assertEqual("Unsupported in requests: {}\n".format(option[0]), output)
+
+  def test_usage(self):
+    (code, output) = vermin_client.request(self.path, [], self.folder)
+    self.assertEqual(1, code)
+    self.assertIn("Usage:", output)
+
+  def test_invalid_request(self):
+    self.assertEqual({"code": 1, "output": "Invalid request!\n"},
+                     vermin_client.send(self.path, ["not", "an", "object"]))
+
+  def test_already_listening(self):
+    self.assertEqual(1, Daemon(self.path, self.config).serve(main))
+
+  def test_shutdown(self):
+    vermin_client.shutdown(self.path)
+    self.thread.join()
+    self.assertEqual([0], self.codes)
+    self.assertFalse(os.path.exists(self.path))
+
+class VerminSharedPoolTests(VerminTest):
+  def test_process_with_shared_pool(self):
+    folder = mkdtemp()
+    # pylint: disable=consider-using-with
+    pool = mp.Pool(processes=2)
+    try:
+      paths = [touch(folder, "a.py", "import argparse\n"), touch(folder, "b.py", "print 'hello'\n")]
+      processor = Processor(pool)
+      self.assertEqual([(2, 7), None], processor.process(paths, self.config, 2)[0])
+
+      # Configs differ per invocation.
+      self.assertTrue(self.config.add_backport("argparse"))
+      self.assertEqual([(2, 3), None], processor.process(paths, self.config, 2)[0])
+
+      # Output printed by workers is relayed.
+      self.config.reset()
+      self.config.set_verbose(2)
+      stdout = sys.stdout
+      sys.stdout = io.StringIO()
+      try:
+        (mins, _, _, _, _, _, amount) = processor.process_stream([folder], self.config, 2)
+        output = sys.stdout.getvalue()
+      finally:
+        sys.stdout = stdout
+      self.assertEqual([(2, 7), None], mins)
+      self.assertEqual(2, amount)
+      self.assertIn("`print 'hello'` requires 2.0", output)
+    finally:
+      pool.close()
+      pool.join()
+      rmtree(folder)
@@ -10,6 +10,16 @@ class VerminExclusionsTests(VerminTest):
     visitor = self.visit("from email.parser import FeedParser")
     self.assertEqual([(0, 0), (0, 0)], visitor.minimum_versions())
 
+  def test_module_attributes(self):
+    # Excluding a module excludes modules accessed via its attributes too.
+    self.config.add_exclusion("importlib")
+    visitor = self.visit("import importlib\nimportlib.metadata.version('vermin')")
+    self.assertEqual([(0, 0), (0, 0)], visitor.minimum_versions())
+
+    # Unless they are imported themselves.
+    visitor = self.visit("import importlib.metadata\nimportlib.metadata.version('vermin')")
+    self.assertEqual([None, (3, 8)], visitor.minimum_versions())
+
   def test_kwarg(self):
     visitor = self.visit("from argparse import ArgumentParser\nArgumentParser(allow_abbrev=False)")
     self.assertEqual([None, (3, 5)], visitor.minimum_versions())
@@ -0,0 +1,179 @@
+import os
+from os.path import join
+from tempfile import mkdtemp
+from shutil import rmtree
+
+from vermin import Processor, InvalidVersionException, main
+from vermin.fingerprint import EntityFingerprint, save_fingerprints, load_fingerprints
+
+from .testutils import VerminTest, touch
+
+SOURCE = """import argparse
+import typing
+import importlib
+import codecs
+importlib.metadata.version("vermin")
+codecs.encode("x", "utf-8", "strict")
+"{}".format(1)
+def f(*, a): pass
+"""
+
+class VerminFingerprintTests(VerminTest):
+  def fingerprint(self, source):
+    return EntityFingerprint.record(self.visit(source), "a.py")
+
+  @staticmethod
+  def normalized(fp):
+    return (sorted(fp.features), dict((kind, sorted(entities))
+                                      for (kind, entities) in fp.entities.items()))
+
+  def assertEvaluatesLikeVisiting(self, fp, source):
+    try:
+      expected = self.visit(source).minimum_versions()
+    except InvalidVersionException:
+      expected = None
+    try:
+      actual = fp.minimum_versions(self.config)
+    except InvalidVersionException:
+      actual = None
+    self.assertEqual(expected, actual)
+
+  def test_record(self):
+    fp = self.fingerprint(SOURCE)
+    self.assertEqual(["a.py", ["format27", "kw_only_args"]], [fp.path, fp.features])
+    self.assertEqual(["argparse", "typing", "importlib", "codecs", "importlib.metadata.version",
+                      "importlib.metadata", "codecs.encode"], fp.entities["modules"])
+    self.assertEqual(["codecs.encode", "str.format"], fp.entities["members"])
+    self.assertEqual({"importlib.metadata.version": "importlib", "importlib.metadata": "importlib",
+                      "codecs.encode": "codecs"}, fp.module_roots)
+    self.assertEqual(["strict"], fp.entities["codecs_error_handlers"])
+    self.assertEqual(["utf-8"], fp.entities["codecs_encodings"])
+
+  def test_record_excluded(self):
+    recorded = self.fingerprint(SOURCE)
+    for name in ("importlib", "importlib.metadata.version", "ce=utf-8", "ceh=strict"):
+      self.config.add_exclusion(name)
+    # Excluded entities are recorded too, including attribute chains of excluded modules.
+    self.assertEqual(self.normalized(recorded), self.normalized(self.fingerprint(SOURCE)))
+    self.assertEqual(recorded.module_roots, self.fingerprint(SOURCE).module_roots)
+
+    self.config.add_exclusion("long")
+    self.assertEqual(["longv2"], self.fingerprint("long(1)").features)
+
+  def test_evaluate_under_other_config(self):
+    fp = self.fingerprint(SOURCE)
+    self.assertEvaluatesLikeVisiting(fp, SOURCE)
+
+    self.assertTrue(self.config.add_backport("argparse"))
+    self.assertTrue(self.config.add_backport("typing"))
+    self.assertEvaluatesLikeVisiting(fp, SOURCE)
+    self.assertEqual({"argparse", "typing", "importlib"}, fp.backports(self.config))
+
+    for name in ("importlib.metadata", "importlib.metadata.version", "ce=utf-8", "argparse"):
+      self.config.add_exclusion(name)
+    self.assertEvaluatesLikeVisiting(fp, SOURCE)
+    self.assertEqual({"typing", "importlib"}, fp.backports(self.config))
+
+    # Modules of attribute chains are excluded along with their root module.
+    self.config.add_exclusion("importlib")
+    self.assertEvaluatesLikeVisiting(fp, SOURCE)
+    source = "import importlib\nimport importlib.metadata\nimportlib.metadata.version('vermin')"
+    self.assertEvaluatesLikeVisiting(self.fingerprint(source), source)
+
+    fp = self.fingerprint("long(1)\nprint(1)")
+    self.assertEqual([(2, 0), None], fp.minimum_versions(self.config))
+    self.config.add_exclusion("long")
+    self.assertEvaluatesLikeVisiting(fp, "long(1)\nprint(1)")
+
+  def test_evaluate_incompatible(self):
+    source = "long(1)\nf'{1}'"
+    self.config.set_ignore_incomp(True)
+    fp = self.fingerprint(source)
+    self.assertEvaluatesLikeVisiting(fp, source)
+    self.config.set_ignore_incomp(False)
+    with self.assertRaises(InvalidVersionException):
+      fp.minimum_versions(self.config)
+
+  def test_findings(self):
+    fp = self.fingerprint(SOURCE)
+    targets = [(False, (2, 7)), (False, (3, 2))]
+    self.assertEqual([((None, (3, 0)), "keyword-only arguments"),
+                      ((None, (3, 5)), "'typing' module"),
+                      ((None, (3, 8)), "'importlib.metadata' module")],
+                     fp.findings(self.config, targets))
+
+    # Only the major version of a single target is constrained.
+    targets = [(False, (3, 1))]
+    self.assertEqual(["'argparse' module", "'typing' module", "'importlib.metadata' module"],
+                     [info for (_, info) in fp.findings(self.config, targets)])
+    self.assertTrue(self.config.add_backport("typing"))
+    self.config.add_exclusion("argparse")
+    self.assertEqual(["'typing' module", "'importlib.metadata' module"],
+                     [info for (_, info) in fp.findings(self.config, targets)])
+
+  def test_save_and_load(self):
+    folder = mkdtemp()
+    try:
+      path = join(folder, "fingerprints.json")
+      fps = [self.fingerprint(SOURCE), EntityFingerprint("b.py")]
+      fps[1].mins = [(2, 0), None]
+      save_fingerprints(path, fps)
+      self.assertEqual(fps, load_fingerprints(path))
+
+      touch(folder, "invalid.json", '{"fingerprints": [{"path": "a.py"}]}')
+      with self.assertRaises(ValueError):
+        load_fingerprints(join(folder, "invalid.json"))
+    finally:
+      rmtree(folder)
+
+  def test_fingerprint_results(self):
+    self.config.set_processes(1)
+    folder = mkdtemp()
+    try:
+      paths = [touch(folder, "a.py", "import argparse\n"), touch(folder, "b.py", "print 'hi'\n"),
+               touch(folder, "c.py", "long(1)\nf'{1}'\n")]
+      # Fingerprints are only recorded when enabled.
+      results = Processor().process_results(paths, self.config, 1)
+      self.assertEqual([None, None, None], [res.fingerprint for res in results])
+
+      self.config.set_record_fingerprints(True)
+      results = Processor().process_results(paths, self.config, 1)
+      fps = [res.fingerprint for res in results]
+      self.assertEqual([None, [(2, 0), None], None], [fp.mins for fp in fps])
+
+      self.assertTrue(self.config.add_backport("argparse"))
+      self.config.add_exclusion("long")
+      expected = Processor().process_results(paths, self.config, 1)
+      actual = list(Processor.fingerprint_results(fps, self.config))
+      self.assertEqual([res.path for res in expected], [res.path for res in actual])
+      self.assertEqual([res.mins for res in expected], [res.mins for res in actual])
+      self.assertEqual([res.bps for res in expected], [res.bps for res in actual])
+
+      self.config.add_exclusion_regex("b\\.py$")
+      self.assertEqual([paths[0], paths[2]],
+                       [res.path for res in Processor.fingerprint_results(fps, self.config)])
+    finally:
+      rmtree(folder)
+
+  def test_main(self):
+    folder = mkdtemp()
+    try:
+      path = touch(folder, "a.py", "import argparse\n")
+      fps_path = join(folder, "fingerprints.json")
+
+      def run(args):
+        with self.assertRaises(SystemExit) as ex:
+          main(["--no-tips", "-q"] + args)
+        return ex.exception.code
+
+      targets = ["-t=2.7-", "-t=3.2-"]
+      self.assertEqual(0, run(["--save-fingerprints", fps_path] + targets + [path]))
+      os.remove(path)
+      self.assertEqual(0, run(["--fingerprints", fps_path] + targets))
+
+      targets = ["-t=2.6-", "-t=3.1-"]
+      self.assertEqual(1, run(["--fingerprints", fps_path] + targets))
+      self.assertEqual(0, run(["--fingerprints", fps_path, "--backport", "argparse"] + targets))
+      self.assertEqual(1, run(["--fingerprints", join(folder, "missing.json")]))
+    finally:
+      rmtree(folder)
@@ -1,7 +1,9 @@
 import sys
 import os
+import ast
 import re
 import io
+import json
 from os.path import abspath, basename, join, splitext
 from tempfile import NamedTemporaryFile, mkdtemp
 from shutil import rmtree
@@ -10,8 +12,14 @@ from multiprocessing import cpu_count
 from vermin import combine_versions, InvalidVersionException, detect_paths,\
   detect_paths_incremental, probably_python_file, Processor, reverse_range, dotted_name,\
   remove_whitespace, main, sort_line_column, sort_line_column_parsable, version_strings,\
-  format_title_descs, DEFAULT_PROCESSES
-from vermin.formats import ParsableFormat
+  format_title_descs, DEFAULT_PROCESSES, Config, MOD_REQS, MOD_MEM_REQS, KWARGS_REQS, Parser,\
+  SourceVisitor
+from vermin.formats import ParsableFormat, NdjsonFormat
+from vermin.rules import rule_tables
+from vermin.processor import ProcessResult
+from vermin.timings import Timings
+from vermin.utility import parse_target_set, violates_targets, targets_met, Finding,\
+  sort_findings_key
 
 from .testutils import VerminTest, current_version, ScopedTemporaryFile, detect, visit, touch, \
   working_dir
@@ -86,6 +94,19 @@ test.py:6:9:2.7:3.2:'argparse' module
       with self.assertRaises(AssertionError):
         self.visit(src, path="te\nst.py")
 
+  def test_visit_output_text_ndjson(self):
+    self.config.set_format(NdjsonFormat())
+    visitor = self.visit("import argparse\nimport abc, zoneinfo\n", path="te:st.py")
+    records = [json.loads(line) for line in visitor.output_text().splitlines()]
+    self.assertEqual([
+      {"type": "finding", "path": "te:st.py", "line": 1, "column": 7, "versions": [[2, 7], [3, 2]],
+       "message": "'argparse' module"},
+      {"type": "finding", "path": "te:st.py", "line": 2, "column": 7, "versions": [[2, 6], [3, 0]],
+       "message": "'abc' module"},
+      {"type": "finding", "path": "te:st.py", "line": 2, "column": 7, "versions": [None, [3, 9]],
+       "message": "'zoneinfo' module"},
+    ], records)
+
   def test_format(self):
     # Empty field name requires 2.7+
     visitor = self.visit("print('{}'.format(42))")
@@ -153,7 +174,36 @@ test.py:6:9:2.7:3.2:'argparse' module
 
   def test_detect_paths(self):
     paths = detect_paths([abspath("vermin")], config=self.config)
-    self.assertEqual(19, len(paths))
+    self.assertEqual(27, len(paths))
+
+  @VerminTest.skipPlatform("win32")
+  def test_detect_paths_nested_and_symlinks(self):
+    tmp_fld = mkdtemp()
+    os.makedirs(join(tmp_fld, "a", "b", "c"))
+    os.mkdir(join(tmp_fld, "other"))
+    files = [touch(tmp_fld, "top.py", "import abc\n"), touch(join(tmp_fld, "a"), "a.py"),
+             touch(join(tmp_fld, "a", "b"), "b.py"), touch(join(tmp_fld, "a", "b", "c"), "c.py")]
+    touch(join(tmp_fld, "a"), "notes.txt")
+    other = touch(join(tmp_fld, "other"), "other.py")
+    os.symlink(join(tmp_fld, "other"), join(tmp_fld, "a", "link_fld"))
+    os.symlink(other, join(tmp_fld, "a", "link_file.py"))
+    os.symlink(join(tmp_fld, "missing.py"), join(tmp_fld, "a", "broken.py"))
+    link_file = join(tmp_fld, "a", "link_file.py")
+
+    expected = files + [other, link_file]
+    for processes in (1, 2):
+      sizes = {}
+      paths = detect_paths([tmp_fld], processes=processes, config=self.config, sizes=sizes)
+      self.assertEqualItems(expected, paths)
+      self.assertEqualItems(expected, sizes.keys())
+      self.assertEqual(len("import abc\n"), sizes[files[0]])
+      self.assertEqual(0, sizes[files[1]])
+
+    # Symlinked folders are only followed when enabled.
+    paths = detect_paths([tmp_fld], scan_symlink_folders=True, config=self.config)
+    self.assertEqualItems(expected + [join(tmp_fld, "a", "link_fld", "other.py")], paths)
+
+    rmtree(tmp_fld)
 
   def test_detect_hidden_paths(self):
     tmp_fld = mkdtemp()
@@ -600,6 +650,38 @@ test.py:6:9:2.7:3.2:'argparse' module
     value2.sort(key=sort_line_column_parsable)
     self.assertEqual(value2, expected)
 
+  def test_sort_findings(self):
+    findings = [
+      Finding(7, None, "variable annotations", (None, (3, 6)), None),
+      Finding(1, 5, "'typing' module", (None, (3, 5)), None),
+      Finding(3, None, "variable annotations", (None, (3, 6)), None),
+      Finding(3, None, "final variable annotations", (None, (3, 8)), None),
+      "Module(body=[])",  # Raw line of AST node visits.
+      Finding(1, None, "'typing' module", (None, (3, 5)), None),
+      Finding(1, 0, "print(expr)", ((2, 0), (3, 0)), None),
+      Finding(None, None, "Excluding module: abc", None, None),
+    ]
+    self.assertEqual([
+      "Excluding module: abc",
+      "Module(body=[])",
+      "1:'typing' module",
+      "1:0:print(expr)",
+      "1:5:'typing' module",
+      "3:final variable annotations",
+      "3:variable annotations",
+      "7:variable annotations",
+    ], [f if isinstance(f, str) else
+        ":".join(str(v) for v in (f.line, f.col, f.msg) if v is not None)
+        for f in sorted(findings, key=sort_findings_key)])
+
+  def test_visit_output_text_throws_away_dups(self):
+    src = "import abc\nimport abc\nimport abc; import abc\n"
+    self.config.set_verbose(2)
+    self.assertEqual("'abc' module requires 2.6, 3.0\n", self.visit(src).output_text())
+    self.config.set_verbose(3)
+    self.assertEqual("""L1 C7: 'abc' module requires 2.6, 3.0
+""", self.visit(src).output_text())
+
   def test_assign_rvalue_attribute(self):
     self.assertEqual([None, (3, 3)], self.detect("import bz2\nv = bz2.BZ2File\nv.writable"))
 
@@ -639,6 +721,65 @@ test.py:6:9:2.7:3.2:'argparse' module
     self.assertOnlyIn(["SimpleXMLRPCServer", "src"], visitor.user_defined())
     self.assertEmpty(visitor.modules())
 
+  def test_modules_and_members_added_once(self):
+    visitor = self.visit("import abc\nimport abc\nabc.ABC\nabc.ABC\nsorted([])\nsorted([])")
+    self.assertEqual(["abc", "abc.ABC"], visitor.modules())
+    self.assertEqual(["abc.ABC", "sorted"], visitor.members())
+
+    # Line of a member is the last line it is used on.
+    self.config.set_verbose(3)
+    visitor = self.visit("import abc\nabc.ABC\nabc.ABC")
+    visitor.minimum_versions()
+    self.assertIn("L3: 'abc.ABC' member requires", visitor.output_text())
+
+  def test_attribute_chains(self):
+    visitor = self.visit("import abc as a\nx = a.ABC.register\ny = a.ABC.register.z")
+    self.assertEqual(["abc", "abc.ABC.register", "abc.ABC", "abc.ABC.register.z"],
+                     visitor.modules())
+    self.assertEqual(["abc.ABC"], visitor.members())
+
+  def test_inert_nodes_are_skipped(self):
+    # Operators and constants are skipped but must not affect results.
+    src = "x = [1, 2.0, 'a', None, -1, ~2, 3 ** 4, 5 // 6, 7 >= 8, 9 is not 0, True, ...]"
+    visitor = self.visit(src)
+    self.assertEqual([None, (3, 0)], visitor.minimum_versions())
+    if current_version() >= (3, 5):
+      self.assertTrue(self.visit("a = 1\nb = a @ [2]").infix_matrix_multiplication())
+    self.assertTrue(self.visit("x = [None, True]").bool_const())
+
+    # Nothing is skipped when printing visits.
+    self.config.set_print_visits(True)
+    visitor = self.visit(src)
+    self.assertIn("USub()", visitor.output_text())
+    self.assertIn("Invert()", visitor.output_text())
+    self.config.set_print_visits(False)
+
+    # Handlers of no-op nodes overridden by subclasses are not skipped.
+    class AddVisitor(SourceVisitor):
+      adds = 0
+
+      def visit_Add(self, node):
+        AddVisitor.adds += 1
+
+    (node, _, _) = Parser("x = 1 + 2 + 3").detect(self.config)
+    visitor = AddVisitor(self.config)
+    visitor.set_no_lines(set())
+    visitor.tour(node)
+    self.assertEqual(2, AddVisitor.adds)
+
+    class ConstantVisitor(SourceVisitor):
+      values = []
+
+      def visit_Constant(self, node):
+        ConstantVisitor.values.append(node.value)
+        super().visit_Constant(node)
+
+    visitor = ConstantVisitor(self.config)
+    visitor.set_no_lines(set())
+    visitor.tour(node)
+    if current_version() >= (3, 8):
+      self.assertEqual([1, 2, 3], ConstantVisitor.values)
+
   def test_mod_inverse_pow(self):
     # All arguments must be ints.
     visitor = self.visit("pow(1.1, -1, 3)")
@@ -720,6 +861,35 @@ test.py:6:9:2.7:3.2:'argparse' module
     sys.argv = [sys.argv[0]]
     self.assertEqual(ex.exception.code, 1)
 
+  def test_main_target_matrix(self):
+    fp = ScopedTemporaryFile()
+    fp.writeln(b"import argparse")
+    fp.close()
+    for (matrix, code) in ((["--matrix=2.7-:3.2-", "--matrix=3-"], 1),
+                           (["--matrix=2.7-:3.2-", "--matrix=2.7:3.2"], 0)):
+      with self.assertRaises(SystemExit) as ex:
+        main(["-q"] + matrix + [fp.path()])
+      self.assertEqual(code, ex.exception.code)
+
+  def test_target_sets(self):
+    self.assertEqual([(False, (2, 7)), (True, (3, 6))], parse_target_set("3.6:2.7-"))
+    self.assertEqual([(False, (3, 8))], parse_target_set("3.8-"))
+    for value in ("", "3.6:", "2.7:3.6:3.8", "1.0"):
+      self.assertIsNone(parse_target_set(value))
+
+    targets = parse_target_set("2.7-:3.6-")
+    self.assertFalse(violates_targets([(2, 7), (3, 2)], targets))
+    self.assertTrue(violates_targets([None, (3, 2)], targets))
+    self.assertTrue(violates_targets([(2, 7), (3, 8)], targets))
+    self.assertTrue(targets_met(targets, [(2, 7), (3, 2)]))
+    self.assertFalse(targets_met(targets, [(3, 2)]))
+
+    # A single target only constrains its major version.
+    targets = parse_target_set("3.6-")
+    self.assertFalse(violates_targets([None, (3, 2)], targets))
+    self.assertTrue(violates_targets([(2, 0), (3, 8)], targets))
+    self.assertTrue(targets_met(targets, [(3, 2)]))
+
   def test_main_no_rules_hit_target_not_met_violations_mode(self):
     # Python file that doesn't hit any rules, even with targets, should exit successfully for
     # violations mode.
@@ -775,6 +945,98 @@ test.py:6:9:2.7:3.2:'argparse' module
     self.assertEqual(lines[0], "{}:::~2:~3:".format(path))
     self.assertEqual(lines[1], ":::~2:~3:")
 
+  def test_main_ndjson(self):
+    folder = mkdtemp()
+    try:
+      a = touch(folder, "a:b.py", "import argparse\n")
+      b = touch(folder, "b.py", "import argparse\n")
+      c = touch(folder, "c.py", "print 'x'\n")
+      backup_stdout = sys.stdout
+      sys.stdout = io.StringIO()
+      try:
+        with self.assertRaises(SystemExit) as ex:
+          main(["--format", "ndjson", "-p=1", folder])
+        output = sys.stdout.getvalue()
+      finally:
+        sys.stdout = backup_stdout
+      self.assertEqual(0, ex.exception.code)
+
+      # Every line is a record, and paths containing ":" aren't ignored. Records of each file come
+      # together, including those of syntax errors.
+      records = [json.loads(line) for line in output.splitlines()]
+      self.assertEqual([("finding", a), ("file", a), ("finding", b), ("file", b), ("finding", c),
+                        ("file", c)], [(r["type"], r["path"]) for r in records[:-1]])
+      self.assertEqual({"type": "file", "path": b, "versions": [[2, 7], [3, 2]]}, records[3])
+      self.assertEqual({"type": "finding", "path": c, "line": 1, "column": 1,
+                        "versions": [[2, 0], None], "message": "info: `print 'x'`"}, records[4])
+      self.assertEqual({"type": "summary", "versions": [[2, 7], None]}, records[-1])
+    finally:
+      rmtree(folder)
+
+  def test_main_ndjson_dump(self):
+    folder = mkdtemp()
+    try:
+      a = touch(folder, "a.py", "import argparse\n")
+      b = touch(folder, "b.py", "import argparse\n")
+      backup_stdout = sys.stdout
+      sys.stdout = io.StringIO()
+      try:
+        with self.assertRaises(SystemExit) as ex:
+          main(["--format", "ndjson", "-d", "-p=1", folder])
+        output = sys.stdout.getvalue()
+      finally:
+        sys.stdout = backup_stdout
+      self.assertEqual(0, ex.exception.code)
+
+      # Dumps of AST node visits are records too, also of results copied from identical files.
+      records = [json.loads(line) for line in output.splitlines()]
+      visits = [r for r in records if r["type"] == "visit"]
+      self.assertEqual([r["text"] for r in visits if r["path"] == a],
+                       [r["text"] for r in visits if r["path"] == b])
+      self.assertTrue(any(r["text"].startswith("| Module(") for r in visits))
+      self.assertEqual([a, b], [r["path"] for r in records if r["type"] == "file"])
+    finally:
+      rmtree(folder)
+
+  def test_ndjson_replace_path(self):
+    fmt = NdjsonFormat()
+    text = '{"path": "a.py", "type": "finding"}\n| Module(body=[])\n'
+    self.assertEqual('{"path": "b.py", "type": "finding"}\n| Module(body=[])\n',
+                     fmt.replace_path(text, "a.py", "b.py"))
+
+  def test_main_machine_readable_reports(self):
+    folder = mkdtemp()
+    try:
+      path = touch(folder, "a.py", "import argparse\n")
+      args = ["--timings", "--matrix=2.7-:3.2-", "--matrix=3.1-", "-p=1", path]
+      (backup_stdout, backup_stderr) = (sys.stdout, sys.stderr)
+      for fmt in ("ndjson", "parsable"):
+        (sys.stdout, sys.stderr) = (io.StringIO(), io.StringIO())
+        try:
+          with self.assertRaises(SystemExit) as ex:
+            main(["--format", fmt] + args)
+          (output, errors) = (sys.stdout.getvalue(), sys.stderr.getvalue())
+        finally:
+          (sys.stdout, sys.stderr) = (backup_stdout, backup_stderr)
+        self.assertEqual(1, ex.exception.code)
+
+        # Reports are records of their own, or go to stderr, instead of leaking text into output.
+        if fmt == "ndjson":
+          records = [json.loads(line) for line in output.splitlines()]
+          self.assertEqual(["finding", "file", "timings", "summary", "matrix", "matrix"],
+                           [record["type"] for record in records])
+          self.assertEqual(1, records[2]["files"])
+          self.assertEqual({"type": "matrix", "targets": "3.1-", "met": False,
+                            "findings": [{"path": path, "message": "'argparse' module",
+                                          "versions": [[2, 7], [3, 2]]}]}, records[-1])
+          self.assertEmpty(errors)
+        else:
+          self.assertEqual([path + ":::2.7:3.2:", ":::2.7:3.2:"], output.splitlines()[-2:])
+          self.assertIn("Timings of 1 files", errors)
+          self.assertIn("Target matrix:", errors)
+    finally:
+      rmtree(folder)
+
   def test_process_file_not_Found(self):
     path = "nonexistent"
     res = Processor.process_individual((path, self.config))
@@ -790,6 +1052,15 @@ test.py:6:9:2.7:3.2:'argparse' module
     self.assertEmpty(proc_res.text)
     self.assertEmpty(proc_res.bps)
 
+  def test_process_keep_node(self):
+    proc_res = Processor.process_individual((sys.argv[0], self.config))
+    self.assertIsNone(proc_res.node)
+    self.assertFalse(hasattr(proc_res, "__dict__"))
+
+    proc_res = Processor.process_individual((sys.argv[0], self.config), keep_node=True)
+    self.assertIsInstance(proc_res.node, ast.Module)
+    self.assertEqual(proc_res.mins, [(2, 7), (3, 2)])
+
   def test_process_syntax_error(self):
     # Syntax error triggers minimum versions [0, 0].
     fp = ScopedTemporaryFile()
@@ -840,6 +1111,93 @@ urlopen(context=None)
       self.assertEqual(proc_res.text, msg)
       self.assertEmpty(proc_res.bps)
 
+  def test_identical_files(self):
+    folder = mkdtemp()
+    try:
+      for sub in ("a", "b"):
+        os.mkdir(join(folder, sub))
+      a = touch(folder, "a/x.py", "import argparse\n")
+      b = touch(folder, "b/x.py", "import argparse\n")
+      c = touch(folder, "c.py", "import abc\n")  # Same size but different contents.
+      d = touch(folder, "a/__init__.py", "import argparse\n")
+      e = touch(folder, "b/__init__.py", "import argparse\n")
+      f = touch(folder, "f.py", "import argparse\n")
+      self.assertEqual({b: a, e: d, f: a}, Processor.identical_files([a, b, c, d, e, f]))
+
+      # Known git blob ids are used instead of reading files.
+      self.assertEqual({b: a}, Processor.identical_files([a, b, c], blobs={a: "1", b: "1"}))
+    finally:
+      rmtree(folder)
+
+  def test_process_identical_files(self):
+    folder = mkdtemp()
+    try:
+      a = touch(folder, "a.py", "import argparse\n")
+      b = touch(folder, "b.py", "import argparse\n")
+      c = touch(folder, "c.py", "print 'x'\n")
+      d = touch(folder, "d.py", "print 'x'\n")
+      self.config.set_format(ParsableFormat())
+      self.config.set_verbose(3)
+      self.config.set_record_fingerprints(True)
+      backup_stdout = sys.stdout
+      sys.stdout = io.StringIO()
+      try:
+        results = Processor().process_results([a, b, c, d], self.config, 1)
+        output = sys.stdout.getvalue()
+      finally:
+        sys.stdout = backup_stdout
+      self.assertEqual([a, b, c, d], [res.path for res in results])
+      self.assertEqual([(2, 7), (3, 2)], results[1].mins)
+      self.assertEqual(results[0].text.replace(a, b), results[1].text)
+      self.assertTrue(results[1].text.startswith(b + ":1:"))
+      self.assertEqual(b, results[1].fingerprint.path)
+      self.assertEqual(results[0].fingerprint.entities, results[1].fingerprint.entities)
+
+      # Messages of files that failed to parse are part of their results too.
+      self.assertEmpty(output)
+      self.assertEqual(results[2].text.replace(c, d), results[3].text)
+      self.assertTrue(results[3].text.startswith(d + ":1:1:"))
+      self.assertEqual([(2, 0), None], results[3].mins)
+      self.assertEqual([(2, 0), None], results[3].fingerprint.mins)
+      self.assertEqual(d, results[3].fingerprint.path)
+    finally:
+      rmtree(folder)
+
+  def test_process_timings(self):
+    with ScopedTemporaryFile() as fp:
+      fp.writeln(b"import typing  # novm")
+      fp.close()
+      proc_res = Processor.process_individual((fp.path(), self.config))
+    self.assertEqual(len(b"import typing  # novm\n"), proc_res.bytes)
+    self.assertEqualItems(["read", "parse", "comments", "visit", "versions", "format"],
+                          proc_res.timings.keys())
+    self.assertTrue(all(secs >= 0 for secs in proc_res.timings.values()))
+
+  def test_timings_report(self):
+    timings = Timings(slowest=2)
+    for (path, secs) in (("a.py", 0.1), ("b.py", 0.3), ("c.py", 0.2)):
+      res = ProcessResult(path)
+      res.bytes = 10
+      res.timings = {"parse": secs, "visit": secs}
+      timings.add(res)
+    self.assertEqual(3, timings.files())
+    self.assertEqual(30, timings.bytes())
+    self.assertAlmostEqual(0.6, timings.totals()["parse"])
+    self.assertAlmostEqual(0.6, timings.totals()["visit"])
+    self.assertEqual(0.0, timings.totals()["read"])
+    self.assertEqual(["b.py", "c.py"], [path for (_, path, _) in timings.slowest()])
+
+    lines = timings.report()
+    self.assertEqual("Timings of 3 files (30 bytes):", lines[0])
+    self.assertIn("  parse         0.600s  50.0%", lines)
+    self.assertIn("Slowest 2 files:", lines)
+
+    record = timings.record()
+    self.assertEqual(("timings", 3, 30), (record["type"], record["files"], record["bytes"]))
+    self.assertAlmostEqual(0.6, record["phases"]["parse"])
+    self.assertAlmostEqual(1.2, record["total"])
+    self.assertEqual(["b.py", "c.py"], [entry["path"] for entry in record["slowest"]])
+
   def test_process_file_using_backport(self):
     fp = ScopedTemporaryFile()
     fp.writeln(b"import typing")
@@ -1048,3 +1406,124 @@ three - three.one
 
   def test_default_processes(self):
     self.assertEqual(cpu_count(), DEFAULT_PROCESSES)
+
+  def test_rule_tables_shared_per_backports(self):
+    (mods, mems, kwargs) = rule_tables(self.config)
+    self.assertEqual(MOD_REQS(self.config), mods)
+    self.assertEqual(MOD_MEM_REQS(self.config), mems)
+    self.assertEqual(KWARGS_REQS(self.config), kwargs)
+
+    # Same backports yield the same table instances.
+    other = rule_tables(Config())
+    self.assertIs(mods, other[0])
+    self.assertIs(mems, other[1])
+    self.assertIs(kwargs, other[2])
+
+    # Different backports yield different tables.
+    self.config.add_backport("typing")
+    bp_mods = rule_tables(self.config)[0]
+    self.assertIsNot(mods, bp_mods)
+    self.assertEqual(MOD_REQS(self.config), bp_mods)
+    self.assertNotEqual(mods["typing"], bp_mods["typing"])
+
+  def test_processor_worker_config(self):
+    fp = ScopedTemporaryFile()
+    fp.writeln(b"import argparse")
+    fp.close()
+    self.config.add_backport("argparse")
+    Processor.init_worker(self.config)
+    proc_res = Processor.process_path(fp.path())
+    self.assertEqual(fp.path(), proc_res.path)
+    self.assertEqual([(2, 3), (3, 1)], proc_res.mins)
+
+    # Workers are initialized with the config once and only receive paths.
+    (mins, _, _, _, _, _) = Processor().process([fp.path()], self.config, processes=2)
+    self.assertEqual([(2, 3), (3, 1)], mins)
+
+  def test_processor_make_batches(self):
+    paths = ["a", "b", "c", "d", "e"]
+    sizes = {"a": 10, "b": 1000000, "c": 20, "d": 30, "e": 500000}
+    batches = Processor.make_batches(paths, sizes, processes=2)
+
+    # All paths are batched exactly once with their original index.
+    self.assertEqualItems([(i, path, None) for (i, path) in enumerate(paths)],
+                          [entry for batch in batches for entry in batch])
+
+    # Biggest files are scheduled first, each in their own batch, and small files are grouped.
+    self.assertEqual([[(1, "b", None)], [(4, "e", None)],
+                      [(3, "d", None), (2, "c", None), (0, "a", None)]], batches)
+
+    # Git blob ids of paths are carried along.
+    batches = Processor.make_batches(paths, sizes, processes=2, blobs={"e": "0123"})
+    self.assertEqual([(4, "e", "0123")], batches[1])
+
+    # Without sizes, files are still spread across batches.
+    paths = ["f{}".format(i) for i in range(100)]
+    batches = Processor.make_batches(paths, None, processes=4)
+    self.assertGreater(len(batches), 4)
+    self.assertEqual(100, sum(len(batch) for batch in batches))
+
+    self.assertEmpty(Processor.make_batches([], None, processes=4))
+
+  def test_processor_ordered_results_with_sizes(self):
+    tmp_fld = mkdtemp()
+    paths = []
+    sizes = {}
+    for (i, mod) in enumerate(("argparse", "abc", "zoneinfo", "typing", "enum")):
+      path = touch(tmp_fld, "f{}.py".format(i), "import {}\n".format(mod) * (1 + 500 * (i % 2)))
+      paths.append(path)
+      sizes[path] = os.path.getsize(path)
+
+    output = io.StringIO()
+    stdout = sys.stdout
+    sys.stdout = output
+    self.config.set_verbose(1)
+    try:
+      Processor().process(paths, self.config, processes=2, sizes=sizes)
+    finally:
+      sys.stdout = stdout
+    rmtree(tmp_fld)
+
+    # Results are output in the order of the paths even though bigger files are processed first.
+    lines = output.getvalue().splitlines()
+    self.assertEqual(paths, [line.split()[-1] for line in lines])
+
+  def test_processor_process_stream(self):
+    tmp_fld = mkdtemp()
+    paths = []
+    for (i, mod) in enumerate(("argparse", "abc", "zoneinfo", "typing", "enum")):
+      fld = join(tmp_fld, *["d{}".format(j) for j in range(i)])
+      if not os.path.exists(fld):
+        os.makedirs(fld)
+      paths.append(touch(fld, "f{}.py".format(i), "import {}\n".format(mod) * (1 + 500 * (i % 2))))
+    paths.sort()
+    touch(tmp_fld, "not_python.txt")
+
+    def run(stream, unordered, processes):
+      output = io.StringIO()
+      stdout = sys.stdout
+      sys.stdout = output
+      self.config.set_verbose(1)
+      self.config.set_unordered_output(unordered)
+      try:
+        if stream:
+          res = Processor().process_stream([tmp_fld], self.config, processes=processes)
+        else:
+          res = Processor().process(paths, self.config, processes=processes) + (len(paths),)
+      finally:
+        sys.stdout = stdout
+      return (res, [line.split()[-1] for line in output.getvalue().splitlines()])
+
+    expected = run(False, False, 2)
+    self.assertEqual(paths, expected[1])
+    try:
+      # Streamed results are output in path order, and aggregated like when not streaming.
+      self.assertEqual(expected, run(True, False, 2))
+      self.assertEqual(expected, run(True, False, 1))
+
+      # Unordered output contains the same results in any order.
+      for (res, output) in (run(True, True, 2), run(False, True, 2)):
+        self.assertEqual(expected[0], res)
+        self.assertEqual(paths, sorted(output))
+    finally:
+      rmtree(tmp_fld)
@@ -0,0 +1,175 @@
+import io
+import os
+import sys
+from os.path import join
+from tempfile import mkdtemp
+from shutil import rmtree
+
+from vermin import Processor, main
+from vermin.processor import ProcessResult
+from vermin.cache import ResultCache, git_blob_id
+from vermin.git import GitException, run_git, detect_git_paths
+
+from .testutils import VerminTest, touch
+
+class VerminGitTests(VerminTest):
+  def setUp(self):
+    super().setUp()
+    self.repo = mkdtemp()
+    self.cache_dir = mkdtemp()
+    try:
+      self.git("init", "-q")
+    except GitException as ex:  # pragma: no cover
+      self.tearDown()
+      self.skipTest("git is unavailable: {}".format(ex))
+
+    os.mkdir(join(self.repo, "sub"))
+    os.mkdir(join(self.repo, ".hidden"))
+    touch(self.repo, "a.py", "import argparse\n")
+    touch(self.repo, "b.py", "import abc\n")
+    touch(self.repo, "sub/c.py", "x = 1\n")
+    touch(self.repo, ".hidden/d.py", "import ast\n")
+    touch(self.repo, "README", "Not python.\n")
+    self.git("add", "-A")
+    self.git("-c", "user.name=vermin", "-c", "user.email=vermin@localhost", "commit", "-q", "-m",
+             "base")
+
+  def tearDown(self):
+    rmtree(self.repo)
+    rmtree(self.cache_dir)
+
+  def git(self, *args):
+    return run_git(list(args), self.repo)
+
+  def detect(self, paths, sizes=None):
+    return detect_git_paths(paths, "HEAD", config=self.config, sizes=sizes)
+
+  def test_blob_id_matches_git(self):
+    out = self.git("hash-object", "a.py")
+    self.assertEqual(out.decode().strip(), git_blob_id(b"import argparse\n"))
+
+  def test_detect_changed_and_untouched_paths(self):
+    touch(self.repo, "a.py", "import argparse\nimport abc\n")  # Changed.
+    os.remove(join(self.repo, "b.py"))                         # Deleted.
+    touch(self.repo, "e.py", "import json\n")                  # Untracked.
+
+    sizes = {}
+    (paths, blobs) = self.detect([self.repo], sizes)
+    (a, c, e) = (join(self.repo, "a.py"), join(self.repo, "sub", "c.py"), join(self.repo, "e.py"))
+    self.assertEqual([a, e, c], paths)
+    self.assertEqual({c: git_blob_id(b"x = 1\n")}, blobs)
+    self.assertEqual(len("x = 1\n"), sizes[c])
+    self.assertEqual(len("import json\n"), sizes[e])
+
+    # Sub-folders only yield files within.
+    self.assertEqual(([c], blobs), self.detect([join(self.repo, "sub")]))
+
+    # Top-level files are always accepted.
+    readme = join(self.repo, "README")
+    self.assertEqual(([readme], {readme: git_blob_id(b"Not python.\n")}), self.detect([readme]))
+
+  def test_detect_hidden_paths(self):
+    (paths, _) = detect_git_paths([self.repo], "HEAD", hidden=True, config=self.config)
+    self.assertIn(join(self.repo, ".hidden", "d.py"), paths)
+
+  def test_invalid_base(self):
+    with self.assertRaises(GitException):
+      detect_git_paths([self.repo], "nonexistent", config=self.config)
+
+  def test_not_repository(self):
+    folder = mkdtemp()
+    try:
+      with self.assertRaises(GitException):
+        self.detect([folder])
+    finally:
+      rmtree(folder)
+
+  def test_untouched_results_from_cache(self):
+    self.config.set_cache_dir(self.cache_dir)
+    (paths, blobs) = self.detect([self.repo])
+    processor = Processor()
+    self.assertEqual([(2, 7), (3, 2)], processor.process(paths, self.config, 1, None, blobs)[0])
+
+    # Tamper with the cached result of an untouched file to show it is used without reading it.
+    c = join(self.repo, "sub", "c.py")
+    cache = ResultCache(self.cache_dir, self.config)
+    res = Processor.process_individual((c, self.config))
+    res.mins = [(2, 1), (3, 8)]
+    cache.store(cache.blob_key(c, blobs[c]), res)
+    self.assertEqual([(2, 7), (3, 8)], processor.process(paths, self.config, 1, None, blobs)[0])
+    self.assertEqual([(2, 7), (3, 8)], processor.process(paths, self.config, 2, None, blobs)[0])
+
+    # Changed files are analyzed.
+    touch(self.repo, "sub/c.py", "import abc\n")
+    (paths, blobs) = self.detect([self.repo])
+    self.assertNotIn(c, blobs)
+    self.assertEqual([(2, 7), (3, 2)], processor.process(paths, self.config, 1, None, blobs)[0])
+
+  def test_process_results_of_untouched_files_from_cache(self):
+    self.config.set_cache_dir(self.cache_dir)
+    (paths, blobs) = self.detect([self.repo])
+    processor = Processor()
+    processor.process_results(paths, self.config, 1, None, blobs)
+
+    # Tamper with the cached result of an untouched file to show it is used without reading it.
+    c = join(self.repo, "sub", "c.py")
+    cache = ResultCache(self.cache_dir, self.config)
+    res = Processor.process_individual((c, self.config))
+    res.mins = [(2, 1), (3, 8)]
+    cache.store(cache.blob_key(c, blobs[c]), res)
+    for processes in (1, 2):
+      results = processor.process_results(paths, self.config, processes, None, blobs)
+      self.assertEqual(paths, [res.path for res in results])
+      self.assertEqual([(2, 1), (3, 8)], results[paths.index(c)].mins)
+
+  def test_main_changed_files_of_shard(self):
+    touch(self.repo, "a.py", "import argparse\nimport abc\n")
+    stdout = sys.stdout
+    sys.stdout = io.StringIO()
+    try:
+      with self.assertRaises(SystemExit):
+        main(["--no-tips", "-v", "--git-base", "HEAD", "--cache-dir", self.cache_dir,
+              "--shard", "1/2", "-p=1", self.repo])
+      output = sys.stdout.getvalue()
+    finally:
+      sys.stdout = stdout
+    # The shard has a.py, which is changed, and sub/c.py, which isn't.
+    self.assertIn("Shard 1/2 has 2 of 3 files", output)
+    self.assertIn("1 files changed or added relative to HEAD", output)
+
+  def test_untouched_results_cached_under_blob_ids(self):
+    # Working tree contents differ from their blobs with end-of-line conversion, but the results of
+    # untouched files must still be found in the cache on subsequent runs.
+    touch(self.repo, ".gitattributes", "*.py text eol=crlf\n")
+    self.git("add", ".gitattributes")
+    self.git("-c", "user.name=vermin", "-c", "user.email=vermin@localhost", "commit", "-q", "-m",
+             "crlf")
+    os.remove(join(self.repo, "b.py"))
+    self.git("checkout", "--", "b.py")
+    b = join(self.repo, "b.py")
+    with open(b, mode="rb") as fp:
+      source = fp.read()
+    self.assertEqual(b"import abc\r\n", source)
+
+    self.config.set_cache_dir(self.cache_dir)
+    (paths, blobs) = self.detect([self.repo])
+    self.assertIn(b, blobs)
+    self.assertNotEqual(git_blob_id(source), blobs[b])
+
+    cache = ResultCache(self.cache_dir, self.config)
+    for processes in (1, 2):
+      rmtree(self.cache_dir)
+      Processor().process(paths, self.config, processes, None, blobs)
+      self.assertEqual(b, Processor.load_cached([b], self.config, blobs)[b].path)
+      self.assertFalse(cache.load(cache.key(b, source), ProcessResult(b))[0])
+
+  def test_main_warns_without_cache(self):
+    stdout = sys.stdout
+    sys.stdout = io.StringIO()
+    try:
+      with self.assertRaises(SystemExit):
+        main(["--no-tips", "--git-base", "HEAD", "-p=1", self.repo])
+      output = sys.stdout.getvalue()
+    finally:
+      sys.stdout = stdout
+    self.assertIn("results cache, which isn't enabled", output)
@@ -0,0 +1,107 @@
+import io
+import sys
+from os.path import join
+from tempfile import mkdtemp
+from shutil import rmtree
+
+from vermin import Processor, main
+from vermin.utility import parse_shard
+from vermin.shard import shard_paths, save_partial, load_partial, load_partials
+
+from .testutils import VerminTest, touch
+
+class VerminShardTests(VerminTest):
+  def setUp(self):
+    super().setUp()
+    self.folder = mkdtemp()
+    self.config.set_processes(1)
+
+  def tearDown(self):
+    rmtree(self.folder)
+
+  def run_main(self, args):
+    backup_stdout = sys.stdout
+    sys.stdout = io.StringIO()
+    try:
+      with self.assertRaises(SystemExit) as ex:
+        main(["--no-tips", "--no-make-paths-absolute", "-p=1"] + args)
+      return (ex.exception.code, sys.stdout.getvalue())
+    finally:
+      sys.stdout = backup_stdout
+
+  def test_parse_shard(self):
+    self.assertEqual((1, 1), parse_shard("1/1"))
+    self.assertEqual((3, 4), parse_shard("3/4"))
+    for value in ("", "1", "0/4", "5/4", "-1/4", "1/4/4", "a/4", "1/"):
+      self.assertIsNone(parse_shard(value))
+
+  def test_shard_paths(self):
+    paths = ["a", "b", "c", "d", "e"]
+    shards = [shard_paths(paths, (i, 3)) for i in (1, 2, 3)]
+    self.assertEqual([["a", "d"], ["b", "e"], ["c"]], shards)
+    self.assertEqual([], shard_paths(paths, (6, 6)))
+
+  def test_save_and_load(self):
+    paths = [touch(self.folder, "a.py", "import argparse\n"),
+             touch(self.folder, "b.py", "print 'hi'\n")]
+    results = Processor().process_results(paths, self.config, 1) + [None]
+    path = join(self.folder, "partial.json")
+    save_partial(path, (2, 3), 3, results)
+    (shard, amount, loaded) = load_partial(path)
+    self.assertEqual(((2, 3), 3), (shard, amount))
+    self.assertEqual(paths, [res.path for res in loaded])
+    for (res, res2) in zip(results, loaded):
+      self.assertEqual(res.to_dict(), res2.to_dict())
+
+    touch(self.folder, "invalid.json", '{"shard": [1, 2], "amount": 1, "results": [{}]}')
+    with self.assertRaises(ValueError):
+      load_partial(join(self.folder, "invalid.json"))
+    touch(self.folder, "invalid.json", '{"shard": [3, 2], "amount": 0, "results": []}')
+    with self.assertRaises(ValueError):
+      load_partial(join(self.folder, "invalid.json"))
+
+  def test_load_partials(self):
+    def partial(name, shard, path=None):
+      results = []
+      if path is not None:
+        results = Processor().process_results([path], self.config, 1)
+      save_partial(join(self.folder, name), shard, len(results), results)
+      return join(self.folder, name)
+
+    a = touch(self.folder, "a.py", "import argparse\n")
+    b = touch(self.folder, "b.py", "import abc\n")
+    p1 = partial("p1.json", (1, 2), b)
+    p2 = partial("p2.json", (2, 2), a)
+    (results, amount) = load_partials([p1, p2])
+    self.assertEqual(([a, b], 2), ([res.path for res in results], amount))
+
+    with self.assertRaises(ValueError):
+      load_partials([])
+    with self.assertRaises(ValueError):
+      load_partials([p1])  # Missing shard 2.
+    with self.assertRaises(ValueError):
+      load_partials([p1, p2, p1])
+    with self.assertRaises(ValueError):
+      load_partials([p1, p2, partial("p3.json", (1, 3))])
+
+  def test_merge_matches_full_analysis(self):
+    touch(self.folder, "a.py", "import argparse\n")
+    touch(self.folder, "b.py", "import asyncio\nprint 'hi'\n")
+    touch(self.folder, "c.py", "def f(*, a): pass\n")
+    touch(self.folder, "d.py", "import typing\n")
+    args = ["-vvv", "--matrix=2.7-:3.4-", self.folder]
+    (code, expected) = self.run_main(args)
+
+    partials = []
+    for i in (1, 2, 3):
+      partials.append(join(self.folder, "partial{}.json".format(i)))
+      (shard_code, _) = self.run_main(["--shard", "{}/3".format(i), "--save-partial",
+                                       partials[-1]] + args)
+      self.assertIn(shard_code, (0, 1))
+    (merge_code, actual) = self.run_main(["--merge"] + args[:-1] + partials)
+    self.assertEqual(code, merge_code)
+    self.assertEqual(expected.splitlines()[2:], actual.splitlines()[2:])
+
+    (code, output) = self.run_main(["--merge"] + partials[:2])
+    self.assertEqual(1, code)
+    self.assertIn("Missing shards of 3: 3", output)
@@ -0,0 +1,58 @@
+import os
+from tempfile import mkdtemp
+from shutil import rmtree
+
+from vermin import Processor
+from vermin.watch import Watcher
+
+from .testutils import VerminTest, touch
+
+class VerminWatchTests(VerminTest):
+  def setUp(self):
+    super().setUp()
+    self.folder = mkdtemp()
+    self.config.set_processes(1)
+    self.config.set_quiet(True)
+    self.a = touch(self.folder, "a.py", "import argparse\n")
+    self.b = touch(self.folder, "b.py", "import abc\n")
+
+  def tearDown(self):
+    rmtree(self.folder)
+
+  def modify(self, path, contents):
+    # Ensure the modification time differs even on file systems with coarse timestamps.
+    st = os.stat(path)
+    touch(self.folder, os.path.basename(path), contents)
+    os.utime(path, (st.st_atime, st.st_mtime + 10))
+
+  def test_update_only_reanalyzes_changes(self):
+    watcher = Watcher([self.folder], self.config)
+    processor = Processor()
+    results = watcher.update(processor)
+    self.assertEqual([self.a, self.b], [res.path for res in results])
+    self.assertIsNone(watcher.update(processor))
+
+    self.modify(self.b, "import asyncio\n")
+    c = touch(self.folder, "c.py", "x = 1\n")
+    results = watcher.update(processor)
+    self.assertEqual([self.b, c], [res.path for res in results])
+    self.assertEqual([self.a, self.b, c], [res.path for res in watcher.results()])
+    self.assertEqual([None, (3, 4)], Processor.aggregate(watcher.results(), self.config)[0])
+
+    os.remove(self.b)
+    self.assertEqual([], watcher.update(processor))
+    self.assertEqual([self.a, c], [res.path for res in watcher.results()])
+    self.assertEqual([(2, 7), (3, 2)], Processor.aggregate(watcher.results(), self.config)[0])
+
+  def test_watch_reports_until_interrupted(self):
+    reports = []
+
+    def report(aggregate):
+      reports.append(aggregate[0])
+      if len(reports) == 2:
+        raise KeyboardInterrupt
+      self.modify(self.a, "import abc\n")
+      return len(reports)
+
+    self.assertEqual(1, Watcher([self.folder], self.config, interval=0).watch(report))
+    self.assertEqual([[(2, 7), (3, 2)], [(2, 6), (3, 0)]], reports)
@@ -6,6 +6,7 @@ from .backports import Backports
 from .features import Features
 from .config import Config
 from .printing import nprint
+from .utility import parse_target_set, parse_shard
 from . import formats
 
 class Arguments:
@@ -69,6 +70,11 @@ class Arguments:
             "        triggered, it will exit with code 0.\n")
       print("  --no-target (default)\n"
             "        Don't expect certain target version(s).\n")
+      print("  [--matrix=V[:V]] ...\n"
+            "        Set of one or two target versions, like '--matrix=2.7-:3.6-', to report as\n"
+            "        met or not met together with the findings violating it. Can be specified\n"
+            "        multiple times to check several sets from a single analysis. If any set\n"
+            "        isn't met Vermin will exit with code 1. Ignores --stream.\n")
       print("  --processes=N | -p=N\n"
             "        Use N concurrent processes to detect and analyze files. Defaults to all\n"
             "        cores ({}).\n".format(DEFAULT_PROCESSES))
@@ -131,13 +137,72 @@ class Arguments:
             "        Parse for comments to influence exclusion of code for analysis via\n"
             "        \"# novm\" and \"# novermin\".")
       print("\n  --no-parse-comments\n"
-            "        Don't parse for comments. Not parsing comments can sometimes yield a speedup\n"
-            "        of 30-40%+.")
+            "        Don't parse for comments. Comments are only parsed in files containing\n"
+            "        \"novm\" or \"novermin\" so other files are unaffected.")
       print("\n  --scan-symlink-folders\n"
             "        Scan symlinks to folders to include in analysis.")
       print("\n  --no-symlink-folders (default)\n"
             "        Don't scan symlinks to folders to include in analysis. Symlinks\n"
             "        to non-folders or top-level folders will always be scanned.")
+      print("\n  --cache-dir <path>\n"
+            "        Cache analysis results persistently in folder such that files are only\n"
+            "        reanalyzed when their contents, the Vermin version, or options affecting\n"
+            "        results change. The folder is created if it doesn't exist.")
+      print("\n  --no-cache-dir (default)\n"
+            "        Don't cache analysis results.")
+      print("\n  --stream\n"
+            "        Analyze files as soon as they are detected instead of waiting for all paths\n"
+            "        to be detected first. Speeds up analysis of big folder trees.")
+      print("\n  --no-stream (default)\n"
+            "        Detect all paths before analyzing them.")
+      print("\n  --unordered\n"
+            "        Show results of files as soon as they are ready instead of in order.")
+      print("\n  --ordered (default)\n"
+            "        Show results of files in deterministic order sorted by path.")
+      print("\n  --timings[=N]\n"
+            "        Show time spent per phase of processing files, like reading, parsing, and\n"
+            "        visiting, summed across processes, and the N slowest files (defaults to\n"
+            "        10).")
+      print("\n  --no-timings (default)\n"
+            "        Don't show timings.")
+      print("\n  --git-base <rev>\n"
+            "        Only analyze files changed or added relative to git revision, like\n"
+            "        'origin/main', using the local git repository of the paths. Results of\n"
+            "        untouched files are taken from the results cache, see --cache-dir, and files\n"
+            "        missing from it are analyzed too, as are all files if it isn't enabled.")
+      print("\n  --no-git-base (default)\n"
+            "        Analyze all detected files.")
+      print("\n  --daemon <path>\n"
+            "        Serve analysis requests over Unix socket at path instead of analyzing paths,\n"
+            "        keeping worker processes and rule tables warm between requests. Requests are\n"
+            "        sent using the thin client: vermin_client.py <path> [options] <paths..>\n"
+            "        Paths of requests are made absolute using the working folder of the client.\n"
+            "        Requests cannot use --daemon or --watch.")
+      print("\n  --watch\n"
+            "        Analyze paths and keep watching them for changes until interrupted, only\n"
+            "        reanalyzing files that are added or modified and showing updated results.\n"
+            "        Changes are detected by polling every second. Ignores --git-base.")
+      print("\n  --save-fingerprints <file>\n"
+            "        Save entities used by each analyzed file, like modules, members, and\n"
+            "        language features, to file such that they can be evaluated later via\n"
+            "        --fingerprints.\n"
+            "        Ignores --stream.")
+      print("\n  --fingerprints <file>\n"
+            "        Evaluate entities saved via --save-fingerprints instead of analyzing paths.\n"
+            "        Results reflect the backports, exclusions, and targets of this run without\n"
+            "        parsing files again, while other options are those used when saving.")
+      print("\n  --shard <i/N>\n"
+            "        Only analyze shard i of N, where 1 <= i <= N, of the detected files, which\n"
+            "        are partitioned deterministically such that N runs together analyze every\n"
+            "        file exactly once. Ignores --stream.")
+      print("\n  --save-partial <file>\n"
+            "        Save results of each analyzed file to file such that the partial results of\n"
+            "        all shards can be combined via --merge. Ignores --stream.")
+      print("\n  --merge\n"
+            "        Combine partial results files, given instead of paths, of all N shards and\n"
+            "        show the same results as analyzing all files in one go. Options affecting\n"
+            "        results must be the same as those used for the shards. Messages of files\n"
+            "        that only parse as python 2 are shown by the shards instead.")
       print("\n  --format <name> | -f <name>\n"
             "        Format to show results and output in.\n"
             "        Supported formats:\n{}".format(formats.help_str(10)))
@@ -198,6 +263,14 @@ class Arguments:
 
     path_pos = 0
     versions = False
+    daemon = None
+    watch = False
+    matrix = []
+    save_fingerprints = None
+    fingerprints = None
+    shard = None
+    save_partial = None
+    merge = False
     fmt = None
     detected_config = Config.detect_config_file(detect_folder)
     argument_config = None
@@ -259,6 +332,14 @@ class Arguments:
       elif arg == "--no-target":
         config.clear_targets()
         path_pos += 1
+      elif arg.startswith("--matrix="):
+        value = arg.split("=")[1]
+        targets = parse_target_set(value)
+        if targets is None:
+          print("Invalid target set: {}".format(value))
+          return {"code": 1}
+        matrix.append(targets)
+        path_pos += 1
       elif arg in ("--ignore", "-i"):
         config.set_ignore_incomp(True)
         path_pos += 1
@@ -397,6 +478,93 @@ class Arguments:
       elif arg == "--no-symlink-folders":
         config.set_scan_symlink_folders(False)
         path_pos += 1
+      elif arg == "--cache-dir":
+        if (i + 1) >= len(self.__args):
+          print("Requires cache folder path! Example: --cache-dir .vermin_cache")
+          return {"code": 1}
+        config.set_cache_dir(self.__args[i + 1])
+        path_pos += 2
+      elif arg == "--no-cache-dir":
+        config.set_cache_dir(None)
+        path_pos += 1
+      elif arg == "--stream":
+        config.set_stream(True)
+        path_pos += 1
+      elif arg == "--no-stream":
+        config.set_stream(False)
+        path_pos += 1
+      elif arg == "--unordered":
+        config.set_unordered_output(True)
+        path_pos += 1
+      elif arg == "--ordered":
+        config.set_unordered_output(False)
+        path_pos += 1
+      elif arg == "--timings":
+        config.set_timings(10)
+        path_pos += 1
+      elif arg.startswith("--timings="):
+        value = arg.split("=")[1]
+        try:
+          slowest = int(value)
+          if slowest <= 0:
+            print("Non-positive number: {}".format(slowest))
+            return {"code": 1}
+          config.set_timings(slowest)
+        except ValueError:
+          print("Invalid value: {}".format(value))
+          return {"code": 1}
+        path_pos += 1
+      elif arg == "--no-timings":
+        config.set_timings(0)
+        path_pos += 1
+      elif arg == "--git-base":
+        if (i + 1) >= len(self.__args):
+          print("Requires git revision! Example: --git-base origin/main")
+          return {"code": 1}
+        config.set_git_base(self.__args[i + 1])
+        path_pos += 2
+      elif arg == "--no-git-base":
+        config.set_git_base(None)
+        path_pos += 1
+      elif arg == "--daemon":
+        if (i + 1) >= len(self.__args):
+          print("Requires socket path! Example: --daemon /tmp/vermin.sock")
+          return {"code": 1}
+        daemon = self.__args[i + 1]
+        path_pos += 2
+      elif arg == "--watch":
+        watch = True
+        path_pos += 1
+      elif arg == "--save-fingerprints":
+        if (i + 1) >= len(self.__args):
+          print("Requires file name! Example: --save-fingerprints fingerprints.json")
+          return {"code": 1}
+        save_fingerprints = self.__args[i + 1]
+        path_pos += 2
+      elif arg == "--fingerprints":
+        if (i + 1) >= len(self.__args):
+          print("Requires file name! Example: --fingerprints fingerprints.json")
+          return {"code": 1}
+        fingerprints = self.__args[i + 1]
+        path_pos += 2
+      elif arg == "--shard":
+        if (i + 1) >= len(self.__args):
+          print("Requires shard! Example: --shard 1/4")
+          return {"code": 1}
+        shard = parse_shard(self.__args[i + 1])
+        if shard is None:
+          print("Invalid shard: {}".format(self.__args[i + 1]))
+          return {"code": 1}
+        path_pos += 2
+      elif arg == "--save-partial":
+        if (i + 1) >= len(self.__args):
+          print("Requires file name! Example: --save-partial partial.json")
+          return {"code": 1}
+        save_partial = self.__args[i + 1]
+        path_pos += 2
+      elif arg == "--merge":
+        merge = True
+        path_pos += 1
 
     if fmt is not None:
       config.set_format(fmt)
@@ -414,14 +582,22 @@ class Arguments:
       print("Cannot use quiet and verbose modes together!")
       return {"code": 1}
 
-    parsable = config.format().name() == "parsable"
-    if parsable:
+    machine_readable = config.format().machine_readable()
+    if machine_readable:
       versions = False
 
-    if loaded_config and detected_config and not argument_config and not parsable:
+    if loaded_config and detected_config and not argument_config and not machine_readable:
       nprint("Using detected config: {}".format(detected_config), config)
 
     paths = self.__args[path_pos:]
     return {"code": 0,
             "paths": paths,
-            "versions": versions}
+            "versions": versions,
+            "daemon": daemon,
+            "watch": watch,
+            "matrix": matrix,
+            "save_fingerprints": save_fingerprints,
+            "fingerprints": fingerprints,
+            "shard": shard,
+            "save_partial": save_partial,
+            "merge": merge}
@@ -0,0 +1,106 @@
+import os
+import json
+from hashlib import sha1, sha256
+from tempfile import mkstemp
+
+from .constants import VERSION
+
+def git_blob_id(source):
+  """Yields git blob id of source bytes, which is what `git hash-object` yields for a file with
+those contents."""
+  h = sha1()
+  h.update("blob {}\0".format(len(source)).encode("ascii"))
+  h.update(source)
+  return h.hexdigest()
+
+class ResultCache:
+  """Persistent on-disk cache of file processing results. Entries are keyed by the path and contents
+of a file, the Vermin version, and the config options that affect results, such that unchanged files
+can skip parsing and visitation entirely on subsequent runs."""
+
+  def __init__(self, folder, config):
+    self.__folder = folder
+    self.__fingerprint = ResultCache.config_fingerprint(config)
+
+  def folder(self):
+    return self.__folder
+
+  @staticmethod
+  def config_fingerprint(config):
+    """Yields string of the config options that affect processing results of a file."""
+    return repr((config.quiet(), config.verbose(), config.print_visits(), config.ignore_incomp(),
+                 config.pessimistic(), config.exclusions(), sorted(config.backports()),
+                 sorted(config.features()), config.targets(), config.eval_annotations(),
+                 config.only_show_violations(), config.parse_comments(), config.format().name(),
+                 config.record_fingerprints()))
+
+  def key(self, path, source):
+    """Yields cache key of file path and its source bytes."""
+    return self.blob_key(path, git_blob_id(source))
+
+  def blob_key(self, path, blob):
+    """Yields cache key of file path and the git blob id of its contents. Contents are identified by
+git blob id such that results of files untouched in a git repository can be looked up without
+reading them."""
+    h = sha256()
+    for value in (VERSION, self.__fingerprint, path, blob):
+      h.update(value.encode("utf-8", "backslashreplace"))
+      h.update(b"\0")
+    return h.hexdigest()
+
+  def __entry_path(self, key):
+    return os.path.join(self.__folder, key[:2], key + ".json")
+
+  def load(self, key, res):
+    """Loads cached entry of key into process result `res`. Yields tuple of whether an entry was
+found and the resulting process result, which is None if the cached file wasn't python code."""
+    try:
+      with open(self.__entry_path(key), mode="r", encoding="utf-8") as fp:
+        entry = json.load(fp)
+    except (OSError, ValueError):
+      return (False, res)
+
+    # Entries that are truncated or of an older schema are misses.
+    try:
+      if not entry["python"]:
+        return (True, None)
+      return (True, res.load_dict(entry))
+    except (KeyError, TypeError, AttributeError, ValueError):
+      return (False, res)
+
+  def store(self, key, res):
+    """Stores process result `res`, or None if not python code, as entry of key. Failing to write
+the entry is silently ignored since the cache is only an optimization."""
+    if res is None:
+      entry = {"python": False}
+    else:
+      entry = res.to_dict()
+      entry["python"] = True
+
+    path = self.__entry_path(key)
+    folder = os.path.dirname(path)
+    tmp_path = None
+    try:
+      if not os.path.isdir(folder):
+        try:
+          os.makedirs(folder)
+        except OSError:  # pragma: no cover
+          # Another process might have created it concurrently.
+          if not os.path.isdir(folder):
+            raise
+
+      # Write to a temporary file first and then rename it into place such that concurrent readers
+      # never observe partially written entries.
+      (fd, tmp_path) = mkstemp(suffix=".tmp", dir=folder)
+      with os.fdopen(fd, "w", encoding="utf-8") as fp:
+        json.dump(entry, fp)
+      os.rename(tmp_path, path)
+      tmp_path = None
+    except (OSError, TypeError, ValueError):  # pragma: no cover
+      pass
+    finally:
+      if tmp_path is not None:
+        try:
+          os.remove(tmp_path)
+        except OSError:  # pragma: no cover
+          pass
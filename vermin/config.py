@@ -35,6 +35,12 @@ class Config:
     self.__only_show_violations = False
     self.__parse_comments = True
     self.__scan_symlink_folders = False
+    self.__cache_dir = None
+    self.__stream = False
+    self.__unordered_output = False
+    self.__timings = 0
+    self.__git_base = None
+    self.__record_fingerprints = False
     self.set_format(DefaultFormat())
 
   def override_from(self, other_config):
@@ -56,6 +62,12 @@ class Config:
     self.__only_show_violations = other_config.only_show_violations()
     self.__parse_comments = other_config.parse_comments()
     self.__scan_symlink_folders = other_config.scan_symlink_folders()
+    self.__cache_dir = other_config.cache_dir()
+    self.__stream = other_config.stream()
+    self.__unordered_output = other_config.unordered_output()
+    self.__timings = other_config.timings()
+    self.__git_base = other_config.git_base()
+    self.__record_fingerprints = other_config.record_fingerprints()
     self.set_format(other_config.format())
 
   def __repr__(self):
@@ -78,13 +90,21 @@ class Config:
   only_show_violations = {}
   parse_comments = {}
   scan_symlink_folders = {}
+  cache_dir = {}
+  stream = {}
+  unordered_output = {}
+  timings = {}
+  git_base = {}
+  record_fingerprints = {}
   format = {}
 )""".format(self.__class__.__name__, self.quiet(), self.verbose(), self.print_visits(),
             self.processes(), self.ignore_incomp(), self.pessimistic(), self.show_tips(),
             self.analyze_hidden(), self.exclusions(), self.exclusion_regex(),
             self.make_paths_absolute(), list(self.backports()), list(self.features()),
             self.targets(), self.eval_annotations(), self.only_show_violations(),
-            self.parse_comments(), self.scan_symlink_folders(), self.format().name())
+            self.parse_comments(), self.scan_symlink_folders(), self.cache_dir(),
+            self.stream(), self.unordered_output(), self.timings(), self.git_base(),
+            self.record_fingerprints(), self.format().name())
 
   @staticmethod
   def parse_file(path):
@@ -132,6 +152,11 @@ class Config:
       "only_show_violations": str(config.only_show_violations()),
       "parse_comments": str(config.parse_comments()),
       "scan_symlink_folders": str(config.scan_symlink_folders()),
+      "cache_dir": config.cache_dir() or "",
+      "stream": str(config.stream()),
+      "unordered_output": str(config.unordered_output()),
+      "timings": str(config.timings()),
+      "git_base": config.git_base() or "",
       "format": config.format().name(),
     }
     if sys.version_info < (3, 2):  # pragma: no cover
@@ -190,6 +215,9 @@ class Config:
     config.set_only_show_violations(getbool("only_show_violations"))
     config.set_parse_comments(getbool("parse_comments"))
     config.set_scan_symlink_folders(getbool("scan_symlink_folders"))
+    config.set_stream(getbool("stream"))
+    config.set_unordered_output(getbool("unordered_output"))
+    config.set_timings(getuint("timings"))
 
     for exclusion in getstringlist("exclusions"):
       config.add_exclusion(exclusion)
@@ -199,6 +227,12 @@ class Config:
 
     config.set_make_paths_absolute(getbool("make_paths_absolute"))
 
+    cache_dir = parser.get(CONFIG_SECTION, "cache_dir").strip()
+    config.set_cache_dir(cache_dir if len(cache_dir) > 0 else None)
+
+    git_base = parser.get(CONFIG_SECTION, "git_base").strip()
+    config.set_git_base(git_base if len(git_base) > 0 else None)
+
     for backport in getstringlist("backports"):
       if not config.add_backport(backport):
         print("Unknown backport: {}".format(backport))
@@ -453,3 +487,46 @@ the `exact` argument is supplied for exactness."""
 
   def set_scan_symlink_folders(self, scan):
     self.__scan_symlink_folders = scan
+
+  def cache_dir(self):
+    return self.__cache_dir
+
+  def set_cache_dir(self, folder):
+    """Sets folder of persistent results cache, or disables it if None."""
+    self.__cache_dir = folder
+
+  def stream(self):
+    return self.__stream
+
+  def set_stream(self, stream):
+    """Sets whether detected paths are analyzed while detection is still ongoing."""
+    self.__stream = stream
+
+  def unordered_output(self):
+    return self.__unordered_output
+
+  def set_unordered_output(self, unordered):
+    """Sets whether results are output as soon as they are ready instead of in path order."""
+    self.__unordered_output = unordered
+
+  def timings(self):
+    return self.__timings
+
+  def set_timings(self, slowest):
+    """Sets amount of slowest files to report timings of, or disables timings if zero."""
+    self.__timings = slowest
+
+  def git_base(self):
+    return self.__git_base
+
+  def set_git_base(self, ref):
+    """Sets git revision to only analyze files changed relative to, or disables it if None."""
+    self.__git_base = ref
+
+  def record_fingerprints(self):
+    return self.__record_fingerprints
+
+  def set_record_fingerprints(self, record):
+    """Sets whether results carry entity fingerprints of files, see `EntityFingerprint`, which only
+some modes need. It isn't an option of config files since those modes enable it."""
+    self.__record_fingerprints = record
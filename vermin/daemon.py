@@ -0,0 +1,156 @@
+import io
+import os
+import sys
+import json
+import socket
+import multiprocessing as mp
+from traceback import format_exc
+
+from .printing import nprint
+from .processor import Processor
+
+# Seconds to wait for a connected client to send its request before giving up on it, such that a
+# stuck client cannot block other clients.
+REQUEST_TIMEOUT = 10
+
+# Options that would make a request serve or watch forever instead of analyzing once.
+UNSUPPORTED_OPTIONS = ("--daemon", "--watch")
+
+class Daemon:
+  """Serves analysis requests over a Unix socket, one at a time, while keeping worker processes and
+rule tables warm between requests. A request is a line of JSON with the working folder and command
+line arguments of the client, like `{"cwd": "/src", "args": ["-t=3.6", "pkg"]}`, and the response is
+a line of JSON with the exit code and output, like `{"code": 0, "output": "..."}`. The request
+`{"shutdown": true}` stops the daemon. See `vermin_client.py` for the thin client."""
+
+  def __init__(self, path, config):
+    self.__path = path
+    self.__config = config
+
+  def path(self):
+    return self.__path
+
+  def serve(self, run):
+    """Serves requests until shut down by invoking `run(args, processor)`, like `main()`, with the
+arguments of each request and a processor sharing the warm pool. Returns the exit code."""
+    config = self.__config
+    if getattr(socket, "AF_UNIX", None) is None:  # pragma: no cover
+      nprint("Daemon mode requires Unix sockets which aren't supported on this platform!", config)
+      return 1
+
+    if os.path.exists(self.__path):
+      if Daemon.is_listening(self.__path):
+        nprint("Daemon already listening on: {}".format(self.__path), config)
+        return 1
+      os.remove(self.__path)  # Stale socket of a daemon that didn't shut down cleanly.
+
+    processes = config.processes()
+    # pylint: disable=consider-using-with
+    pool = mp.Pool(processes=processes) if processes > 1 else None
+    processor = Processor(pool)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+      server.bind(self.__path)
+      server.listen(16)
+      nprint("Serving on {} using {} processes..".format(self.__path, processes), config)
+      serving = True
+      while serving:
+        (conn, _) = server.accept()
+        try:
+          serving = self.__handle(conn, run, processor)
+        except socket.error as ex:  # pragma: no cover
+          nprint("Request failed: {}".format(ex), config)
+        finally:
+          conn.close()
+    except KeyboardInterrupt:  # pragma: no cover
+      pass
+    finally:
+      server.close()
+      try:
+        os.remove(self.__path)
+      except OSError:  # pragma: no cover
+        pass
+      if pool:
+        pool.close()
+        pool.join()
+    return 0
+
+  @staticmethod
+  def is_listening(path):
+    """Returns whether a daemon is listening on the Unix socket at path."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+      client.connect(path)
+      return True
+    except socket.error:
+      return False
+    finally:
+      client.close()
+
+  @staticmethod
+  def read_line(conn):
+    """Reads bytes from connection until a newline or the end."""
+    chunks = []
+    while True:
+      chunk = conn.recv(65536)
+      if len(chunk) == 0:
+        break
+      chunks.append(chunk)
+      if b"\n" in chunk:
+        break
+    return b"".join(chunks)
+
+  def __handle(self, conn, run, processor):
+    """Handles request of connection and returns whether to keep serving."""
+    conn.settimeout(REQUEST_TIMEOUT)
+    data = Daemon.read_line(conn)
+    if len(data) == 0:
+      return True  # Connected without a request, like `is_listening()` does.
+    try:
+      request = json.loads(data.decode("utf-8"))
+      (args, cwd) = (request.get("args", []), request.get("cwd", os.getcwd()))
+      shutdown = request.get("shutdown", False)
+    except (ValueError, AttributeError):
+      Daemon.respond(conn, 1, "Invalid request!\n")
+      return True
+
+    if shutdown:
+      nprint("Shutting down..", self.__config)
+      Daemon.respond(conn, 0, "")
+      return False
+
+    unsupported = [arg for arg in args if arg in UNSUPPORTED_OPTIONS]
+    if len(unsupported) > 0:
+      Daemon.respond(conn, 1, "Unsupported in requests: {}\n".format(", ".join(unsupported)))
+      return True
+
+    (code, output) = Daemon.execute(run, args, cwd, processor)
+    Daemon.respond(conn, code, output)
+    return True
+
+  @staticmethod
+  def respond(conn, code, output):
+    conn.sendall((json.dumps({"code": code, "output": output}) + "\n").encode("utf-8"))
+
+  @staticmethod
+  def execute(run, args, cwd, processor):
+    """Invokes `run(args, processor)` in working folder `cwd` and returns tuple of its exit code and
+everything it printed."""
+    prev_cwd = os.getcwd()
+    stdout = sys.stdout
+    sys.stdout = io.StringIO()
+    code = 0
+    try:
+      os.chdir(cwd)
+      run(args, processor)
+    except SystemExit as ex:
+      if ex.code is not None:
+        code = ex.code if isinstance(ex.code, int) else 1
+    except Exception:  # pragma: no cover
+      print(format_exc())
+      code = 1
+    finally:
+      output = sys.stdout.getvalue()
+      sys.stdout = stdout
+      os.chdir(prev_cwd)
+    return (code, output)
@@ -1,8 +1,15 @@
 from stat import S_ISDIR, S_ISREG, S_ISLNK
 from os import listdir, stat, lstat
 from os.path import abspath, join, splitext
+from collections import deque
+from queue import Queue
 from multiprocessing import Pool, cpu_count
 
+try:
+  from os import scandir  # novm
+except ImportError:  # pragma: no cover
+  scandir = None
+
 from .parser import Parser
 from .source_visitor import SourceVisitor
 from .config import Config
@@ -498,40 +505,138 @@ def detect_paths_incremental(args):
       continue
   return (accepted, further_args)
 
+# Scans the entries of a single folder. Directory entries of `scandir()` already know their types so
+# only symlinks and accepted files are stat'ed. Returns tuples of accepted path, size in bytes and
+# modification time, and a list of arguments tuples of sub-folders to scan.
+def scan_folder(args):
+  (folder, depth, hidden, ignore_chars, scan_symlink_folders, config) = args
+  assert config is not None
+  accepted = []
+  further_args = []
+  try:
+    if scandir is None:  # pragma: no cover
+      entries = [(name, None) for name in listdir(folder)]
+    else:
+      entries = [(entry.name, entry) for entry in scandir(folder)]
+  except OSError as ex:
+    nprint("Ignoring {}: {}".format(folder, ex), config)
+    return (accepted, further_args)
+
+  for (name, entry) in entries:
+    if not hidden and name[0] == ".":
+      continue
+    path = join(folder, name)
+    try:
+      if any(ic in path for ic in ignore_chars) or config.is_excluded_by_regex(path):
+        continue
+
+      st = None
+      if entry is None or entry.is_symlink():
+        st = stat_path(path, scan_symlink_folders)
+        if st is None:
+          continue
+        (is_dir, is_file) = (S_ISDIR(st.st_mode), S_ISREG(st.st_mode))
+      else:
+        is_dir = entry.is_dir(follow_symlinks=False)
+        is_file = not is_dir and entry.is_file(follow_symlinks=False)
+
+      if is_dir:
+        further_args.append((path, depth + 1, hidden, ignore_chars, scan_symlink_folders, config))
+      elif is_file and probably_python_file(path):
+        if st is None:
+          st = entry.stat(follow_symlinks=False)
+        accepted.append((path, st.st_size, st.st_mtime))
+    except OSError as ex:
+      nprint("Ignoring {}: {}".format(path, ex), config)
+  return (accepted, further_args)
+
+def scan_folder_task(args):
+  """Pool task of `scan_folder()` that yields any exception as the result instead of raising it,
+such that the scheduler is always notified of the task being done."""
+  try:
+    return scan_folder(args)
+  except Exception as ex:  # pragma: no cover
+    return ex
+
+def walk_paths(paths, hidden=False, ignore_chars=None, scan_symlink_folders=False, config=None,
+               pool=None):
+  """Yields tuples of path, size in bytes and modification time of each detected path as soon as it
+is found. Folders are scanned concurrently via `pool` if specified, otherwise serially. See
+`detect_paths()` for details on which paths are detected."""
+  assert config is not None
+  if isinstance(paths, str):
+    paths = [paths]
+  ignore_chars = ignore_chars or []
+
+  # Top-level paths, or input paths, are always scanned and accepted if they are files.
+  folders = []
+  for path in paths:
+    if any(ic in path for ic in ignore_chars) or config.is_excluded_by_regex(path):
+      continue  # pragma: no cover
+    if not hidden and path != "." and path[0] == ".":
+      continue
+    if config.make_paths_absolute():
+      path = abspath(path)
+    st = stat_path(path, True)
+    if st is None:
+      continue
+    if S_ISDIR(st.st_mode):
+      folders.append((path, 0, hidden, ignore_chars, scan_symlink_folders, config))
+    elif S_ISREG(st.st_mode):
+      yield (path, st.st_size, st.st_mtime)
+
+  if pool is None or len(folders) == 0:
+    todo = deque(folders)
+    while todo:
+      (accepted, further_args) = scan_folder(todo.popleft())
+      for entry in accepted:
+        yield entry
+      todo.extend(further_args)
+    return
+
+  # Each folder is a task, and sub-folders are scheduled as soon as their parent folder has been
+  # scanned instead of level by level.
+  done = Queue()
+  pending = 0
+  for args in folders:
+    pool.apply_async(scan_folder_task, (args,), callback=done.put)
+    pending += 1
+  while pending > 0:
+    res = done.get()
+    pending -= 1
+    if isinstance(res, Exception):
+      raise res  # pragma: no cover
+    (accepted, further_args) = res
+    for args in further_args:
+      pool.apply_async(scan_folder_task, (args,), callback=done.put)
+      pending += 1
+    for entry in accepted:
+      yield entry
+
 # Some detected paths might not be python code since not all files use extensions like ".py" and
 # ".pyw", for instance. But try directly specified files on CLI, on depth 0, in any case (non-python
 # files will be ignored when trying to parse them). Paths containing chars in `ignore_chars` will be
-# ignored, as will any file excluded by regex from the config.
+# ignored, as will any file excluded by regex from the config. If `sizes` is a dictionary, it will
+# be populated with the size in bytes of each accepted path. If `pool` is specified, it is used
+# instead of creating a pool of `processes` worker processes.
 def detect_paths(paths, hidden=False, processes=cpu_count(), ignore_chars=None,
-                 scan_symlink_folders=False, config=None):
+                 scan_symlink_folders=False, config=None, sizes=None, pool=None):
   assert config is not None
-  if isinstance(paths, str):
-    paths = [paths]
   accept_paths = []
-  depth = 0
-  ignore_chars = ignore_chars or []
-  args = [(paths, depth, hidden, ignore_chars, scan_symlink_folders, config)]
-
+  shared_pool = pool
   try:
     # pylint: disable=consider-using-with
-    pool = Pool(processes=processes) if processes > 1 else None
+    if pool is None and processes > 1:
+      pool = Pool(processes=processes)
 
     # Automatically don't use concurrency when only one process is specified to be used.
-    def act(args):
-      if processes == 1:
-        return [detect_paths_incremental(arg) for arg in args]  # pragma: no cover
-      return pool.imap(detect_paths_incremental, args)
-
-    while args:
-      new_args = []
-      for (acc, further_args) in act(args):
-        if acc:
-          accept_paths += acc
-        if further_args:
-          new_args += further_args
-      args = new_args
+    for (path, size, _) in walk_paths(paths, hidden, ignore_chars, scan_symlink_folders, config,
+                                      pool):
+      accept_paths.append(path)
+      if sizes is not None:
+        sizes[path] = size
 
-    if pool:
+    if pool and pool is not shared_pool:
       pool.close()
   except RuntimeError:
     nprint("""RuntimeError: If running `detect_paths()` outside of `if __name__ == \"__main__\":`
@@ -549,6 +654,9 @@ occur in errors instead of the default '<unknown>'.
   parser = Parser(source, path)
   (node, mins, novermin) = parser.detect(config)
   if node is None:
+    text = parser.output_text()
+    if len(text) > 0:
+      nprint(text.rstrip("\n"), config)
     return mins
 
   visitor = SourceVisitor(config=config, path=path, source=source)
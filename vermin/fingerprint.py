@@ -0,0 +1,175 @@
+import json
+
+from .constants import VERSION
+from .rules import rule_tables
+from .source_visitor import LANGUAGE_FEATURES, ENTITY_KINDS, entity_versions
+from .backports import Backports
+from .utility import combine_versions, violates_targets
+
+class EntityFingerprint:
+  """Entities of a file recorded while visiting it, like modules, members, kwargs, directives, and
+language features used, before they are resolved against rules. Fingerprints are independent of
+backports, exclusions, and targets such that they can be evaluated under different ones without
+parsing and visiting the file again. Other options affecting visitation, like features and
+evaluating annotations, are those used when recording."""
+
+  def __init__(self, path):
+    self.path = path
+    self.features = []              # Flags of language features used, see `LANGUAGE_FEATURES`.
+    self.entities = dict((kind, []) for kind in ENTITY_KINDS)  # Kind -> entities.
+    self.maybe_annotations = False  # Potential generic/literal annotations used.
+    self.mins = None                # Minimum versions of files that couldn't be visited.
+
+    # Module -> root module of the attribute chains that modules are only known from, like
+    # "importlib.metadata" of "importlib", which are excluded along with their root module.
+    self.module_roots = {}
+
+  @staticmethod
+  def record(visitor, path):
+    """Records fingerprint of file at path from a visitor that has toured it. Entities excluded by
+the config of the visitor are recorded too."""
+    fp = EntityFingerprint(path)
+    fp.features = visitor.used_features()
+    for kind in ENTITY_KINDS:
+      fp.entities[kind] = list(getattr(visitor, kind)())
+    for (kind, entity) in visitor.excluded():
+      entities = fp.features if kind == "features" else fp.entities[kind]
+      entities.append(entity)
+    fp.features = unique(fp.features)
+    for kind in ENTITY_KINDS:
+      fp.entities[kind] = unique(fp.entities[kind])
+    fp.maybe_annotations = visitor.maybe_annotations()
+    fp.module_roots = dict(visitor.module_roots())
+    return fp
+
+  def is_excluded(self, kind, entity, config):
+    """Returns whether entity of kind is excluded by config, like when visiting."""
+    if kind == "modules" and entity in self.module_roots and \
+       config.is_excluded(self.module_roots[entity]):
+      return True
+    if kind == "features":
+      return entity == "longv2" and config.is_excluded("long")
+    if kind == "kwargs":
+      return config.is_excluded_kwarg(entity[0], entity[1])
+    if kind == "codecs_error_handlers":
+      return config.is_excluded_codecs_error_handler(entity)
+    if kind == "codecs_encodings":
+      return config.is_excluded_codecs_encoding(entity)
+    if kind in ("modules", "members", "user_function_decorators"):
+      return config.is_excluded(entity)
+    return False
+
+  def included_entities(self, config):
+    """Returns dictionary of kind -> entities that aren't excluded by config."""
+    return dict((kind, [entity for entity in entities
+                        if not self.is_excluded(kind, entity, config)])
+                for (kind, entities) in self.entities.items())
+
+  def minimum_versions(self, config):
+    """Evaluates minimum versions under the backports and exclusions of config, which are the same
+as those of visiting the file with that config. Raises `InvalidVersionException` if versions are
+incompatible."""
+    if self.mins is not None:
+      return list(self.mins)
+
+    mins = [(0, 0), (0, 0)]
+    if "printv2" in self.features:
+      mins[0] = (2, 0)  # pragma: no cover
+
+    info_versions = {}
+    for (versions, info) in self.requirements(config):
+      if info is not None:
+        info_versions.setdefault(versions, []).append(info)
+      mins = combine_versions(mins, versions, config, info_versions)
+    return mins
+
+  def requirements(self, config):
+    """Yields tuples of minimum versions and description, which can be None, of the language
+features and entities not excluded by config that have rules, in the order they are combined."""
+    features = set(feature for feature in self.features
+                   if not self.is_excluded("features", feature, config))
+    if "printv3" in features:
+      yield (((2, 0), (3, 0)), None)
+    for (flag, versions, info, _) in LANGUAGE_FEATURES:
+      if flag in features:
+        yield (versions, info)
+    for (versions, info, _) in entity_versions(self.included_entities(config), rule_tables(config)):
+      yield (versions, info)
+
+  def findings(self, config, targets):
+    """Returns list of tuples of minimum versions and description of the language features and
+entities that violate targets, see `utility.violates_targets()`."""
+    if self.mins is not None:
+      return []
+    return [(versions, info) for (versions, info) in self.requirements(config)
+            if info is not None and violates_targets(versions, targets)]
+
+  def backports(self, config):
+    """Returns set of potential backport modules used that aren't excluded by config."""
+    return set(mod for mod in self.entities["modules"]
+               if Backports.is_backport(mod) and not self.is_excluded("modules", mod, config))
+
+  def copy(self, path):
+    """Returns copy of fingerprint of another file at path with identical contents."""
+    value = self.to_dict()
+    value["path"] = path
+    return EntityFingerprint.from_dict(value)
+
+  def to_dict(self):
+    return {
+      "path": self.path,
+      "features": self.features,
+      "entities": self.entities,
+      "maybe_annotations": self.maybe_annotations,
+      "mins": self.mins,
+      "module_roots": self.module_roots,
+    }
+
+  @staticmethod
+  def from_dict(value):
+    fp = EntityFingerprint(value["path"])
+    fp.features = list(value["features"])
+    for kind in ENTITY_KINDS:
+      fp.entities[kind] = list(value["entities"].get(kind, []))
+    fp.entities["kwargs"] = [tuple(fn_kw) for fn_kw in fp.entities["kwargs"]]
+    fp.maybe_annotations = value["maybe_annotations"]
+    if value["mins"] is not None:
+      fp.mins = [tuple(v) if v is not None else None for v in value["mins"]]
+    fp.module_roots = dict(value["module_roots"])
+    return fp
+
+  def __eq__(self, other):
+    return isinstance(other, EntityFingerprint) and self.to_dict() == other.to_dict()
+
+  def __ne__(self, other):
+    return not self == other
+
+  def __repr__(self):
+    return ("{}({}, features={}, entities={}, maybe_annotations={}, mins={}, "
+            "module_roots={})").format(
+      self.__class__.__name__, self.path, self.features, self.entities, self.maybe_annotations,
+      self.mins, self.module_roots)
+
+def unique(values):
+  """Returns list of values without duplicates in the order they first occur."""
+  seen = set()
+  res = []
+  for value in values:
+    if value not in seen:
+      seen.add(value)
+      res.append(value)
+  return res
+
+def save_fingerprints(path, fingerprints):
+  """Saves fingerprints to JSON file at path."""
+  with open(path, mode="w", encoding="utf-8") as fp:
+    json.dump({"version": VERSION, "fingerprints": [f.to_dict() for f in fingerprints]}, fp)
+
+def load_fingerprints(path):
+  """Loads list of fingerprints from JSON file at path. Raises `ValueError` if it isn't valid."""
+  with open(path, mode="r", encoding="utf-8") as fp:
+    data = json.load(fp)
+  try:
+    return [EntityFingerprint.from_dict(value) for value in data["fingerprints"]]
+  except (KeyError, TypeError, AttributeError) as ex:
+    raise ValueError("Invalid fingerprints: {}".format(ex)) from ex
@@ -1,6 +1,7 @@
 from .format import Format
 from .default_format import DefaultFormat
 from .parsable_format import ParsableFormat
+from .ndjson_format import NdjsonFormat
 from ..utility import format_title_descs
 
 FORMATS = (
@@ -11,6 +12,15 @@ FORMATS = (
     "minimum py2 and py3 versions. Minimum verbosity level is set to",
     "3 but can be increased. Tips, hints, incompatible versions, and",
     "`--versions` are disabled. File paths containing ':' are ignored."
+  ]),
+  ("ndjson", [
+    "Each line is a JSON object with 'type' being 'finding', 'file',",
+    "or 'summary'. Findings have 'path', 'line', 'column', 'versions',",
+    "and 'message', files have 'path' and 'versions', and the summary",
+    "has the 'versions' of all files. Versions are [major, minor], or",
+    "null if incompatible, for py2 and py3. Minimum verbosity level is",
+    "set to 3 but can be increased. Tips, hints, incompatible versions,",
+    "and `--versions` are disabled."
   ])
 )
 
@@ -22,6 +32,8 @@ def from_name(name):
     return DefaultFormat()
   if name == "parsable":
     return ParsableFormat()
+  if name == "ndjson":
+    return NdjsonFormat()
   return None
 
 def help_str(indent=0):
@@ -30,6 +42,7 @@ def help_str(indent=0):
 __all__ = [
   "DefaultFormat",
   "Format",
+  "NdjsonFormat",
   "ParsableFormat",
   "from_name",
   "help_str",
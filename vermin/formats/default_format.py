@@ -1,5 +1,5 @@
 from .format import Format
-from ..utility import version_strings, sort_line_column
+from ..utility import version_strings
 from ..printing import vprint
 
 class DefaultFormat(Format):
@@ -39,9 +39,14 @@ class DefaultFormat(Format):
            self.config())
 
   @Format.require_config
-  def sort_output_lines(self, lines):
-    if self.config().verbose() > 2 and not self.config().print_visits():
-      lines.sort(key=sort_line_column)  # pragma: no cover
-    else:
-      lines.sort()
-    return lines
+  def output_lines(self, path, findings):
+    config = self.config()
+    if config.verbose() > 2 and not config.print_visits():
+      return super().output_lines(path, findings)  # pragma: no cover
+
+    # Without line/column numbers, lines are sorted by text. Findings of different lines can then
+    # yield the same text, so dups are thrown away again unless dumping AST node visits.
+    lines = [self.format_finding(path, finding) for finding in findings]
+    if not config.print_visits():
+      lines = set(lines)
+    return sorted(lines)
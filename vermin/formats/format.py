@@ -1,5 +1,8 @@
 from abc import ABCMeta, abstractmethod
 
+from ..utility import sort_findings_key
+from ..printing import nprint
+
 class Format(metaclass=ABCMeta):
   """Format encapsulates a format for presenting minimum versions and related information during
 processing."""
@@ -24,6 +27,20 @@ processing."""
       return funcobj(self, *args, **kwargs)
     return _require_config
 
+  def machine_readable(self):
+    """Whether output is meant for machines, in which case only results are output and not progress,
+tips, hints, and the like."""
+    return False
+
+  def replace_path(self, text, old, new):
+    """Replaces path `old` of output lines of text, which start with it like those of the parsable
+format, by path `new`."""
+    if old not in text:
+      return text
+    prefix = old + ":"
+    return "".join(new + line[len(old):] if line.startswith(prefix) else line
+                   for line in text.splitlines(True))
+
   @abstractmethod
   def skip_output_line(self):
     """Whether or not to skip outputting a line."""
@@ -38,6 +55,22 @@ processing."""
   def output_result(self, proc_res):
     """Output processed result."""
 
-  @abstractmethod
-  def sort_output_lines(self, lines):
-    """Sort and return output lines."""
+  def output_report(self, lines, records):
+    """Output report, like that of timings, as lines of text, or as records, dictionaries with a
+"type", for formats of records."""
+    for line in lines:
+      nprint(line, self.config())
+
+  def format_finding(self, path, finding):
+    """Yield formatted output line of finding, see `Finding`, of file at path. Raw lines are yielded
+as is."""
+    if isinstance(finding, str):
+      return finding
+    return self.format_output_line(finding.msg, path, finding.line, finding.col, finding.versions,
+                                   finding.plural)
+
+  def output_lines(self, path, findings):
+    """Returns formatted output lines of findings of file at path sorted by line, column, and
+message."""
+    return [self.format_finding(path, finding)
+            for finding in sorted(findings, key=sort_findings_key)]
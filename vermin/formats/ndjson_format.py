@@ -0,0 +1,73 @@
+import sys
+import json
+
+from .format import Format
+
+class NdjsonFormat(Format):
+  """Newline-delimited JSON format where each line is a self-contained record of a finding, the
+results of a file, the summary, or a report like that of timings, such that output can be consumed
+incrementally as results arrive without parsing text."""
+
+  def __init__(self):
+    super().__init__("ndjson")
+
+  def set_config(self, config):
+    config.set_verbose(max(3, config.verbose()))
+    config.set_ignore_incomp(True)
+    config.set_show_tips(False)
+    super().set_config(config)
+
+  def machine_readable(self):
+    return True
+
+  def replace_path(self, text, old, new):
+    lines = []
+    for line in text.splitlines(True):
+      # Lines that aren't records are kept as they are.
+      try:
+        record = json.loads(line)
+      except ValueError:
+        lines.append(line)
+        continue
+      if isinstance(record, dict) and record.get("path") == old:
+        record["path"] = new
+        line = NdjsonFormat.dumps(record) + "\n"
+      lines.append(line)
+    return "".join(lines)
+
+  def skip_output_line(self):
+    """Never skip."""
+    return False
+
+  def format_output_line(self, msg, path=None, line=None, col=None, versions=None, plural=None):
+    if msg is not None:
+      record = {"type": "finding", "path": path, "line": line, "column": col, "versions": versions,
+                "message": msg}
+    elif path is not None:
+      record = {"type": "file", "path": path, "versions": versions}
+    else:
+      record = {"type": "summary", "versions": versions}
+    return NdjsonFormat.dumps(record)
+
+  def format_finding(self, path, finding):
+    # Raw lines, like dumps of AST node visits, are records too.
+    if isinstance(finding, str):
+      return NdjsonFormat.dumps({"type": "visit", "path": path, "text": finding})
+    return super().format_finding(path, finding)
+
+  def output_result(self, proc_res):
+    # Output all findings of the file and then its results, flushed such that consumers receive
+    # records as soon as each file is done.
+    sys.stdout.write(proc_res.text)
+    record = self.format_output_line(msg=None, path=proc_res.path, versions=proc_res.mins)
+    sys.stdout.write("{}\n".format(record))
+    sys.stdout.flush()
+
+  def output_report(self, lines, records):
+    for record in records:
+      sys.stdout.write("{}\n".format(NdjsonFormat.dumps(record)))
+
+  @staticmethod
+  def dumps(record):
+    # Keys are sorted for deterministic output since dictionaries aren't ordered in all versions.
+    return json.dumps(record, sort_keys=True)
@@ -1,7 +1,7 @@
 import sys
 
 from .format import Format
-from ..utility import version_strings, sort_line_column_parsable
+from ..utility import version_strings
 
 class ParsableFormat(Format):
   def __init__(self):
@@ -13,6 +13,9 @@ class ParsableFormat(Format):
     config.set_show_tips(False)
     super().set_config(config)
 
+  def machine_readable(self):
+    return True
+
   def skip_output_line(self):
     """Never skip."""
     return False
@@ -34,6 +37,7 @@ class ParsableFormat(Format):
     summary = self.format_output_line(msg=None, path=proc_res.path, versions=proc_res.mins)
     sys.stdout.write("{}\n".format(summary))
 
-  def sort_output_lines(self, lines):
-    lines.sort(key=sort_line_column_parsable)
-    return lines
+  def output_report(self, lines, records):
+    # Reports go to stderr such that output only consists of results.
+    for line in lines:
+      sys.stderr.write("{}\n".format(line))
@@ -0,0 +1,130 @@
+import sys
+from os.path import abspath, dirname, join, normpath, realpath, sep
+from stat import S_ISREG
+from subprocess import Popen, PIPE
+
+from .detection import probably_python_file, stat_path
+
+class GitException(Exception):
+  pass
+
+def decode_path(path):
+  return path.decode(sys.getfilesystemencoding() or "utf-8", "replace")
+
+def run_git(args, cwd):
+  """Runs git command with arguments in folder `cwd` and returns its standard output as bytes.
+Raises `GitException` if git cannot be run or the command fails."""
+  try:
+    # pylint: disable=consider-using-with
+    proc = Popen(["git"] + args, cwd=cwd, stdout=PIPE, stderr=PIPE)
+    (out, err) = proc.communicate()
+  except OSError as ex:
+    raise GitException("Could not run git: {}".format(ex))
+  if proc.returncode != 0:
+    msg = err.decode("utf-8", "replace").strip()
+    raise GitException(msg or "git {} failed with code {}".format(args[0], proc.returncode))
+  return out
+
+def split_paths(out):
+  """Splits NUL-terminated output of git into paths."""
+  return [decode_path(path) for path in out.split(b"\0") if len(path) > 0]
+
+def repository_root(folder):
+  """Returns absolute path of the root of the git repository that folder is in."""
+  out = run_git(["rev-parse", "--show-toplevel"], folder)
+  return normpath(decode_path(out.rstrip(b"\r\n")))
+
+def tracked_blobs(root, base):
+  """Returns dictionary of path, relative to repository root, -> tuple of git blob id and size in
+bytes of each regular file in the tree of revision `base`."""
+  blobs = {}
+  out = run_git(["ls-tree", "-r", "-l", "-z", "--full-tree", base], root)
+  for entry in out.split(b"\0"):
+    if len(entry) == 0:
+      continue
+    (info, path) = entry.split(b"\t", 1)
+    (mode, kind, blob, size) = info.split()
+    # Symlinks and submodules are skipped.
+    if kind == b"blob" and mode in (b"100644", b"100755"):
+      blobs[decode_path(path)] = (blob.decode("ascii"), int(size))
+  return blobs
+
+def touched_paths(root, base):
+  """Returns set of paths, relative to repository root, of files changed, added, or deleted in the
+working tree relative to revision `base`, including untracked files that aren't ignored."""
+  touched = set(split_paths(run_git(["diff", "--name-only", "-z", "--no-renames", base, "--"],
+                                    root)))
+  touched.update(split_paths(run_git(["ls-files", "-z", "--others", "--exclude-standard"], root)))
+  return touched
+
+def detect_git_paths(paths, base, hidden=False, ignore_chars=None, config=None, sizes=None):
+  """Detects python files in paths like `detect_paths()` but enumerates files using the local git
+repositories that the paths are in instead of walking folders. Files that are tracked but ignored by
+git are not detected. Returns tuple of detected paths and dictionary of path -> git blob id of the
+paths that are untouched relative to revision `base`, whose contents are therefore known without
+reading them. If `sizes` is a dictionary, it will be populated with the size in bytes of each
+detected path. Raises `GitException` if a path isn't in a git repository or `base` isn't a valid
+revision."""
+  assert config is not None
+  if isinstance(paths, str):
+    paths = [paths]
+  ignore_chars = ignore_chars or []
+
+  repositories = {}  # Root -> tuple of tracked blobs and touched paths.
+  accept_paths = []
+  untouched = {}
+
+  def accept(path, blob, size):
+    accept_paths.append(path)
+    if blob is not None:
+      untouched[path] = blob
+    if sizes is not None:
+      sizes[path] = size
+
+  for path in paths:
+    if any(ic in path for ic in ignore_chars) or config.is_excluded_by_regex(path):
+      continue  # pragma: no cover
+    if not hidden and path != "." and path[0] == ".":
+      continue
+    if config.make_paths_absolute():
+      path = abspath(path)
+    st = stat_path(path, True)
+    if st is None:
+      continue
+
+    # Git yields paths relative to the real path of the repository root.
+    top = realpath(path)
+    is_file = S_ISREG(st.st_mode)
+    root = repository_root(dirname(top) if is_file else top)
+    if root not in repositories:
+      repositories[root] = (tracked_blobs(root, base), touched_paths(root, base))
+    (blobs, touched) = repositories[root]
+
+    # Top-level files are always accepted.
+    if is_file:
+      rel = top[len(root) + 1:].replace(sep, "/")
+      if rel in touched or rel not in blobs:
+        accept(path, None, st.st_size)
+      else:
+        accept(path, *blobs[rel])
+      continue
+
+    prefix = "" if top == root else top[len(root) + 1:].replace(sep, "/") + "/"
+    for rel in sorted(set(blobs) | touched):
+      if not rel.startswith(prefix):
+        continue
+      sub = rel[len(prefix):]
+      if not hidden and any(name[0] == "." for name in sub.split("/")):
+        continue
+      file_path = join(path, normpath(sub))
+      if any(ic in file_path for ic in ignore_chars) or config.is_excluded_by_regex(file_path):
+        continue
+      if rel in touched:
+        # Deleted files are touched too, so only existing files are accepted.
+        st = stat_path(file_path)
+        if st is None or not S_ISREG(st.st_mode) or not probably_python_file(file_path):
+          continue
+        accept(file_path, None, st.st_size)
+      elif probably_python_file(file_path):
+        accept(file_path, *blobs[rel])
+  return (accept_paths, untouched)
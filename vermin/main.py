@@ -5,15 +5,23 @@ from copy import deepcopy
 from .config import Config
 from .printing import nprint, vprint
 from .detection import detect_paths
+from .git import detect_git_paths, GitException
 from .processor import Processor
 from .arguments import Arguments
-from .utility import version_strings, dotted_name
+from .utility import version_strings, dotted_name, targets_met
 from .backports import Backports
+from .daemon import Daemon
+from .watch import Watcher
+from .fingerprint import save_fingerprints, load_fingerprints
+from .shard import shard_paths, save_partial, load_partials
 
-def main():
+def main(argv=None, processor=None):
+  """Runs Vermin with command line arguments `argv`, or those of the process if None, and exits
+with the resulting code. If `processor` is specified, it is used for processing instead of creating
+a new one."""
   config = Config()
 
-  args = Arguments(sys.argv[1:]).parse(config)
+  args = Arguments(sys.argv[1:] if argv is None else argv).parse(config)
   if "usage" in args:
     Arguments.print_usage(args["full"])
     sys.exit(args["code"])
@@ -21,52 +29,218 @@ def main():
   if args["code"] != 0:
     sys.exit(args["code"])  # pragma: no cover
 
+  if args["daemon"] is not None:
+    sys.exit(Daemon(args["daemon"], config).serve(main))
+
   paths = args["paths"]
-  parsable = config.format().name() == "parsable"
+  machine_readable = config.format().machine_readable()
 
   # Detect paths, remove duplicates, and sort for deterministic results.
-  if not parsable:
+  if not machine_readable:
     vprint("Detecting python files..", config)
-  if config.make_paths_absolute():
+  # Workers of a shared pool, like that of the daemon, don't have the working folder of this
+  # invocation so paths are resolved before being sent to them.
+  shared_pool = processor is not None and processor.pool() is not None
+  if config.make_paths_absolute() or shared_pool:
     paths = [abspath(p) for p in paths]
+  if shared_pool and config.cache_dir() is not None:
+    config.set_cache_dir(abspath(config.cache_dir()))
 
   # Parsable format ignores paths with ":" in particular because it interferes with the format that
   # uses ":" a lot.
   ignore_chars = []
-  if parsable and not sys.platform.startswith("win32"):
+  if config.format().name() == "parsable" and not sys.platform.startswith("win32"):
     ignore_chars = [":", "\n"]
 
-  paths = list(set(detect_paths(paths, hidden=config.analyze_hidden(),
-                                processes=config.processes(), ignore_chars=ignore_chars,
-                                scan_symlink_folders=config.scan_symlink_folders(), config=config)))
-  paths.sort()
+  # In violations mode it is allowed to use quiet mode to show literally only discrepancies and
+  # nothing else. But the processor must use the original verbosity level and not be quiet! The
+  # config is only copied in that case since it is otherwise used as is.
+  local_config = config
+  if config.only_show_violations() and config.quiet():  # pragma: no cover
+    local_config = deepcopy(config)
+    local_config.set_verbose(config.verbose())
+    local_config.set_quiet(False)
 
-  amount = len(paths)
-  if amount == 0:
-    nprint("No files specified to analyze!", config)
-    sys.exit(1)
+  if args["watch"]:
+    def report_watched(aggregate):
+      (mins, incomp, unique_versions, backports, _, maybe_annotations) = aggregate
+      return report(config, args["versions"], mins, incomp, unique_versions, backports,
+                    maybe_annotations)
+    sys.exit(Watcher(paths, local_config, ignore_chars).watch(report_watched))
 
-  msg = "Analyzing"
-  if amount > 1:
-    msg += " {} files".format(amount)
-  if not parsable:
-    vprint("{} using {} processes..".format(msg, config.processes()), config)
+  if args["fingerprints"] is not None:
+    try:
+      fingerprints = load_fingerprints(args["fingerprints"])
+    except (OSError, ValueError) as ex:
+      nprint("Could not load fingerprints: {}".format(ex), config)
+      sys.exit(1)
+    if not machine_readable:
+      vprint("Evaluating {} fingerprints..".format(len(fingerprints)), config)
+    results = list(Processor.fingerprint_results(fingerprints, local_config))
+    sys.exit(conclude(config, args, Processor.aggregate(results, local_config), results))
 
+  if args["merge"]:
+    try:
+      (results, amount) = load_partials(paths)
+    except (OSError, ValueError) as ex:
+      nprint("Could not merge partial results: {}".format(ex), config)
+      sys.exit(1)
+    if amount == 0:
+      nprint("No files specified to analyze!", config)
+      sys.exit(1)
+    if not machine_readable:
+      vprint("Merging results of {} files..".format(amount), config)
+    aggregate = Processor.aggregate(results, local_config)
+    if not save_results(config, args, (1, 1), amount, results):
+      sys.exit(1)
+    sys.exit(conclude(config, args, aggregate, results))
+
+  # Results of all files are only kept when needed after processing, which is also when their
+  # fingerprints are needed.
+  keep_results = args["save_fingerprints"] is not None or args["save_partial"] is not None or \
+    len(args["matrix"]) > 0
+  local_config.set_record_fingerprints(keep_results)
+  results = None
+
+  processor = processor or Processor()
   try:
-    # In violations mode it is allowed to use quiet mode to show literally only discrepancies and
-    # nothing else. But the processor must use the original verbosity level and not be quiet!
-    local_config = deepcopy(config)
-    if local_config.only_show_violations() and local_config.quiet():  # pragma: no cover
-      local_config.set_verbose(config.verbose())
-      local_config.set_quiet(False)
+    # Paths are detected via git when using a git base, which isn't worth streaming. Neither is
+    # keeping results since they are kept in path order, nor sharding since all paths are needed.
+    if config.stream() and config.git_base() is None and not keep_results and \
+       args["shard"] is None:
+      # Paths are analyzed while being detected, which is why the amount isn't known upfront.
+      if not machine_readable:
+        vprint("Analyzing using {} processes..".format(config.processes()), config)
+      aggregate = processor.process_stream(paths, local_config, local_config.processes(),
+                                           ignore_chars)
+      (aggregate, amount) = (aggregate[:-1], aggregate[-1])
+      if amount == 0:
+        nprint("No files specified to analyze!", config)
+        sys.exit(1)
+    else:
+      sizes = {}
+      blobs = None
+      if config.git_base() is not None:
+        if config.cache_dir() is None and not machine_readable:
+          nprint("Note: Untouched files are analyzed too since --git-base takes their results "
+                 "from the results cache, which isn't enabled. See --cache-dir.", config)
+        try:
+          (paths, blobs) = detect_git_paths(paths, config.git_base(),
+                                            hidden=config.analyze_hidden(),
+                                            ignore_chars=ignore_chars, config=config, sizes=sizes)
+        except GitException as ex:
+          nprint("Could not detect files via git: {}".format(ex), config)
+          sys.exit(1)
+      else:
+        pool = processor.pool() if config.processes() > 1 else None
+        paths = detect_paths(paths, hidden=config.analyze_hidden(), processes=config.processes(),
+                             ignore_chars=ignore_chars,
+                             scan_symlink_folders=config.scan_symlink_folders(), config=config,
+                             sizes=sizes, pool=pool)
+      paths = list(set(paths))
+      paths.sort()
+
+      amount = len(paths)
+      if amount == 0:
+        nprint("No files specified to analyze!", config)
+        sys.exit(1)
 
-    processor = Processor()
-    (mins, incomp, unique_versions, backports, used_novermin, maybe_annotations) =\
-      processor.process(paths, local_config, local_config.processes())
+      shard = args["shard"] or (1, 1)
+      if args["shard"] is not None:
+        paths = shard_paths(paths, shard)
+        if not machine_readable:
+          vprint("Shard {}/{} has {} of {} files".format(shard[0], shard[1], len(paths), amount),
+                 config)
+        amount = len(paths)
+
+      msg = "Analyzing"
+      if amount > 1:
+        msg += " {} files".format(amount)
+      if not machine_readable:
+        if blobs is not None:
+          # Only paths being analyzed count, like those of the shard.
+          changed = len([path for path in paths if path not in blobs])
+          vprint("{} files changed or added relative to {}".
+                 format(changed, config.git_base()), config)
+        vprint("{} using {} processes..".format(msg, config.processes()), config)
+
+      if keep_results:
+        results = processor.process_results(paths, local_config, local_config.processes(), sizes,
+                                            blobs)
+        aggregate = Processor.aggregate(results, local_config)
+      else:
+        aggregate = processor.process(paths, local_config, local_config.processes(), sizes, blobs)
+
+      if keep_results and not save_results(config, args, shard, amount, results):
+        sys.exit(1)
   except KeyboardInterrupt:  # pragma: no cover
     nprint("Aborting..", config)
     sys.exit(1)
 
+  sys.exit(conclude(config, args, aggregate, results))
+
+def save_results(config, args, shard, amount, results):
+  """Saves fingerprints and partial results of shard, which detected `amount` files, if requested by
+args. Returns false if saving failed."""
+  if args["save_fingerprints"] is not None:
+    try:
+      save_fingerprints(args["save_fingerprints"],
+                        [res.fingerprint for res in results
+                         if res is not None and res.fingerprint is not None])
+    except OSError as ex:
+      nprint("Could not save fingerprints: {}".format(ex), config)
+      return False
+  if args["save_partial"] is not None:
+    try:
+      save_partial(args["save_partial"], shard, amount, results)
+    except OSError as ex:
+      nprint("Could not save partial results: {}".format(ex), config)
+      return False
+  return True
+
+def conclude(config, args, aggregate, results):
+  """Reports aggregated results, see `Processor.aggregate()`, and the target matrix, if any, using
+results of all files. Returns the exit code."""
+  (mins, incomp, unique_versions, backports, _, maybe_annotations) = aggregate
+  code = report(config, args["versions"], mins, incomp, unique_versions, backports,
+                maybe_annotations)
+  if len(args["matrix"]) > 0:
+    code = max(code, report_matrix(config, args["matrix"], mins, results))
+  return code
+
+def report_matrix(config, matrix, mins, results):
+  """Outputs whether each target set of matrix is met by the aggregated minimum versions and the
+findings of files violating target sets not met, using their fingerprints. Returns the exit code,
+which is 1 if any target set isn't met."""
+  reqs = [ver for ver in mins if ver is not None]
+  names = [version_strings(["{}{}".format(dotted_name(t), "-" if not e else "") for (e, t) in ts])
+           for ts in matrix]
+  width = max(len(name) for name in names)
+  code = 0
+  lines = ["Target matrix:"]
+  records = []
+  for (targets, name) in zip(matrix, names):
+    met = targets_met(targets, reqs)
+    lines.append("  {:{width}}  {}".format(name, "met" if met else "not met", width=width))
+    record = {"type": "matrix", "targets": name, "met": met, "findings": []}
+    records.append(record)
+    if met:
+      continue
+    code = 1
+    for res in results:
+      if res is None or res.fingerprint is None:
+        continue
+      for (versions, info) in res.fingerprint.findings(config, targets):
+        lines.append("    {}: {} requires {}".format(res.path, info, version_strings(versions)))
+        record["findings"].append({"path": res.path, "message": info, "versions": versions})
+  config.format().output_report(lines, records)
+  return code
+
+def report(config, show_versions, mins, incomp, unique_versions, backports, maybe_annotations):
+  """Outputs the aggregated results of processing, see `Processor.process()`, together with tips and
+target violations. Returns the exit code, which is 1 if targets aren't met."""
+  machine_readable = config.format().machine_readable()
+
   if incomp and not config.ignore_incomp():  # pragma: no cover
     nprint("Note: Some files had incompatible versions so the results might not be correct!",
            config)
@@ -81,7 +255,7 @@ def main():
 
   tips = []
 
-  if not parsable and (len(reqs) == 0 and len(incomps) == 0):  # pragma: no cover
+  if not machine_readable and (len(reqs) == 0 and len(incomps) == 0):  # pragma: no cover
     nprint("No known reason found that it will not work with 2+ and 3+.", config)
     nprint("Please report if it does not: https://github.com/netromdk/vermin/issues/", config)
 
@@ -101,10 +275,6 @@ def main():
         format("".join([" --backport {}".format(n) for n in unique_bps]).strip())
       ])
 
-    if not used_novermin and config.parse_comments():
-      tips.append(["Since '# novm' or '# novermin' weren't used, a speedup can be achieved using: "
-                   "--no-parse-comments"])
-
     if len(tips) > 0:
       verbose = config.verbose()
       if len(reqs) == 0 or (reqs == [(0, 0), (0, 0)] and verbose > 0) or \
@@ -117,7 +287,7 @@ def main():
       if len(reqs) > 0:
         nprint("", config)
 
-  if parsable:  # pragma: no cover
+  if machine_readable:  # pragma: no cover
     print(config.format().format_output_line(msg=None, path=None, versions=mins))
   elif len(reqs) > 0:
     nprint("Minimum required versions: {}".format(version_strings(reqs)), config)
@@ -131,11 +301,11 @@ def main():
   # case is when both py2 and py3 incompatibilities were found - in which case `incomps = [2, 3]`
   # and `reqs = []`. But if `incomps = [2]` and `reqs = [3.4]`, for instance, then it makes sense
   # not to show incompatible versions with -i specified.
-  if len(incomps) > 0 and (not parsable and (not config.ignore_incomp() or len(reqs) == 0)):
+  if len(incomps) > 0 and (not machine_readable and (not config.ignore_incomp() or len(reqs) == 0)):
     # pragma: no cover
     nprint("Incompatible versions:     {}".format(version_strings(incomps)), config)
 
-  if args["versions"] and len(unique_versions) > 0:
+  if show_versions and len(unique_versions) > 0:
     nprint("Version range:             {}".format(version_strings(unique_versions)), config)
 
   targets = config.targets()
@@ -144,16 +314,13 @@ def main():
     # don't fail wrt. targets.
     all_inconclusive = config.only_show_violations() and len(reqs) > 0 and \
       all(req == (0, 0) for req in reqs)
-    if not all_inconclusive and\
-       not (len(reqs) == len(targets) and
-            all(((exact and target == req) or (not exact and target >= req)) for
-                ((exact, target), req) in zip(targets, reqs))):
-      if not parsable:
+    if not all_inconclusive and not targets_met(targets, reqs):
+      if not machine_readable:
         vers = ["{}{}".format(dotted_name(t), "-" if not e else "") for (e, t) in targets]
         nprint("Target versions not met:   {}".format(version_strings(vers)), config)
         if len(targets) < len(reqs):
           nprint("Note: Number of specified targets ({}) doesn't match number of detected minimum "
                  "versions ({}).".format(len(targets), len(reqs)), config)
-      sys.exit(1)
+      return 1
 
-  sys.exit(0)
+  return 0
@@ -1,28 +1,42 @@
 import ast
 import io
 import sys
+from timeit import default_timer
 from tokenize import generate_tokens, COMMENT, NEWLINE, NL, STRING
 
-from .printing import vvprint
 from .utility import version_strings
 
+# Comments of interest start with one of these markers. Sources without any of them can't have such
+# comments, which is checked on the raw source before tokenizing it.
+COMMENT_MARKERS = ("novermin", "novm")
+
 class Parser:
   def __init__(self, source, path=None):
     self.__source = source
     self.__path = "<unknown>" if path is None else path
+    self.__text = ""
 
-  def parse(self, parse_comments=True):
-    """Parse python source into an AST."""
+  def parse(self, parse_comments=True, timings=None):
+    """Parse python source into an AST. If `timings` is a dictionary, the seconds spent parsing and
+finding comments are recorded as the "parse" and "comments" phases."""
+    start = default_timer()
     node = ast.parse(self.__source, filename=self.__path)
+    parsed = default_timer()
     novermin = set()
     if parse_comments:
       novermin = self.comments()
+    if timings is not None:
+      timings["parse"] = parsed - start
+      if parse_comments:
+        timings["comments"] = default_timer() - parsed
     return (node, novermin)
 
   def comments(self):
     """Finds 'novermin' and 'novm' comments and associates to line numbers."""
     novermin = set()
     src = self.__source
+    if not Parser.has_comment_markers(src):
+      return novermin
     if isinstance(src, bytes):
       src = src.decode(errors="ignore")
 
@@ -64,31 +78,63 @@ class Parser:
       prev_newline = token.type in (NEWLINE, NL)
     return novermin
 
-  def detect(self, config):
-    """Parse python source into an AST and yield minimum versions."""
+  @staticmethod
+  def has_comment_markers(source):
+    """Returns whether source, as bytes or string, contains any 'novermin' or 'novm' marker at all.
+It is much faster than tokenizing the source, which is only needed if it does."""
+    if isinstance(source, bytes):
+      return any(marker.encode() in source for marker in COMMENT_MARKERS)
+    return any(marker in source for marker in COMMENT_MARKERS)
+
+  def output_text(self):
+    """Returns output of the last `detect()`, like the message of a syntax error when verbose, such
+that it is output together with the other results of the file."""
+    return self.__text
+
+  def detect(self, config, timings=None):
+    """Parse python source into an AST and yield minimum versions. See `parse()` regarding
+`timings`, and `output_text()` regarding output."""
     assert config is not None
+    self.__text = ""
     try:
-      (node, novermin) = self.parse(config.parse_comments())
+      (node, novermin) = self.parse(config.parse_comments(), timings)
       return (node, [], novermin)
     except SyntaxError as err:
       text = err.text.strip() if err.text is not None else ""
       lmsg = err.msg.lower()  # pylint: disable=no-member
-      parsable = config.format().name() == "parsable"
+      fmt = config.format()
+      parsable = fmt.name() == "parsable"
       if parsable:  # pragma: no cover
         text = text.replace("\n", "\\n")
 
+      # Machine-readable formats other than parsable output records of their own.
+      records = fmt.machine_readable() and not parsable
+
       # `print expr` is a Python 2 construct, in v3 it's `print(expr)`.
       # NOTE: This is only triggered when running a python 3 on v2 code!
       if lmsg.find("missing parentheses in call to 'print'") != -1:
-        versions = "2.0:!3:" if parsable else ""
-        vvprint("{}:{}:{}:{}info: `{}` requires 2.0".
-                format(err.filename, err.lineno, err.offset, versions, text), config)
-        return (None, [(2, 0), None], set())
+        min_versions = [(2, 0), None]
+        if records:
+          self.__output(fmt.format_output_line("info: `{}`".format(text), err.filename,
+                                               err.lineno, err.offset, min_versions), config)
+        else:
+          versions = "2.0:!3:" if parsable else ""
+          self.__output("{}:{}:{}:{}info: `{}` requires 2.0".
+                        format(err.filename, err.lineno, err.offset, versions, text), config)
+        return (None, min_versions, set())
 
       min_versions = [(0, 0), (0, 0)]
       if config.pessimistic():
         min_versions[sys.version_info.major - 2] = None
-      versions = version_strings(min_versions, separator=":") + ":" if parsable else ""
-      vvprint("{}:{}:{}:{}error: {}: {}".
-              format(err.filename, err.lineno, err.offset, versions, err.msg, text), config)
+      if records:
+        self.__output(fmt.format_output_line("error: {}: {}".format(err.msg, text), err.filename,
+                                             err.lineno, err.offset, min_versions), config)
+      else:
+        versions = version_strings(min_versions, separator=":") + ":" if parsable else ""
+        self.__output("{}:{}:{}:{}error: {}: {}".
+                      format(err.filename, err.lineno, err.offset, versions, err.msg, text), config)
     return (None, min_versions, set())
+
+  def __output(self, line, config):
+    if config.verbose() >= 2:
+      self.__text += line + "\n"
@@ -1,15 +1,43 @@
+import io
+import os
+import sys
 import multiprocessing as mp
+from queue import Queue
+from timeit import default_timer
 
 from .printing import nprint
 from .utility import combine_versions, InvalidVersionException
 from .parser import Parser
 from .source_visitor import SourceVisitor
 from .backports import Backports
+from .cache import ResultCache, git_blob_id
+from .detection import walk_paths
+from .timings import Timings
+from .fingerprint import EntityFingerprint
+
+# Config of a worker process. It is shipped once per worker via the pool initializer such that tasks
+# only carry file paths instead of pickling the config for every file.
+WORKER_CONFIG = None
+
+# Fixed cost of processing a file, in bytes, which is added to file sizes when batching work such
+# that many tiny files are also spread across batches.
+FILE_COST_BYTES = 4096
+
+# Amount of batches per process to aim for. More batches balance load better at the cost of more
+# round trips between processes.
+BATCHES_PER_PROCESS = 4
+
+# Amount of work, in bytes, of each batch when streaming since the total amount isn't known upfront.
+STREAM_BATCH_BYTES = FILE_COST_BYTES * 16
 
 class ProcessResult:
+  # Results are sent from worker processes to the parent process, so they are kept slim.
+  __slots__ = ("path", "node", "mins", "text", "novermin", "bps", "maybe_annotations", "timings",
+               "bytes", "fingerprint")
+
   def __init__(self, path):
     self.path = path       # Path of processed file.
-    self.node = None       # AST root node.
+    self.node = None       # AST root node, only kept on request, see `process_individual()`.
     self.mins = None       # Minimum versions detected.
     self.text = ""         # Output or exception text.
     self.novermin = set()  # novermin/novm lines.
@@ -18,6 +46,10 @@ class ProcessResult:
     # Potential generic/literal annotations used.
     self.maybe_annotations = False
 
+    self.timings = {}      # Phase -> seconds spent, see `timings.PHASES`.
+    self.bytes = 0         # Size of source in bytes.
+    self.fingerprint = None  # Entities used if recorded, see `Config.record_fingerprints()`.
+
   def __repr__(self):
     return """{} at 0x{:x}
 path={}
@@ -26,117 +58,602 @@ mins={}
 text={}
 novermin={}
 bps={}
-maybe_annotations={}""".format(self.__class__.__name__, id(self), self.path, self.node, self.mins,
-                               self.text, self.novermin, self.bps, self.maybe_annotations)
+maybe_annotations={}
+timings={}
+bytes={}
+fingerprint={}""".format(self.__class__.__name__, id(self), self.path, self.node, self.mins,
+                         self.text, self.novermin, self.bps, self.maybe_annotations, self.timings,
+                         self.bytes, self.fingerprint)
+
+  def to_dict(self):
+    """Returns dictionary of the results that are stored, like by the results cache, which can be
+serialized as JSON."""
+    return {
+      "mins": self.mins,
+      "text": self.text,
+      "novermin": sorted(self.novermin),
+      "bps": sorted(self.bps),
+      "maybe_annotations": self.maybe_annotations,
+      "fingerprint": self.fingerprint.to_dict() if self.fingerprint is not None else None,
+    }
+
+  def load_dict(self, value):
+    """Loads results from dictionary yielded by `to_dict()` and returns itself. Nothing is loaded if
+the dictionary isn't valid, in which case `KeyError`, `TypeError`, `AttributeError`, or `ValueError`
+is raised."""
+    mins = value["mins"]
+    if mins is not None:
+      mins = [tuple(v) if v is not None else None for v in mins]
+    fingerprint = value["fingerprint"]
+    if fingerprint is not None:
+      fingerprint = EntityFingerprint.from_dict(fingerprint)
+    (self.mins, self.text, self.novermin, self.bps, self.maybe_annotations, self.fingerprint) = \
+      (mins, value["text"], set(value["novermin"]), set(value["bps"]),
+       value["maybe_annotations"], fingerprint)
+    return self
 
 class Processor:
-  def process(self, paths, config, processes=mp.cpu_count()):
+  def __init__(self, pool=None):
+    """A processor creates a pool of worker processes for each invocation unless a long-lived `pool`
+is specified, which is then shared by all invocations. Tasks of a shared pool carry the config of
+their invocation since the workers weren't initialized with it."""
+    self.__pool = pool
+
+  def pool(self):
+    return self.__pool
+
+  def process(self, paths, config, processes=mp.cpu_count(), sizes=None, blobs=None):
+    """Processes paths and yields aggregated results. Results are output in the order of `paths`,
+unless unordered output is enabled in the config. If `sizes` is specified, it maps paths to their
+sizes in bytes and is used to schedule work such that bigger files are processed first. If `blobs`
+is specified, it maps paths to git blob ids of their contents, see `detect_git_paths()`, and results
+of those paths are taken from the results cache without reading the files, if present, and are
+otherwise cached under those ids. Files with identical contents are only processed once, see
+`identical_files()`."""
     assert config is not None
-    unique_versions = set()
-    all_backports = set()
-    used_novermin = False
-    maybe_annotations = False
-    mins = [(0, 0), (0, 0)]
-    incomp = False
+    aggregate = None
+    blobs = blobs or {}
+    cached = Processor.load_cached(paths, config, blobs)
+    todo = [path for path in paths if path not in cached] if len(cached) > 0 else paths
+    copies = Processor.identical_files(todo, sizes, blobs)
+    unique = [path for path in todo if path not in copies] if len(copies) > 0 else todo
 
     try:
-      # pylint: disable=consider-using-with
-      pool = mp.Pool(processes=processes) if processes > 1 else None
-
-      def print_incomp(path, text):
-        if not config.ignore_incomp():
-          if len(text) > 0:
-            text = "\n  " + text
-          nprint("File with incompatible versions: {}{}".format(path, text), config)
+      (pool, task_config) = self.__acquire_pool(config, processes)
 
       # Automatically don't use concurrency when only one process is specified to be used.
       def act():
         if processes == 1:
-          return [self.process_individual((path, config)) for path in paths]  # pragma: no cover
-        return pool.imap(self.process_individual, ((path, config) for path in paths))
+          return [self.process_individual((path, config), blob=blobs.get(path))
+                  for path in unique]  # pragma: no cover
+        batches = Processor.make_batches(unique, sizes, processes, blobs)
+        if config.unordered_output():
+          return Processor.__unordered_results(pool, batches, task_config)
+        return Processor.__ordered_results(pool, batches, task_config)
 
-      for proc_res in act():
-        # Ignore paths that didn't contain python code.
-        if proc_res is None:
-          continue
+      results = act()
+      if len(copies) > 0:
+        results = Processor.__copied_results(todo, copies, results, config)
+      if len(cached) > 0:
+        results = Processor.__merged_results(paths, cached, results, config.unordered_output())
+      aggregate = Processor.aggregate(results, config)
 
-        if proc_res.mins is None:
-          incomp = True
-          print_incomp(proc_res.path, proc_res.text)
-          continue
+      if pool and pool is not self.__pool:
+        pool.close()
+    except RuntimeError:
+      nprint("""RuntimeError: If running `Processor.process()` outside of
+`if __name__ == \"__main__\":` it, or the code calling it, must be done within it instead.""",
+             config)
 
-        all_backports = all_backports | proc_res.bps
+    return aggregate or Processor.aggregate([], config)
 
-        for ver in proc_res.mins:
-          if ver is not None and ver > (0, 0):
-            unique_versions.add(ver)
+  def process_stream(self, paths, config, processes=mp.cpu_count(), ignore_chars=None):
+    """Detects python files in paths, like `detect_paths()`, and processes them while detection is
+still ongoing. Results are output in sorted path order when all files have been processed, unless
+unordered output is enabled in the config, in which case they are output as soon as they are ready.
+Returns the same as `process()` together with the amount of files analyzed."""
+    assert config is not None
+    aggregate = None
+    amount = [0]
 
-        used_novermin |= (len(proc_res.novermin) > 0)
-        maybe_annotations |= proc_res.maybe_annotations
+    try:
+      (pool, task_config) = self.__acquire_pool(config, processes)
 
-        # For violations mode, only show file names and findings if there are any - no empty ones
-        # that do not violate the input targets. This is especially important when scanning many
-        # files since it can be hard to spot violations. Otherwise, show as normal.
-        if not config.only_show_violations() or len(proc_res.text) > 0:
-          config.format().output_result(proc_res)
+      def detected():
+        seen = set()
+        for (path, size, _) in walk_paths(paths, config.analyze_hidden(), ignore_chars,
+                                          config.scan_symlink_folders(), config, pool):
+          if path not in seen:
+            seen.add(path)
+            amount[0] += 1
+            yield (path, size)
 
-        try:
-          mins = combine_versions(mins, proc_res.mins, config)
-        except InvalidVersionException:
-          incomp = True
-          print_incomp(proc_res.path, proc_res.text)
+      # Automatically don't use concurrency when only one process is specified to be used.
+      def act():
+        if processes == 1:
+          results = (self.process_individual((path, config)) for (path, _) in detected())
+        else:
+          results = Processor.__streamed_results(pool, detected(), task_config)
+        if config.unordered_output():
+          return results
+        return sorted((res for res in results if res is not None), key=lambda res: res.path)
 
-      if pool:
+      aggregate = Processor.aggregate(act(), config)
+
+      if pool and pool is not self.__pool:
         pool.close()
     except RuntimeError:
-      nprint("""RuntimeError: If running `Processor.process()` outside of
+      nprint("""RuntimeError: If running `Processor.process_stream()` outside of
 `if __name__ == \"__main__\":` it, or the code calling it, must be done within it instead.""",
              config)
 
+    return (aggregate or Processor.aggregate([], config)) + (amount[0],)
+
+  def process_results(self, paths, config, processes=mp.cpu_count(), sizes=None, blobs=None):
+    """Processes paths and returns list of their results in the order of `paths`, without outputting
+or aggregating them. Results of paths that aren't python code are None. See `process()` regarding
+`sizes` and `blobs`."""
+    blobs = blobs or {}
+    cached = Processor.load_cached(paths, config, blobs)
+    todo = [path for path in paths if path not in cached] if len(cached) > 0 else paths
+    copies = Processor.identical_files(todo, sizes, blobs)
+    unique = [path for path in todo if path not in copies] if len(copies) > 0 else todo
+    (pool, task_config) = self.__acquire_pool(config, processes)
+    try:
+      if pool is None:
+        results = [self.process_individual((path, config), blob=blobs.get(path))
+                   for path in unique]
+      else:
+        batches = Processor.make_batches(unique, sizes, processes, blobs)
+        results = Processor.__ordered_results(pool, batches, task_config)
+      if len(copies) > 0:
+        # Copies are yielded in order since unordered output only applies to `process()`.
+        results = Processor.__copied_results(todo, copies, results, config, ordered=True)
+      if len(cached) > 0:
+        results = Processor.__merged_results(paths, cached, results, False)
+      return list(results)
+    finally:
+      if pool and pool is not self.__pool:
+        pool.close()
+
+  @staticmethod
+  def fingerprint_results(fingerprints, config):
+    """Yields results of evaluating fingerprints under the backports and exclusions of config
+instead of processing their files, see `EntityFingerprint`. Fingerprints of paths excluded by regex
+are skipped."""
+    for fingerprint in fingerprints:
+      if config.is_excluded_by_regex(fingerprint.path):
+        continue
+      res = ProcessResult(fingerprint.path)
+      try:
+        res.mins = fingerprint.minimum_versions(config)
+        res.bps = fingerprint.backports(config)
+      except InvalidVersionException as ex:
+        res.mins = None
+        res.text = str(ex)
+      res.maybe_annotations = fingerprint.maybe_annotations
+      res.fingerprint = fingerprint
+      yield res
+
+  def __acquire_pool(self, config, processes):
+    """Returns tuple of pool to use for processing, if any, and the config that tasks must carry,
+which is only needed when the pool is shared."""
+    if processes == 1:
+      return (None, None)
+    if self.__pool is not None:
+      return (self.__pool, config)
+    # pylint: disable=consider-using-with
+    return (mp.Pool(processes=processes, initializer=Processor.init_worker, initargs=(config,)),
+            None)
+
+  @staticmethod
+  def aggregate(results, config, output=True):
+    """Outputs results and returns aggregated minimum versions, whether any were incompatible,
+unique versions, backports, whether novermin was used, and whether annotations might be used. If
+timings are enabled in the config, a report of them is output after the results. Nothing is output
+unless `output` is true."""
+    timings = Timings(config.timings()) if output and config.timings() > 0 else None
+    unique_versions = set()
+    all_backports = set()
+    used_novermin = False
+    maybe_annotations = False
+    mins = [(0, 0), (0, 0)]
+    incomp = False
+
+    def print_incomp(path, text):
+      if output and not config.ignore_incomp():
+        if len(text) > 0:
+          text = "\n  " + text
+        nprint("File with incompatible versions: {}{}".format(path, text), config)
+
+    for proc_res in results:
+      # Ignore paths that didn't contain python code.
+      if proc_res is None:
+        continue
+
+      if timings is not None:
+        timings.add(proc_res)
+
+      if proc_res.mins is None:
+        incomp = True
+        print_incomp(proc_res.path, proc_res.text)
+        continue
+
+      all_backports = all_backports | proc_res.bps
+
+      for ver in proc_res.mins:
+        if ver is not None and ver > (0, 0):
+          unique_versions.add(ver)
+
+      used_novermin |= (len(proc_res.novermin) > 0)
+      maybe_annotations |= proc_res.maybe_annotations
+
+      # For violations mode, only show file names and findings if there are any - no empty ones
+      # that do not violate the input targets. This is especially important when scanning many
+      # files since it can be hard to spot violations. Otherwise, show as normal.
+      if output and (not config.only_show_violations() or len(proc_res.text) > 0):
+        config.format().output_result(proc_res)
+
+      try:
+        mins = combine_versions(mins, proc_res.mins, config)
+      except InvalidVersionException:
+        incomp = True
+        print_incomp(proc_res.path, proc_res.text)
+
+    if timings is not None:
+      config.format().output_report(timings.report(), [timings.record()])
+
     unique_versions = list(unique_versions)
     unique_versions.sort()
     return (mins, incomp, unique_versions, all_backports, used_novermin, maybe_annotations)
 
   @staticmethod
-  def process_individual(args):
+  def load_cached(paths, config, blobs):
+    """Returns dictionary of path -> cached result, or None if not python code, of the paths that
+have git blob ids in `blobs` and entries in the results cache of the config, if enabled."""
+    cached = {}
+    if config.cache_dir() is None or len(blobs) == 0:
+      return cached
+    cache = ResultCache(config.cache_dir(), config)
+    for path in paths:
+      blob = blobs.get(path)
+      if blob is None:
+        continue
+      start = default_timer()
+      (found, res) = cache.load(cache.blob_key(path, blob), ProcessResult(path))
+      if found:
+        if res is not None:
+          res.timings["cache"] = default_timer() - start
+        cached[path] = res
+    return cached
+
+  @staticmethod
+  def __merged_results(paths, cached, results, unordered):
+    """Yields cached results together with processing results of the other paths, in the order of
+`paths` unless `unordered`."""
+    if unordered:
+      for res in cached.values():
+        yield res
+      for res in results:
+        yield res
+      return
+
+    results = iter(results)
+    for path in paths:
+      yield cached[path] if path in cached else next(results)
+
+  @staticmethod
+  def identical_files(paths, sizes=None, blobs=None):
+    """Returns dictionary of path -> path of the first file in `paths` with identical contents, for
+files that are copies of an earlier one. Only files of equal size are hashed, using git blob ids of
+`blobs` where known, see `process()`. Copies must also agree on being an `__init__.py` file since it
+affects results."""
+    sizes = sizes or {}
+    blobs = blobs or {}
+    by_size = {}
+    for path in paths:
+      size = sizes.get(path)
+      if size is None:
+        try:
+          size = os.path.getsize(path)
+        except OSError:
+          continue
+      key = (size, os.path.basename(path) == "__init__.py")
+      by_size.setdefault(key, []).append(path)
+
+    copies = {}
+    for (key, group) in by_size.items():
+      if len(group) < 2:
+        continue
+      firsts = {}
+      for path in group:
+        blob = blobs.get(path)
+        if blob is None:
+          try:
+            with open(path, mode="rb") as fp:
+              blob = git_blob_id(fp.read())
+          except OSError:
+            continue
+        if blob in firsts:
+          copies[path] = firsts[blob]
+        else:
+          firsts[blob] = path
+    return copies
+
+  @staticmethod
+  def __copied_results(paths, copies, results, config, ordered=None):
+    """Yields processing results of paths that aren't copies, in the order of `paths` unless
+unordered output is enabled in the config, together with results of the copies derived from the
+result of the file they copy. Results of the other paths must be in the same order."""
+    originals = set(copies.values())
+    if ordered is None:
+      ordered = not config.unordered_output()
+    if not ordered:
+      pending = {}
+      for (copy, original) in copies.items():
+        pending.setdefault(original, []).append(copy)
+      for res in results:
+        yield res
+        # Results of files that aren't python code don't have paths, but neither do copies.
+        if res is not None and res.path in pending:
+          for copy in sorted(pending[res.path]):
+            yield Processor.copied_result(res, copy, config)
+      return
+
+    results = iter(results)
+    done = {}
+    for path in paths:
+      if path in copies:
+        yield Processor.copied_result(done[copies[path]], path, config)
+      else:
+        res = next(results)
+        if path in originals:
+          done[path] = res
+        yield res
+
+  @staticmethod
+  def copied_result(res, path, config):
+    """Returns result of file at path derived from result `res` of a file with identical
+contents."""
+    if res is None:
+      return None
+    copy = ProcessResult(path)
+    copy.mins = res.mins
+    copy.text = config.format().replace_path(res.text, res.path, path)
+    copy.novermin = res.novermin
+    copy.bps = res.bps
+    copy.maybe_annotations = res.maybe_annotations
+    copy.bytes = res.bytes
+    if res.fingerprint is not None:
+      copy.fingerprint = res.fingerprint.copy(path)
+    return copy
+
+  @staticmethod
+  def make_batches(paths, sizes, processes, blobs=None):
+    """Splits paths into batches of `(index, path, blob)` tuples of roughly equal amounts of work,
+where `index` is the position in `paths` and `blob` is the git blob id of the path in `blobs`, or
+None, see `process()`. Batches with the biggest files come first such that one huge file doesn't
+leave the end of the processing to a single process."""
+    sizes = sizes or {}
+    blobs = blobs or {}
+    costs = [sizes.get(path, 0) + FILE_COST_BYTES for path in paths]
+    target = max(sum(costs) // max(processes * BATCHES_PER_PROCESS, 1), FILE_COST_BYTES)
+
+    batches = []
+    batch = []
+    batch_cost = 0
+    for i in sorted(range(len(paths)), key=lambda i: costs[i], reverse=True):
+      if len(batch) > 0 and batch_cost + costs[i] > target:
+        batches.append(batch)
+        batch = []
+        batch_cost = 0
+      batch.append((i, paths[i], blobs.get(paths[i])))
+      batch_cost += costs[i]
+    if len(batch) > 0:
+      batches.append(batch)
+    return batches
+
+  @staticmethod
+  def __batch_results(pool, batches, config):
+    """Yields lists of `(index, result)` tuples of batches as soon as they have been processed. If
+`config` is specified, it is carried by each batch and output printed while processing is relayed,
+see `process_config_batch()`."""
+    if config is None:
+      for results in pool.imap_unordered(Processor.process_batch, batches):
+        yield results
+      return
+
+    tasks = [(config, batch) for batch in batches]
+    for (results, output) in pool.imap_unordered(Processor.process_config_batch, tasks):
+      sys.stdout.write(output)
+      yield results
+
+  @staticmethod
+  def __ordered_results(pool, batches, config):
+    """Yields processing results in the order of the paths indexed by `make_batches()` while batches
+are processed in the order of `batches`."""
+    pending = {}
+    next_index = 0
+    for results in Processor.__batch_results(pool, batches, config):
+      for (i, res) in results:
+        pending[i] = res
+      while next_index in pending:
+        yield pending.pop(next_index)
+        next_index += 1
+
+  @staticmethod
+  def __unordered_results(pool, batches, config):
+    """Yields processing results as soon as their batch has been processed."""
+    for results in Processor.__batch_results(pool, batches, config):
+      for (_, res) in results:
+        yield res
+
+  @staticmethod
+  def __streamed_results(pool, detected, config):
+    """Processes `(path, size)` tuples of iterable `detected` in batches while it is still being
+iterated, and yields processing results as soon as their batch has been processed. If `config` is
+specified, it is carried by each batch like with `__batch_results()`."""
+    done = Queue()
+    pending = [0]
+
+    def submit(batch):
+      if config is None:
+        pool.apply_async(Processor.process_batch_task, (batch,), callback=done.put)
+      else:
+        pool.apply_async(Processor.process_batch_task, ((config, batch),), callback=done.put)
+      pending[0] += 1
+
+    def finished(block):
+      while pending[0] > 0 and (block or not done.empty()):
+        results = done.get()
+        pending[0] -= 1
+        if isinstance(results, Exception):
+          raise results  # pragma: no cover
+        if config is not None:
+          (results, output) = results
+          sys.stdout.write(output)
+        for (_, res) in results:
+          yield res
+
+    batch = []
+    batch_cost = 0
+    for (path, size) in detected:
+      batch.append((len(batch), path, None))
+      batch_cost += size + FILE_COST_BYTES
+      if batch_cost >= STREAM_BATCH_BYTES:
+        submit(batch)
+        batch = []
+        batch_cost = 0
+      for res in finished(False):
+        yield res
+    if len(batch) > 0:
+      submit(batch)
+    for res in finished(True):
+      yield res
+
+  @staticmethod
+  def process_batch(batch):
+    """Processes batch of `(index, path, blob)` tuples and yields list of `(index, result)`
+tuples."""
+    return [(i, Processor.process_path(path, blob)) for (i, path, blob) in batch]
+
+  @staticmethod
+  def process_config_batch(args):
+    """Processes `(config, batch)` tuple like `process_batch()` using the config, for workers of a
+shared pool. Returns tuple of the results and the output printed while processing, which would
+otherwise end up in the output of the worker process instead of the invocation."""
+    (config, batch) = args
+    Processor.init_worker(config)
+    stdout = sys.stdout
+    sys.stdout = io.StringIO()
+    try:
+      results = Processor.process_batch(batch)
+      return (results, sys.stdout.getvalue())
+    finally:
+      sys.stdout = stdout
+
+  @staticmethod
+  def process_batch_task(batch):
+    """Processes batch like `process_batch()`, or `process_config_batch()` if it is a tuple, but
+returns any exception instead of raising it such that the caller is always notified of the task
+being done."""
+    try:
+      if isinstance(batch, tuple):
+        return Processor.process_config_batch(batch)
+      return Processor.process_batch(batch)
+    except Exception as ex:  # pragma: no cover
+      return ex
+
+  @staticmethod
+  def init_worker(config):
+    """Pool initializer setting the config used by `process_path()` in a worker process."""
+    global WORKER_CONFIG  # pylint: disable=global-statement
+    WORKER_CONFIG = config
+
+  @staticmethod
+  def process_path(path, blob=None):
+    """Processes path using the config of the worker process set via `init_worker()`, see
+`process_individual()` regarding `blob`."""
+    assert WORKER_CONFIG is not None, "Worker config must be initialized!"
+    return Processor.process_individual((path, WORKER_CONFIG), blob=blob)
+
+  @staticmethod
+  def process_individual(args, keep_node=False, blob=None):
+    """Processes `(path, config)` tuple and returns the result, or None if the path isn't python
+code. The AST root node is only kept in the result if `keep_node` is true, which is never the case
+for results of worker processes since it is costly to send back and never used by the processor. If
+`blob` is specified, it is the git blob id of the contents of the path, see `detect_git_paths()`,
+and the result is cached under it instead of the id of the bytes read, which differ when git
+applies filters like end-of-line conversion."""
     (path, config) = args
     res = ProcessResult(path)
+    node = None
+
+    cache = None
+    cache_key = None
+    if config.cache_dir() is not None:
+      cache = ResultCache(config.cache_dir(), config)
 
     source = None
     try:
+      start = default_timer()
       with open(path, mode="rb") as fp:
         source = fp.read()
-        parser = Parser(source, path)
-        (res.node, res.mins, res.novermin) = parser.detect(config)
+      res.bytes = len(source)
+      res.timings["read"] = default_timer() - start
+      if cache is not None:
+        start = default_timer()
+        cache_key = cache.key(path, source) if blob is None else cache.blob_key(path, blob)
+        (found, cached_res) = cache.load(cache_key, res)
+        res.timings["cache"] = default_timer() - start
+        if found:
+          return cached_res
+      parser = Parser(source, path)
+      (node, res.mins, res.novermin) = parser.detect(config, res.timings)
+      res.text = parser.output_text()
     except KeyboardInterrupt:  # pragma: no cover
       return res
 
     # When input isn't python code, ignore it.
     except ValueError:
       # source code string cannot contain null bytes
+      if cache_key is not None:
+        cache.store(cache_key, None)
       return None
     except TypeError:  # pragma: no cover
       # compile() expected string without null bytes
+      if cache_key is not None:
+        cache.store(cache_key, None)
       return None
 
     except Exception as ex:  # pragma: no cover
       res.text = "{}: {}, {}".format(path, type(ex), ex)
       res.mins = [(0, 0), (0, 0)]
 
-    if res.node is None:
+    # Results without AST, like syntax errors, aren't cached.
+    if node is None:
+      if config.record_fingerprints():
+        res.fingerprint = EntityFingerprint(path)
+        res.fingerprint.mins = res.mins
       return res
 
+    start = default_timer()
     visitor = SourceVisitor(config, path, source)
     visitor.set_no_lines(res.novermin)
 
     try:
-      visitor.tour(res.node)
+      visitor.tour(node)
     except KeyboardInterrupt:  # pragma: no cover
       return res
+    res.timings["visit"] = default_timer() - start
 
     try:
+      start = default_timer()
       res.mins = visitor.minimum_versions()
+      res.timings["versions"] = default_timer() - start
+      start = default_timer()
       res.text = visitor.output_text()
+      res.timings["format"] = default_timer() - start
       for m in visitor.modules():
         if Backports.is_backport(m):
           res.bps.add(m)
@@ -144,5 +661,11 @@ class Processor:
     except InvalidVersionException as ex:
       res.mins = None
       res.text = str(ex)
+    if config.record_fingerprints():
+      res.fingerprint = EntityFingerprint.record(visitor, path)
 
+    if cache_key is not None:
+      cache.store(cache_key, res)
+    if keep_node:
+      res.node = node
     return res
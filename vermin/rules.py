@@ -3705,16 +3705,16 @@ CODECS_ENCODINGS = {
   ("base64", "base_64", "base-64"): (None, (3, 4)),
 
   ("bz2_codec", "bz2-codec"): (None, (3, 2)),
-  ("bz2"): (None, (3, 4)),
+  ("bz2",): (None, (3, 4)),
 
   ("hex_codec", "hex-codec"): (None, (3, 2)),
-  ("hex"): (None, (3, 4)),
+  ("hex",): (None, (3, 4)),
 
   ("quopri_codec", "quopri-codec"): (None, (3, 2)),
   ("quopri", "quotedprintable", "quoted_printable", "quoted-printable"): (None, (3, 4)),
 
   ("uu_codec", "uu-codec"): (None, (3, 2)),
-  ("uu"): (None, (3, 4)),
+  ("uu",): (None, (3, 4)),
 
   ("zip_codec", "zip-codec"): (None, (3, 2)),
   ("zip", "zlib"): (None, (3, 4)),
@@ -3723,9 +3723,19 @@ CODECS_ENCODINGS = {
 
   # Caesar cipher
   ("rot_13", "rot-13"): (None, (3, 2)),
-  ("rot13"): (None, (3, 4)),
+  ("rot13",): (None, (3, 4)),
 }
 
+def normalize_codecs_encoding(name):
+  """Normalizes codecs encoding name for lookup in `CODECS_ENCODINGS_ALIASES`. Like Python does,
+case is ignored and hyphens are equivalent to underscores."""
+  return name.lower().replace("-", "_")
+
+# Reverse index of CODECS_ENCODINGS: normalized alias -> versions.
+CODECS_ENCODINGS_ALIASES = dict((normalize_codecs_encoding(alias), vers)
+                                for (aliases, vers) in CODECS_ENCODINGS.items()
+                                for alias in aliases)
+
 # Correlate the value of kwarg "encoding", "file_encoding", "data_encoding" of the following
 # functions with CODECS_ENCODINGS: function -> set of argument indices
 CODECS_ENCODINGS_INDICES = {
@@ -3859,3 +3869,18 @@ DECORATOR_USER_FUNCTIONS = {
   "functools.lru_cache": (None, (3, 8)),
   "functools.cache": (None, (3, 9)),
 }
+
+# Rule tables built from `MOD_REQS`, `MOD_MEM_REQS`, and `KWARGS_REQS` keyed by the set of backports
+# they were built for, since that is the only part of the config they depend on.
+RULE_TABLES_CACHE = {}
+
+def rule_tables(config):
+  """Returns the tuple of module, member, and kwargs rule tables for the backports of config. Tables
+are built once per process per unique set of backports and shared between all callers, so they must
+be treated as read-only."""
+  key = frozenset(config.backports())
+  tables = RULE_TABLES_CACHE.get(key)
+  if tables is None:
+    tables = (MOD_REQS(config), MOD_MEM_REQS(config), KWARGS_REQS(config))
+    RULE_TABLES_CACHE[key] = tables
+  return tables
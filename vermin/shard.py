@@ -0,0 +1,69 @@
+import json
+
+from .constants import VERSION
+from .processor import ProcessResult
+
+def shard_paths(paths, shard):
+  """Returns the paths of shard, a tuple of 1-based index and count, of sorted paths. Paths are
+partitioned round-robin such that each path belongs to exactly one shard and shards differ by at
+most one path in size, which is deterministic for the same paths."""
+  (index, count) = shard
+  return paths[index - 1::count]
+
+def save_partial(path, shard, amount, results):
+  """Saves partial results of shard, which detected `amount` files, to JSON file at path such that
+they can be merged with those of the other shards via `load_partials()`. Results of files that
+aren't python code are left out."""
+  entries = []
+  for res in results:
+    if res is not None:
+      entry = res.to_dict()
+      entry["path"] = res.path
+      entries.append(entry)
+  with open(path, mode="w", encoding="utf-8") as fp:
+    json.dump({"version": VERSION, "shard": list(shard), "amount": amount, "results": entries}, fp)
+
+def load_partial(path):
+  """Loads partial results from JSON file at path and returns tuple of shard, amount of files
+detected, and results. Raises `ValueError` if it isn't valid."""
+  with open(path, mode="r", encoding="utf-8") as fp:
+    data = json.load(fp)
+  try:
+    (index, count) = data["shard"]
+    amount = data["amount"]
+    results = [ProcessResult(entry["path"]).load_dict(entry) for entry in data["results"]]
+  except (KeyError, TypeError, AttributeError, ValueError) as ex:
+    raise ValueError("Invalid partial results: {}: {}".format(path, ex)) from ex
+  if not (isinstance(index, int) and isinstance(count, int) and 1 <= index <= count):
+    raise ValueError("Invalid shard: {}: {}".format(path, data["shard"]))
+  return ((index, count), amount, results)
+
+def load_partials(paths):
+  """Loads partial results from JSON files at paths, which must contain every shard of the same
+count exactly once. Returns tuple of results of all files, sorted by path like when analyzing them
+in one go, and the total amount of files detected. Raises `ValueError` if a file isn't valid or
+shards are missing, duplicated, or of different counts."""
+  if len(paths) == 0:
+    raise ValueError("No partial results specified")
+
+  shards = {}  # Shard -> path.
+  amount = 0
+  results = []
+  for path in paths:
+    (shard, shard_amount, shard_results) = load_partial(path)
+    if len(shards) > 0 and shard[1] != list(shards)[0][1]:
+      raise ValueError("Shard counts differ: {}: {}/{}".format(path, shard[0], shard[1]))
+    if shard in shards:
+      raise ValueError("Shard {}/{} in both {} and {}".format(shard[0], shard[1], shards[shard],
+                                                              path))
+    shards[shard] = path
+    amount += shard_amount
+    results += shard_results
+
+  count = list(shards)[0][1]
+  missing = [str(index) for index in range(1, count + 1) if (index, count) not in shards]
+  if len(missing) > 0:
+    raise ValueError("Missing shards of {}: {}".format(count, ", ".join(missing)))
+
+  results.sort(key=lambda res: res.path)
+  return (results, amount)
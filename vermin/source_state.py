@@ -2,7 +2,7 @@ import sys
 import os
 from collections import deque
 
-from .rules import MOD_REQS, MOD_MEM_REQS, KWARGS_REQS
+from .rules import rule_tables
 
 class SourceState:
   """Source file visitation state."""
@@ -29,14 +29,28 @@ class SourceState:
     self.line = 1
     self.lines = None
 
-    # List of lines of output text.
-    self.output_text = []
+    # List of findings for output, see `Finding`, and raw lines of dumps of AST node visits.
+    self.findings = []
 
     # Line/column of entities for vvv-printing.
     self.line_col_entities = {}
 
+    # Modules and members in the order they were added. Each has an accompanying set for fast
+    # membership checks.
     self.modules = []
+    self.modules_set = set()
     self.members = []
+    self.members_set = set()
+
+    # Entities excluded while visiting as tuples of kind and entity, see `EntityFingerprint`, and
+    # the set of excluded modules, including those of attribute chains of excluded modules.
+    self.excluded = []
+    self.excluded_modules = set()
+
+    # Module -> root module of the attribute chains that modules are only known from, which are
+    # excluded along with their root module.
+    self.module_roots = {}
+
     self.printv2 = False
     self.printv3 = False
     self.format27 = False  # If format is used so that it requires 2.7+, like '{}' etc.
@@ -119,10 +133,14 @@ class SourceState:
 
     # Typecodes for use with `array.array(typecode, [init..])`.
     self.array_typecodes = []
+    self.array_typecodes_set = set()
 
     # Module as-name -> name.
     self.module_as_name = {}
 
+    # Attribute node -> full name of plain attribute chains, like `a.b.c`.
+    self.attribute_names = {}
+
     # Lines that should be ignored if they have the comment "novermin" or "novm".
     self.no_lines = set()
 
@@ -144,6 +162,5 @@ class SourceState:
     # Might be using generic/literal annotations that require `--eval-annotations` to work.
     self.maybe_annotations = False
 
-    self.mod_rules = MOD_REQS(self.config)
-    self.mod_mem_reqs_rules = MOD_MEM_REQS(self.config)
-    self.kwargs_reqs_rules = KWARGS_REQS(self.config)
+    # Rule tables are shared between all states with the same backports and must not be modified.
+    (self.mod_rules, self.mod_mem_reqs_rules, self.kwargs_reqs_rules) = rule_tables(self.config)
@@ -4,16 +4,135 @@ from collections import deque
 
 from .source_state import SourceState
 from .rules import STRFTIME_REQS, BYTES_REQS, ARRAY_TYPECODE_REQS, CODECS_ERROR_HANDLERS,\
-  CODECS_ERRORS_INDICES, CODECS_ENCODINGS, CODECS_ENCODINGS_INDICES,\
+  CODECS_ERRORS_INDICES, CODECS_ENCODINGS_ALIASES, CODECS_ENCODINGS_INDICES,\
   BUILTIN_GENERIC_ANNOTATION_TYPES, DICT_UNION_SUPPORTED_TYPES, DICT_UNION_MERGE_SUPPORTED_TYPES,\
-  DECORATOR_USER_FUNCTIONS
-from .utility import dotted_name, reverse_range, combine_versions, remove_whitespace
+  DECORATOR_USER_FUNCTIONS, normalize_codecs_encoding
+from .utility import dotted_name, combine_versions, remove_whitespace, violates_targets, Finding
 
 STRFTIME_DIRECTIVE_REGEX = re.compile(r"%(?:[-\.\d#\s\+])*(\w)")
 BYTES_DIRECTIVE_REGEX = STRFTIME_DIRECTIVE_REGEX
 STR_27_FORMAT_REGEX = re.compile(r"(?<!{){}(?!})")
 WITH_PAREN_REGEX = re.compile(r"with[\s\\]*\(")
 
+# Language features detected while visiting as tuples of the `SourceState` flag set when used,
+# minimum versions, description, and plurality of the description (None means deduced). Features are
+# evaluated in order by `SourceVisitor.minimum_versions()`, which matters for which features are
+# reported when incompatible versions are combined.
+LANGUAGE_FEATURES = (
+  ("format27", ((2, 7), (3, 0)), "`\"..{}..\".format(..)`", None),
+
+  # `long` is also in `MOD_MEM_REQS`, which means it will trigger there, so there's no description.
+  ("longv2", ((2, 0), None), None, None),
+
+  # Since byte strings are a `str` synonym as of 2.6+, (2, 6) is required instead of None.
+  # Ref: https://github.com/netromdk/vermin/issues/32
+  ("bytesv3", ((2, 6), (3, 0)), "'bytes' type", None),
+
+  ("fstrings", (None, (3, 6)), "fstrings", None),
+  ("fstrings_self_doc", (None, (3, 8)), "self-documenting fstrings", None),
+  ("bool_const", ((2, 3), (3, 0)), "'bool' constant", None),
+  ("annotations", (None, (3, 0)), "annotations", None),
+  ("var_annotations", (None, (3, 6)), "variable annotations", None),
+  ("final_annotations", (None, (3, 8)), "Final annotations", None),
+  ("literal_annotations", (None, (3, 8)), "Literal annotations", None),
+  ("coroutines", (None, (3, 5)), "coroutines", None),
+  ("async_generator", (None, (3, 6)), "async generators", None),
+
+  # NOTE: While async comprehensions and await in comprehensions should be in 3.6, they were first
+  # put into 3.7 for some reason!
+  ("async_comprehension", (None, (3, 7)), "async comprehensions", None),
+  ("await_in_comprehension", (None, (3, 7)), "await in comprehension", None),
+
+  ("async_for", (None, (3, 5)), "async for-loop", None),
+  ("named_exprs", (None, (3, 8)), "named expressions", None),
+  ("kw_only_args", (None, (3, 0)), "keyword-only arguments", None),
+  ("pos_only_args", (None, (3, 8)), "position only arguments", None),
+  ("nonlocal_stmt", (None, (3, 0)), "'nonlocal' statement", None),
+  ("yield_from", (None, (3, 3)), "yield from", None),
+  ("raise_cause", (None, (3, 0)), "exception cause", None),
+  ("raise_from_none", (None, (3, 3)), "raise ... from None", None),
+  ("set_literals", ((2, 7), (3, 0)), "set literals", None),
+  ("set_comp", ((2, 7), (3, 0)), "set comprehension", None),
+  ("dict_comp", ((2, 7), (3, 0)), "dict comprehension", None),
+  ("mat_mult", (None, (3, 5)), "infix matrix multiplication", None),
+  ("continue_in_finally", (None, (3, 8)), "'continue' in 'finally'", None),
+  ("mod_inverse_pow", (None, (3, 8)), "modular inverse 'pow()'", None),
+  ("with_statement", ((2, 5), (3, 0)), "'with' statement", None),
+  ("async_with_statement", (None, (3, 5)), "'async with' statement", None),
+  ("multi_withitem", ((2, 7), (3, 1)), "multiple context expressions in a 'with' statement", True),
+  ("with_parentheses", (None, (3, 9)),
+   "multiple context expressions in a `with` statement with parentheses", None),
+  ("generalized_unpacking", (None, (3, 5)), "generalized unpacking", None),
+  ("unpacking_assignment", (None, (3, 0)), "unpacking assignment", None),
+  ("ellipsis_out_of_slices", (None, (3, 0)), "ellipsis literal (`...`) out of slices", False),
+
+  # Since byte strings are a `str` synonym as of 2.6+, and thus also supports `%` formatting, (2, 6)
+  # is required instead of None.
+  ("bytes_format", ((2, 6), (3, 5)), "bytes format", None),
+
+  ("bytearray_format", (None, (3, 5)), "bytearray format", None),
+  ("dict_union", (None, (3, 9)), "dict union", None),
+  ("dict_union_merge", (None, (3, 9)), "dict union merge", None),
+  ("builtin_generic_type_annotations", (None, (3, 9)), "builtin generic type annotations", None),
+  ("function_decorators", ((2, 4), (3, 0)), "function decorators", None),
+  ("class_decorators", ((2, 6), (3, 0)), "class decorators", None),
+  ("relaxed_decorators", (None, (3, 9)), "relaxed decorators", None),
+  ("pattern_matching", (None, (3, 10)), "pattern matching", None),
+  ("union_types", (None, (3, 10)), "union types as `X | Y`", True),
+  ("super_no_args", (None, (3, 0)), "super() without arguments", False),
+  ("except_star", (None, (3, 11)), "`except*`", None),
+  ("metaclass_class_keyword", (None, (3, 0)), "'metaclass' class keyword", None),
+)
+
+# Kinds of entities collected while visiting whose minimum versions are looked up in rules. Entities
+# are evaluated in this order by `SourceVisitor.minimum_versions()`, after `LANGUAGE_FEATURES`.
+ENTITY_KINDS = ("strftime_directives", "bytes_directives", "array_typecodes",
+                "codecs_error_handlers", "codecs_encodings", "modules", "members", "kwargs",
+                "user_function_decorators")
+
+def entity_versions(entities, tables):
+  """Yields tuples of minimum versions, description, and entity of entities that have rules, where
+`entities` maps each of `ENTITY_KINDS` to a list of entities and `tables` is the tuple of module,
+member, and kwargs rule tables, see `rules.rule_tables()`."""
+  (mod_rules, mod_mem_reqs_rules, kwargs_reqs_rules) = tables
+  for directive in entities["strftime_directives"]:
+    if directive in STRFTIME_REQS:
+      yield (STRFTIME_REQS[directive], "strftime directive '{}'".format(directive), directive)
+
+  for directive in entities["bytes_directives"]:
+    if directive in BYTES_REQS:
+      yield (BYTES_REQS[directive], "bytes directive '{}'".format(directive), directive)
+
+  for typecode in entities["array_typecodes"]:
+    if typecode in ARRAY_TYPECODE_REQS:
+      yield (ARRAY_TYPECODE_REQS[typecode], "array typecode '{}'".format(typecode), typecode)
+
+  for name in entities["codecs_error_handlers"]:
+    if name in CODECS_ERROR_HANDLERS:
+      yield (CODECS_ERROR_HANDLERS[name], "codecs error handler name '{}'".format(name), name)
+
+  for encoding in entities["codecs_encodings"]:
+    vers = CODECS_ENCODINGS_ALIASES.get(normalize_codecs_encoding(encoding))
+    if vers is not None:
+      yield (vers, "codecs encoding '{}'".format(encoding), encoding)
+
+  for mod in entities["modules"]:
+    if mod in mod_rules:
+      yield (mod_rules[mod], "'{}' module".format(mod), mod)
+
+  for mem in entities["members"]:
+    if mem in mod_mem_reqs_rules:
+      yield (mod_mem_reqs_rules[mem], "'{}' member".format(mem), mem)
+
+  for fn_kw in entities["kwargs"]:
+    if fn_kw in kwargs_reqs_rules:
+      yield (kwargs_reqs_rules[fn_kw], "'{}({})'".format(fn_kw[0], fn_kw[1]), fn_kw)
+
+  for user_func_deco in entities["user_function_decorators"]:
+    if user_func_deco in DECORATOR_USER_FUNCTIONS:
+      yield (DECORATOR_USER_FUNCTIONS[user_func_deco],
+             "'{}' user function decorator".format(user_func_deco), user_func_deco)
+
 def is_int_node(node):
   return (isinstance(node, ast.Num) and isinstance(node.n, int)) or \
     (isinstance(node, ast.UnaryOp) and isinstance(node.operand, ast.Num) and
@@ -64,10 +183,34 @@ def assign_target_walk(node):
       todo.extend(ast.iter_child_nodes(node))
       yield node
 
+# Visitor class -> tuple of dispatch table of node class -> handler function, and set of inert node
+# classes, filled as node classes are visited. The dispatch table replaces looking up "visit_" +
+# class name for every visited node. Nodes of inert classes can never affect results so they are
+# skipped instead of visited.
+DISPATCH_TABLES = {}
+
+# Node classes whose handlers of `SourceVisitor` do nothing, which makes them inert.
+NO_OP_NODES = ("Add", "BitAnd", "BitOr", "Break", "Div", "Eq", "Gt", "In", "Is", "Load", "Lt",
+               "Mod", "Mult", "Not", "NotEq", "Num", "Or", "Pass", "Store", "Sub", "alias")
+
+# Types of constant values that `SourceVisitor.visit_Constant()` ignores, which makes such constant
+# nodes inert too.
+CONSTANT_NODE = getattr(ast, "Constant", None)
+INERT_CONSTANT_TYPES = (str, int, float, complex, type(None))
+
 class SourceVisitor(ast.NodeVisitor):
   def __init__(self, config, path=None, source=None):
     super().__init__()
     self.__s = SourceState(config, path, source)
+    (self.__dispatch, self.__inert) = DISPATCH_TABLES.setdefault(type(self), ({}, set()))
+    self.__print_visits = config.print_visits()
+
+    # Nothing is skipped when printing visits such that all nodes are shown. Neither are constants
+    # if a subclass overrides their handler.
+    self.__skipped = frozenset() if self.__print_visits else self.__inert
+    self.__inert_constant = None
+    if not self.__print_visits and type(self).visit_Constant is SourceVisitor.visit_Constant:
+      self.__inert_constant = CONSTANT_NODE
 
   def modules(self):
     return self.__s.modules
@@ -75,6 +218,20 @@ class SourceVisitor(ast.NodeVisitor):
   def members(self):
     return self.__s.members
 
+  def excluded(self):
+    """Returns list of tuples of kind and entity excluded while visiting."""
+    return self.__s.excluded
+
+  def module_roots(self):
+    """Returns dictionary of module -> root module of the attribute chains that modules are only
+known from."""
+    return self.__s.module_roots
+
+  def used_features(self):
+    """Returns list of flags of print statements and functions, and `LANGUAGE_FEATURES`, used."""
+    flags = ["printv2", "printv3"] + [flag for (flag, _, _, _) in LANGUAGE_FEATURES]
+    return [flag for flag in flags if getattr(self.__s, flag)]
+
   def printv2(self):
     return self.__s.printv2
 
@@ -283,18 +440,7 @@ class SourceVisitor(ast.NodeVisitor):
     # rule.
     if versions is None or not self.__s.config.only_show_violations():
       return True
-
-    targets = [t for (e, t) in self.__s.config.targets()]
-    if len(targets) == 1:
-      if targets[0][0] < 3:
-        targets.append(None)
-      else:
-        targets = [None, targets[0]]
-
-    for i in (0, 1):
-      if targets[i] is not None and (versions[i] is None or versions[i] > targets[i]):
-        return True
-    return False
+    return violates_targets(versions, self.__s.config.targets())
 
   def __add_versions_entity(self, mins, versions, info=None, vvprint=False, entity=None,
                             plural=None):
@@ -309,7 +455,24 @@ class SourceVisitor(ast.NodeVisitor):
         self.__s.info_versions[versions] = [info]
       if vvprint:
         self.__vvprint(info, entity=entity, versions=versions, plural=plural)
-    return combine_versions(mins, versions, self.__s.config, self.__s.info_versions)
+    return self.__combine_versions(mins, versions)
+
+  def __combine_versions(self, mins, versions):
+    """Combines versions into the list of minimum versions in-place, keeping the maximum version per
+major version where None, not supported, always wins, and returns it. It is equivalent to
+`combine_versions()` without rebuilding the list, which is only used to raise the same error for
+incompatible versions."""
+    (v2, v3) = versions
+    (m2, m3) = mins
+    if ((m2 is None and m3 is not None and v2 is not None and v3 is None) or
+        (m2 is not None and m3 is None and v2 is None and v3 is not None)) and\
+       not self.__s.config.ignore_incomp():
+      combine_versions(mins, versions, self.__s.config, self.__s.info_versions)
+    if m2 is not None and (v2 is None or v2 > m2):
+      mins[0] = v2
+    if m3 is not None and (v3 is None or v3 > m3):
+      mins[1] = v3
+    return mins
 
   def minimum_versions(self):
     mins = [(0, 0), (0, 0)]
@@ -327,232 +490,26 @@ class SourceVisitor(ast.NodeVisitor):
       self.__vvprint("print(expr)", line=-1, versions=[(2, 0), (3, 0)])
       mins = self.__add_versions_entity(mins, ((2, 0), (3, 0)))
 
-    if self.format27():
-      mins = self.__add_versions_entity(mins, ((2, 7), (3, 0)), "`\"..{}..\".format(..)`")
-
-    if self.longv2():
-      # `long` is also in `MOD_MEM_REQS`, which means it will trigger below, so we don't put an
-      # entity description here.
-      mins = self.__add_versions_entity(mins, ((2, 0), None))
-
-    if self.bytesv3():
-      # Since byte strings are a `str` synonym as of 2.6+, (2, 6) is returned instead of None.
-      # Ref: https://github.com/netromdk/vermin/issues/32
-      mins = self.__add_versions_entity(mins, ((2, 6), (3, 0)), "'bytes' type")
-
-    if self.fstrings():
-      mins = self.__add_versions_entity(mins, (None, (3, 6)), "fstrings")
-
-    if self.fstrings_self_doc():  # pragma: no cover
-      mins = self.__add_versions_entity(mins, (None, (3, 8)), "self-documenting fstrings")
-
-    if self.bool_const():  # pragma: no cover
-      mins = self.__add_versions_entity(mins, ((2, 3), (3, 0)), "'bool' constant")
-
-    if self.annotations():
-      mins = self.__add_versions_entity(mins, (None, (3, 0)), "annotations")
-
-    if self.var_annotations():
-      mins = self.__add_versions_entity(mins, (None, (3, 6)), "variable annotations")
-
-    if self.final_annotations():
-      mins = self.__add_versions_entity(mins, (None, (3, 8)), "Final annotations")
-
-    if self.literal_annotations():
-      mins = self.__add_versions_entity(mins, (None, (3, 8)), "Literal annotations")
-
-    if self.coroutines():
-      mins = self.__add_versions_entity(mins, (None, (3, 5)), "coroutines")
-
-    if self.async_generator():
-      mins = self.__add_versions_entity(mins, (None, (3, 6)), "async generators")
-
-    # NOTE: While async comprehensions and await in comprehensions should be in 3.6, they were first
-    # put into 3.7 for some reason!
-
-    if self.async_comprehension():
-      mins = self.__add_versions_entity(mins, (None, (3, 7)), "async comprehensions")
-
-    if self.await_in_comprehension():
-      mins = self.__add_versions_entity(mins, (None, (3, 7)), "await in comprehension")
-
-    if self.async_for():
-      mins = self.__add_versions_entity(mins, (None, (3, 5)), "async for-loop")
-
-    if self.named_expressions():
-      mins = self.__add_versions_entity(mins, (None, (3, 8)), "named expressions")
-
-    if self.kw_only_args():
-      mins = self.__add_versions_entity(mins, (None, (3, 0)), "keyword-only arguments")
-
-    if self.pos_only_args():
-      mins = self.__add_versions_entity(mins, (None, (3, 8)), "position only arguments")
-
-    if self.nonlocal_stmt():
-      mins = self.__add_versions_entity(mins, (None, (3, 0)), "'nonlocal' statement")
-
-    if self.yield_from():
-      mins = self.__add_versions_entity(mins, (None, (3, 3)), "yield from")
-
-    if self.raise_cause():
-      mins = self.__add_versions_entity(mins, (None, (3, 0)), "exception cause")
+    for (flag, versions, info, plural) in LANGUAGE_FEATURES:
+      if getattr(self.__s, flag):
+        self.__add_versions_entity(mins, versions, info, plural=plural)
 
-    if self.raise_from_none():
-      mins = self.__add_versions_entity(mins, (None, (3, 3)), "raise ... from None")
-
-    if self.set_literals():
-      mins = self.__add_versions_entity(mins, ((2, 7), (3, 0)), "set literals")
-
-    if self.set_comprehension():
-      mins = self.__add_versions_entity(mins, ((2, 7), (3, 0)), "set comprehension")
-
-    if self.dict_comprehension():
-      mins = self.__add_versions_entity(mins, ((2, 7), (3, 0)), "dict comprehension")
-
-    if self.infix_matrix_multiplication():
-      mins = self.__add_versions_entity(mins, (None, (3, 5)), "infix matrix multiplication")
-
-    if self.continue_in_finally():
-      mins = self.__add_versions_entity(mins, (None, (3, 8)), "'continue' in 'finally'")
-
-    if self.modular_inverse_pow():
-      mins = self.__add_versions_entity(mins, (None, (3, 8)), "modular inverse 'pow()'")
-
-    if self.with_statement():
-      mins = self.__add_versions_entity(mins, ((2, 5), (3, 0)), "'with' statement")
-
-    if self.async_with_statement():
-      mins = self.__add_versions_entity(mins, (None, (3, 5)), "'async with' statement")
-
-    if self.multi_withitem():
-      mins = self.__add_versions_entity(mins, ((2, 7), (3, 1)),
-                                        "multiple context expressions in a 'with' statement",
-                                        plural=True)
-
-    if self.with_parentheses():
-      msg = "multiple context expressions in a `with` statement with parentheses"
-      mins = self.__add_versions_entity(mins, (None, (3, 9)), msg)
-
-    if self.generalized_unpacking():
-      mins = self.__add_versions_entity(mins, (None, (3, 5)), "generalized unpacking")
-
-    if self.unpacking_assignment():
-      mins = self.__add_versions_entity(mins, (None, (3, 0)), "unpacking assignment")
-
-    if self.ellipsis_out_of_slices():
-      mins = self.__add_versions_entity(mins, (None, (3, 0)),
-                                        "ellipsis literal (`...`) out of slices", plural=False)
-
-    if self.bytes_format():
-      # Since byte strings are a `str` synonym as of 2.6+, and thus also supports `%` formatting,
-      # (2, 6) is returned instead of None.
-      mins = self.__add_versions_entity(mins, ((2, 6), (3, 5)), "bytes format")
-
-    if self.bytearray_format():
-      mins = self.__add_versions_entity(mins, (None, (3, 5)), "bytearray format")
-
-    if self.dict_union():
-      mins = self.__add_versions_entity(mins, (None, (3, 9)), "dict union")
-    if self.dict_union_merge():
-      mins = self.__add_versions_entity(mins, (None, (3, 9)), "dict union merge")
-
-    if self.builtin_generic_type_annotations():
-      mins = self.__add_versions_entity(mins, (None, (3, 9)), "builtin generic type annotations")
-
-    if self.function_decorators():
-      mins = self.__add_versions_entity(mins, ((2, 4), (3, 0)), "function decorators")
-
-    if self.class_decorators():
-      mins = self.__add_versions_entity(mins, ((2, 6), (3, 0)), "class decorators")
-
-    if self.relaxed_decorators():
-      mins = self.__add_versions_entity(mins, (None, (3, 9)), "relaxed decorators")
-
-    if self.pattern_matching():
-      mins = self.__add_versions_entity(mins, (None, (3, 10)), "pattern matching")
-
-    if self.union_types():
-      mins = self.__add_versions_entity(mins, (None, (3, 10)), "union types as `X | Y`",
-                                        plural=True)
-
-    if self.super_no_args():
-      mins = self.__add_versions_entity(mins, (None, (3, 0)), "super() without arguments",
-                                        plural=False)
-
-    if self.except_star():
-      mins = self.__add_versions_entity(mins, (None, (3, 11)), "`except*`")
-
-    if self.metaclass_class_keyword():
-      mins = self.__add_versions_entity(mins, (None, (3, 0)), "'metaclass' class keyword")
-
-    for directive in self.strftime_directives():
-      if directive in STRFTIME_REQS:
-        vers = STRFTIME_REQS[directive]
-        mins = self.__add_versions_entity(mins, vers, "strftime directive '{}'".format(directive),
-                                          vvprint=True, entity=directive)
-
-    for directive in self.bytes_directives():
-      if directive in BYTES_REQS:
-        vers = BYTES_REQS[directive]
-        mins = self.__add_versions_entity(mins, vers, "bytes directive '{}'".format(directive),
-                                          vvprint=True, entity=directive)
-
-    for typecode in self.array_typecodes():
-      if typecode in ARRAY_TYPECODE_REQS:
-        vers = ARRAY_TYPECODE_REQS[typecode]
-        mins = self.__add_versions_entity(mins, vers, "array typecode '{}'".format(typecode),
-                                          vvprint=True, entity=typecode)
-
-    for name in self.codecs_error_handlers():
-      if name in CODECS_ERROR_HANDLERS:
-        vers = CODECS_ERROR_HANDLERS[name]
-        mins = self.__add_versions_entity(mins, vers, "codecs error handler name '{}'".format(name),
-                                          vvprint=True, entity=name)
-
-    for encoding in self.codecs_encodings():
-      for (encs, vers) in CODECS_ENCODINGS.items():
-        if encoding.lower() in encs:
-          mins = self.__add_versions_entity(mins, vers, "codecs encoding '{}'".format(encoding),
-                                            vvprint=True, entity=encoding)
-
-    mods = self.modules()
-    for mod in mods:
-      if mod in self.__s.mod_rules:
-        vers = self.__s.mod_rules[mod]
-        mins = self.__add_versions_entity(mins, vers, "'{}' module".format(mod), vvprint=True,
-                                          entity=mod)
-
-    mems = self.members()
-    for mem in mems:
-      if mem in self.__s.mod_mem_reqs_rules:
-        vers = self.__s.mod_mem_reqs_rules[mem]
-        mins = self.__add_versions_entity(mins, vers, "'{}' member".format(mem), vvprint=True,
-                                          entity=mem)
-
-    kwargs = self.kwargs()
-    for fn_kw in kwargs:
-      if fn_kw in self.__s.kwargs_reqs_rules:
-        vers = self.__s.kwargs_reqs_rules[fn_kw]
-        mins = self.__add_versions_entity(mins, vers, "'{}({})'".format(fn_kw[0], fn_kw[1]),
-                                          vvprint=True, entity=fn_kw)
-
-    for user_func_deco in self.user_function_decorators():
-      if user_func_deco in DECORATOR_USER_FUNCTIONS:
-        vers = DECORATOR_USER_FUNCTIONS[user_func_deco]
-        mins = self.__add_versions_entity(mins, vers, "'{}' user function decorator".
-                                          format(user_func_deco), vvprint=True,
-                                          entity=user_func_deco)
+    tables = (self.__s.mod_rules, self.__s.mod_mem_reqs_rules, self.__s.kwargs_reqs_rules)
+    entities = dict((kind, getattr(self, kind)()) for kind in ENTITY_KINDS)
+    for (vers, info, entity) in entity_versions(entities, tables):
+      mins = self.__add_versions_entity(mins, vers, info, vvprint=True, entity=entity)
     return mins
 
   def output_text(self):
-    # Throw away dups and sort. But only when not dumping AST node visits because it would throw
-    # away multiple statements that are similar in AST.
-    text = self.__s.output_text
+    # Throw away dups. But only when not dumping AST node visits because it would throw away
+    # multiple statements that are similar in AST. Findings are only formatted now, and sorted, by
+    # the format.
+    findings = self.__s.findings
     if not self.__s.config.print_visits():
-      text = list(set(text))
-    self.__s.output_text = self.__s.config.format().sort_output_lines(text)
+      findings = set(findings)
+    lines = self.__s.config.format().output_lines(self.__s.path, findings)
 
-    text = "\n".join(self.__s.output_text)
+    text = "\n".join(lines)
     if len(text) > 0:
       text += "\n"
     return text
@@ -565,7 +522,7 @@ class SourceVisitor(ast.NodeVisitor):
 
   def __nprint(self, msg):
     if not self.__s.config.quiet():  # pragma: no cover
-      self.__s.output_text.append(msg)
+      self.__s.findings.append(msg)
 
   # pragma: no cover
   def __verbose_print(self, msg, level, entity=None, line=None, versions=None, plural=None):
@@ -591,8 +548,9 @@ class SourceVisitor(ast.NodeVisitor):
     elif line is None and config_level > 2:
       line = self.__s.line
 
-    msg = fmt.format_output_line(msg, self.__s.path, line, col, versions, plural)
-    self.__s.output_text.append(msg)
+    if versions is not None:
+      versions = tuple(versions)
+    self.__s.findings.append(Finding(line, col, msg, versions, plural))
 
   def __vvprint(self, msg, entity=None, line=None, versions=None, plural=None):  # pragma: no cover
     self.__verbose_print(msg, 2, entity, line, versions, plural=plural)
@@ -604,19 +562,42 @@ class SourceVisitor(ast.NodeVisitor):
   def __vvvvprint(self, msg, entity=None, line=None, versions=None, plural=None):
     self.__verbose_print(msg, 4, entity, line, versions, plural=plural)
 
-  def __add_module(self, module, line=None, col=None):
+  def __add_module(self, module, line=None, col=None, root=None):
     if module in self.__s.user_defs:  # pragma: no cover
       self.__vvvvprint("Ignoring module '{}' because it's user-defined!".format(module))
       return
 
+    # Modules of attribute chains of a root module are only excluded along with it if they aren't
+    # known otherwise.
+    if root is None:
+      self.__s.module_roots.pop(module, None)
+    elif module not in self.__s.modules_set and module not in self.__s.excluded_modules:
+      self.__s.module_roots[module] = root
+
     if self.__s.config.is_excluded(module):
       self.__vvprint("Excluding module: {}".format(module))
+      if module not in self.__s.excluded_modules:
+        self.__s.excluded_modules.add(module)
+        self.__add_excluded("modules", module)
       return
 
-    if module not in self.__s.modules:
+    if module not in self.__s.modules_set:
       self.__s.modules.append(module)
+      self.__s.modules_set.add(module)
       self.__add_line_col(module, line, col)
 
+  def __add_excluded(self, kind, entity):
+    self.__s.excluded.append((kind, entity))
+
+  def __add_excluded_module(self, module, root):
+    """Records module of an attribute chain of excluded root module, which is excluded too."""
+    if module in self.__s.user_defs or module in self.__s.excluded_modules or \
+       module in self.__s.modules_set:
+      return
+    self.__s.excluded_modules.add(module)
+    self.__s.module_roots[module] = root
+    self.__add_excluded("modules", module)
+
   def __add_member(self, member, line=None, col=None):
     """Add member if fully-qualified name is known."""
     if member in self.__s.user_defs:
@@ -625,10 +606,14 @@ class SourceVisitor(ast.NodeVisitor):
 
     if self.__s.config.is_excluded(member):
       self.__vvprint("Excluding member: {}".format(member))
+      if member in self.__s.mod_mem_reqs_rules:
+        self.__add_excluded("members", member)
       return
 
     if member in self.__s.mod_mem_reqs_rules:
-      self.__s.members.append(member)
+      if member not in self.__s.members_set:
+        self.__s.members.append(member)
+        self.__s.members_set.add(member)
       self.__add_line_col(member, line, col)
 
   def __add_kwargs(self, function, keyword, line=None, col=None):
@@ -638,6 +623,7 @@ class SourceVisitor(ast.NodeVisitor):
 
     if self.__s.config.is_excluded_kwarg(function, keyword):
       self.__vvprint("Excluding kwarg: {}({})".format(function, keyword))
+      self.__add_excluded("kwargs", (function, keyword))
       return False
 
     fn_kw = (function, keyword)
@@ -654,6 +640,8 @@ class SourceVisitor(ast.NodeVisitor):
 
     if self.__s.config.is_excluded(ufd):  # pragma: no cover
       self.__vvprint("Excluding user function decorator: {}".format(ufd))
+      if ufd in DECORATOR_USER_FUNCTIONS:
+        self.__add_excluded("user_function_decorators", ufd)
       return
 
     if ufd in DECORATOR_USER_FUNCTIONS:
@@ -679,6 +667,7 @@ class SourceVisitor(ast.NodeVisitor):
           name = arg.s
           if self.__s.config.is_excluded_codecs_error_handler(name):
             self.__vvprint("Excluding codecs error handler: {}".format(name))
+            self.__add_excluded("codecs_error_handlers", name)
           else:
             self.__s.codecs_error_handlers.append(name)
             self.__add_line_col(name, node.lineno)
@@ -689,6 +678,7 @@ class SourceVisitor(ast.NodeVisitor):
           name = kw.value.s
           if self.__s.config.is_excluded_codecs_error_handler(name):
             self.__vvprint("Excluding codecs error handler: {}".format(name))
+            self.__add_excluded("codecs_error_handlers", name)
             continue
           self.__s.codecs_error_handlers.append(name)
           self.__add_line_col(name, node.lineno)
@@ -703,6 +693,7 @@ class SourceVisitor(ast.NodeVisitor):
             name = arg.s
             if self.__s.config.is_excluded_codecs_encoding(name):
               self.__vvprint("Excluding codecs encoding: {}".format(name))
+              self.__add_excluded("codecs_encodings", name)
               continue
             self.__s.codecs_encodings.append(name)
             self.__add_line_col(name, node.lineno)
@@ -713,6 +704,7 @@ class SourceVisitor(ast.NodeVisitor):
             name = kw.value.s
             if self.__s.config.is_excluded_codecs_encoding(name):
               self.__vvprint("Excluding codecs encoding: {}".format(name))
+              self.__add_excluded("codecs_encodings", name)
               continue
             self.__s.codecs_encodings.append(name)
             self.__add_line_col(name, node.lineno)
@@ -748,6 +740,27 @@ class SourceVisitor(ast.NodeVisitor):
   def __resolve_module_name(self, name):
     return self.__s.module_as_name[name] if name in self.__s.module_as_name else name
 
+  def __get_attribute_chain_name(self, node):
+    """Retrieve full attribute name path of plain attribute chains, like ["a", "b", "c"] of `a.b.c`,
+or None if node isn't such a chain. Names are derived from the names of inner attributes and
+remembered such that visiting each attribute of long chains is linear and not quadratic."""
+    names = self.__s.attribute_names
+    chain = []
+    while isinstance(node, ast.Attribute) and node not in names:
+      chain.append(node)
+      node = node.value
+    if isinstance(node, ast.Attribute):
+      full_name = names[node]
+    elif isinstance(node, ast.Name) and len(chain) > 0:
+      full_name = [self.__resolve_module_name(node.id)]
+    else:
+      return None
+
+    for attr in reversed(chain):
+      full_name = full_name + [attr.attr]
+      names[attr] = full_name
+    return list(full_name)
+
   def __get_attribute_name(self, node):
     """Retrieve full attribute name path, like ["ipaddress", "IPv4Address"] from:
     `Attribute(value=Name(id='ipaddress', ctx=Load()), attr='IPv4Address', ctx=Load())`
@@ -755,6 +768,10 @@ class SourceVisitor(ast.NodeVisitor):
     `Attribute(value=Call(func=Name(id='Fraction', ctx=Load()), args=[Num(n=42)], keywords=[]),
                attr='as_integer_ratio', ctx=Load())`
     """
+    full_name = self.__get_attribute_chain_name(node)
+    if full_name is not None:
+      return full_name
+
     full_name = []
     primi_type = False
     for attr in ast.walk(node):
@@ -865,40 +882,83 @@ class SourceVisitor(ast.NodeVisitor):
       self.__s.line_col_entities[entity] = (line, col)
 
   def __add_array_typecode(self, typecode, line=None, col=None):
-    if typecode not in self.__s.array_typecodes:
+    if typecode not in self.__s.array_typecodes_set:
       self.__s.array_typecodes.append(typecode)
+      self.__s.array_typecodes_set.add(typecode)
       self.__add_line_col(typecode, line, col)
 
   def __is_no_line(self, line):
     return line in self.__no_lines
 
   def __after_visit_all(self):
-    # Remove any modules and members that were added before any known user-definitions. Do it in
-    # reverse so the indices are kept while traversing!
-    for ud in self.__s.user_defs:
-      for i in reverse_range(self.__s.modules):
-        if self.__s.modules[i] == ud:  # pragma: no cover
-          self.__vvvvprint("Ignoring module '{}' because it's user-defined!".format(ud))
-          del self.__s.modules[i]
-
-      for i in reverse_range(self.__s.members):
-        if self.__s.members[i] == ud:  # pragma: no cover
-          self.__vvvvprint("Ignoring member '{}' because it's user-defined!".format(ud))
-          del self.__s.members[i]
+    # Remove any modules and members that were added before any known user-definitions.
+    user_defs = self.__s.user_defs
+    if len(self.__s.modules_set & user_defs) > 0:  # pragma: no cover
+      for ud in sorted(self.__s.modules_set & user_defs):
+        self.__vvvvprint("Ignoring module '{}' because it's user-defined!".format(ud))
+      self.__s.modules = [mod for mod in self.__s.modules if mod not in user_defs]
+      self.__s.modules_set -= user_defs
+
+    if len(self.__s.members_set & user_defs) > 0:  # pragma: no cover
+      for ud in sorted(self.__s.members_set & user_defs):
+        self.__vvvvprint("Ignoring member '{}' because it's user-defined!".format(ud))
+      self.__s.members = [mem for mem in self.__s.members if mem not in user_defs]
+      self.__s.members_set -= user_defs
 
   # Entry point of source visitor.
   def tour(self, node):
     self.visit(node)
     self.__after_visit_all()
 
+  def visit(self, node):
+    cls = node.__class__
+    handler = self.__dispatch.get(cls)
+    if handler is None:
+      handler = self.__lookup_handler(cls)
+    return handler(self, node)
+
+  def __lookup_handler(self, cls):
+    """Looks up handler of node class and adds it to the dispatch table. The class is added to the
+inert node classes if its nodes can never affect results."""
+    name = cls.__name__
+    handler = getattr(type(self), "visit_" + name, None)
+    if handler is None:
+      handler = type(self).generic_visit
+
+      # Leaves without line numbers, like most operators and contexts, only affect printed visits.
+      # pylint: disable=protected-access
+      if len(cls._fields) == 0 and "lineno" not in cls._attributes:
+        self.__inert.add(cls)
+    elif name in NO_OP_NODES and handler is getattr(SourceVisitor, "visit_" + name):
+      self.__inert.add(cls)
+    self.__dispatch[cls] = handler
+    return handler
+
   def generic_visit(self, node):
-    if hasattr(node, "lineno"):
-      self.__s.line = node.lineno
-    self.__s.depth += 1
-    if self.__s.config.print_visits():
-      self.__nprint("| " * self.__s.depth + ast.dump(node))  # pragma: no cover
-    super().generic_visit(node)
-    self.__s.depth -= 1
+    state = self.__s
+    lineno = getattr(node, "lineno", None)
+    if lineno is not None:
+      state.line = lineno
+    state.depth += 1
+    if self.__print_visits:
+      self.__nprint("| " * state.depth + ast.dump(node))  # pragma: no cover
+
+    # Same as `ast.NodeVisitor.generic_visit()` but without the overhead of `ast.iter_fields()`, and
+    # inert nodes are skipped.
+    visit = self.visit
+    skipped = self.__skipped
+    inert_constant = self.__inert_constant
+    for field in node._fields:  # pylint: disable=protected-access
+      value = getattr(node, field, None)
+      if not isinstance(value, list):
+        value = (value,)
+      for item in value:
+        cls = item.__class__
+        if cls in skipped or not isinstance(item, ast.AST) or\
+           (cls is inert_constant and item.value.__class__ in INERT_CONSTANT_TYPES):
+          continue
+        visit(item)
+    state.depth -= 1
 
   def visit_Import(self, node):
     if self.__is_no_line(node.lineno):
@@ -950,6 +1010,8 @@ class SourceVisitor(ast.NodeVisitor):
     if node.id == "long":
       if self.__s.config.is_excluded("long"):
         self.__vvprint("Excluding long type")
+        if "long" not in self.__s.user_defs:
+          self.__add_excluded("features", "longv2")
       elif "long" in self.__s.user_defs:
         self.__vvvvprint("Ignoring member 'long' because it's user-defined!")
       else:
@@ -1094,12 +1156,15 @@ class SourceVisitor(ast.NodeVisitor):
     line = node.lineno
     if len(full_name) > 0:
       dotted = dotted_name(full_name)
-      for mod in self.__s.modules:
-        if full_name[0] == mod:
-          self.__add_module(dotted, line)
-        elif full_name[0] in self.__s.import_mem_mod:
-          self.__add_member(dotted_name([self.__s.import_mem_mod[full_name[0]], full_name]),
-                            line)
+      if full_name[0] in self.__s.modules_set:
+        self.__add_module(dotted, line, root=full_name[0])
+      elif full_name[0] in self.__s.excluded_modules:
+        self.__add_excluded_module(dotted, full_name[0])
+
+      # Imported members are resolved if any other module than the attribute's name is known.
+      if full_name[0] in self.__s.import_mem_mod and\
+         len(self.__s.modules_set) > int(full_name[0] in self.__s.modules_set):
+        self.__add_member(dotted_name([self.__s.import_mem_mod[full_name[0]], full_name]), line)
       self.__add_member(dotted, line)
 
       if full_name[0] in self.__s.name_res:
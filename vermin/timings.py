@@ -0,0 +1,66 @@
+from heapq import nlargest
+
+# Phases of processing a file in the order they happen.
+PHASES = ("read", "cache", "parse", "comments", "visit", "versions", "format")
+
+class Timings:
+  """Aggregates per-phase durations and byte counts of processed files and reports the totals
+together with the slowest files."""
+
+  def __init__(self, slowest=10):
+    self.__slowest = slowest
+    self.__files = 0
+    self.__bytes = 0
+    self.__totals = dict((phase, 0.0) for phase in PHASES)
+    self.__file_totals = []  # (seconds, path, bytes)
+
+  def files(self):
+    return self.__files
+
+  def bytes(self):
+    return self.__bytes
+
+  def totals(self):
+    """Returns dictionary of phase -> total seconds spent across all files."""
+    return self.__totals
+
+  def slowest(self):
+    """Returns list of `(seconds, path, bytes)` of the slowest files, the slowest first."""
+    return nlargest(self.__slowest, self.__file_totals)
+
+  def add(self, proc_res):
+    """Adds timings of processed result."""
+    self.__files += 1
+    self.__bytes += proc_res.bytes
+    for (phase, secs) in proc_res.timings.items():
+      self.__totals[phase] = self.__totals.get(phase, 0.0) + secs
+    self.__file_totals.append((sum(proc_res.timings.values()), proc_res.path, proc_res.bytes))
+
+  def report(self):
+    """Returns lines of report of per-phase totals and the slowest files."""
+    total = sum(self.__totals.values())
+    lines = ["Timings of {} files ({} bytes):".format(self.__files, self.__bytes)]
+    for phase in PHASES:
+      secs = self.__totals[phase]
+      share = secs / total * 100 if total > 0 else 0
+      lines.append("  {:<9} {:>9.3f}s {:>5.1f}%".format(phase, secs, share))
+    lines.append("  {:<9} {:>9.3f}s".format("total", total))
+
+    slowest = self.slowest()
+    if len(slowest) > 0:
+      lines.append("Slowest {} files:".format(len(slowest)))
+      for (secs, path, size) in slowest:
+        lines.append("  {:>9.3f}s {:>10} bytes  {}".format(secs, size, path))
+    return lines
+
+  def record(self):
+    """Returns report as a dictionary, see `Format.output_report()`."""
+    return {
+      "type": "timings",
+      "files": self.__files,
+      "bytes": self.__bytes,
+      "phases": dict((phase, self.__totals[phase]) for phase in PHASES),
+      "total": sum(self.__totals.values()),
+      "slowest": [{"seconds": secs, "path": path, "bytes": size}
+                  for (secs, path, size) in self.slowest()],
+    }
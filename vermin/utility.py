@@ -1,6 +1,7 @@
 import re
 from math import floor
 from functools import reduce
+from collections import namedtuple
 
 def reverse_range(values):
   """Yields reverse range of values: list(reverse_range([1, 2, 3])) -> [2, 1, 0]."""
@@ -145,6 +146,19 @@ def sort_line_column_parsable(key):
     return line + h
   return line + float(col) / 1000 + h
 
+# Finding of a visited file, which is formatted for output by formats, see
+# `Format.format_output_line()`. Line and column numbers are None if unknown, and minimum versions
+# are None if the finding is only informational.
+Finding = namedtuple("Finding", ("line", "col", "msg", "versions", "plural"))
+
+def sort_findings_key(finding):
+  """Sorts findings by line and column numbers and then by message, where unknown numbers come
+first. Raw lines that aren't findings, like dumps of AST node visits, are thought of as having no
+line and column numbers. This function can be used with `list.sort(key=sort_findings_key)`."""
+  if isinstance(finding, str):
+    return (0, -1, finding)
+  return (finding.line or 0, -1 if finding.col is None else finding.col, finding.msg)
+
 def format_title_descs(pairs, titles, indent=0):
   res = []
   longest = len(max(titles, key=len))
@@ -189,3 +203,43 @@ def parse_target(target):
     return None
 
   return (exact, elms)
+
+def parse_target_set(value):
+  """Parses set of one or two targets separated by ':', like '2.7-:3.6-', into a list of targets
+sorted by version, see `parse_target()`. Returns None if invalid."""
+  targets = [parse_target(target) for target in value.split(":")]
+  if not 0 < len(targets) < 3 or any(target is None for target in targets):
+    return None
+  return sorted(targets, key=lambda t: t[1])
+
+def parse_shard(value):
+  """Parses shard 'i/N', where 1 <= i <= N, into a tuple of index and count. Returns None if
+invalid."""
+  parts = value.split("/")
+  if len(parts) != 2 or not all(part.isdigit() for part in parts):
+    return None
+  (index, count) = (int(parts[0]), int(parts[1]))
+  if not 1 <= index <= count:
+    return None
+  return (index, count)
+
+def violates_targets(versions, targets):
+  """Returns whether minimum versions violate targets, which are tuples of exactness and version. A
+single target of one major version doesn't constrain the other one."""
+  targets = [t for (_, t) in targets]
+  if len(targets) == 1:
+    if targets[0][0] < 3:
+      targets.append(None)
+    else:
+      targets = [None, targets[0]]
+
+  for i in (0, 1):
+    if targets[i] is not None and (versions[i] is None or versions[i] > targets[i]):
+      return True
+  return False
+
+def targets_met(targets, reqs):
+  """Returns whether required versions, excluding incompatible ones, meet targets."""
+  return len(reqs) == len(targets) and\
+    all(((exact and target == req) or (not exact and target >= req))
+        for ((exact, target), req) in zip(targets, reqs))
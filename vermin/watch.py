@@ -0,0 +1,92 @@
+import multiprocessing as mp
+from time import sleep
+
+from .detection import walk_paths
+from .printing import nprint, vprint
+from .processor import Processor
+
+# Seconds between polls of the watched paths for changes.
+POLL_INTERVAL = 1.0
+
+class Watcher:
+  """Watches paths for changes and only reanalyzes files that are added or modified. Results of all
+files are kept in memory such that aggregated results are recomputed without reanalyzing untouched
+files. Changes are detected by polling modification times and sizes of detected files, which works
+the same on all platforms without any dependencies."""
+
+  def __init__(self, paths, config, ignore_chars=None, interval=POLL_INTERVAL):
+    self.__paths = paths
+    self.__config = config
+    self.__ignore_chars = ignore_chars
+    self.__interval = interval
+    self.__stats = {}    # Path -> (modification time, size) when last analyzed.
+    self.__results = {}  # Path -> processing result, or None if not python code.
+
+  def results(self):
+    """Returns list of results of all files in path order."""
+    return [self.__results[path] for path in sorted(self.__results)]
+
+  def poll(self):
+    """Detects files of the watched paths and returns tuple of sorted list of paths added or
+modified since they were last analyzed, sorted list of paths removed, and dictionary of path ->
+(modification time, size) of all detected paths."""
+    config = self.__config
+    stats = {}
+    # The walk already stat'ed each file so it isn't done again.
+    for (path, size, mtime) in walk_paths(self.__paths, config.analyze_hidden(),
+                                          self.__ignore_chars, config.scan_symlink_folders(),
+                                          config):
+      stats[path] = (mtime, size)
+    changed = sorted(path for (path, stat) in stats.items() if self.__stats.get(path) != stat)
+    removed = sorted(path for path in self.__stats if path not in stats)
+    return (changed, removed, stats)
+
+  def update(self, processor):
+    """Polls for changes and reanalyzes changed files using processor. Returns list of results of
+the reanalyzed files, or None if nothing changed."""
+    config = self.__config
+    (changed, removed, stats) = self.poll()
+    if len(changed) == 0 and len(removed) == 0:
+      return None
+
+    for path in removed:
+      del self.__stats[path]
+      del self.__results[path]
+
+    # Stats are from before analyzing such that files modified meanwhile are reanalyzed next time.
+    sizes = dict((path, stats[path][1]) for path in changed)
+    results = processor.process_results(changed, config, config.processes(), sizes)
+    for (path, res) in zip(changed, results):
+      self.__stats[path] = stats[path]
+      self.__results[path] = res
+    return results
+
+  def watch(self, report):
+    """Analyzes the watched paths and then reanalyzes changed files every poll interval until
+interrupted. Each time, results of the reanalyzed files are output and `report` is invoked with the
+aggregated results of all files, see `Processor.aggregate()`. Returns the last code returned by
+`report`."""
+    config = self.__config
+    processes = config.processes()
+    # pylint: disable=consider-using-with
+    pool = mp.Pool(processes=processes) if processes > 1 else None
+    processor = Processor(pool)
+    code = 0
+    try:
+      while True:
+        results = self.update(processor)
+        if results is not None:
+          Processor.aggregate(results, config)
+          if len(self.__results) == 0:
+            nprint("No files to analyze!", config)
+          else:
+            code = report(Processor.aggregate(self.results(), config, output=False))
+          vprint("Watching for changes..", config)
+        sleep(self.__interval)
+    except KeyboardInterrupt:
+      pass
+    finally:
+      if pool:
+        pool.close()
+        pool.join()
+    return code
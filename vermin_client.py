@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""Thin client of the Vermin daemon started via `vermin --daemon <path>`.
+
+Usage: vermin_client.py <socket path> [--shutdown | options.. <paths..>]
+
+The options and paths are the same as for `vermin` and are analyzed by the daemon relative to the
+current working folder. Only the standard library is imported such that requests don't pay for
+importing Vermin itself.
+"""
+import os
+import sys
+import json
+import socket
+
+def send(path, request):
+  """Sends request to the daemon listening on Unix socket at path and returns its response."""
+  client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+  try:
+    client.connect(path)
+    client.sendall((json.dumps(request) + "\n").encode("utf-8"))
+    chunks = []
+    while True:
+      chunk = client.recv(65536)
+      if len(chunk) == 0:
+        break
+      chunks.append(chunk)
+  finally:
+    client.close()
+  return json.loads(b"".join(chunks).decode("utf-8"))
+
+def request(path, args, cwd=None):
+  """Requests analysis using command line arguments in working folder `cwd`, or the current one,
+and returns tuple of exit code and output."""
+  response = send(path, {"cwd": cwd or os.getcwd(), "args": list(args)})
+  return (response["code"], response["output"])
+
+def shutdown(path):
+  """Requests the daemon to stop serving."""
+  send(path, {"shutdown": True})
+
+def main():
+  if len(sys.argv) < 2:
+    print(__doc__.strip())
+    sys.exit(1)
+
+  (path, args) = (sys.argv[1], sys.argv[2:])
+  try:
+    if args == ["--shutdown"]:
+      shutdown(path)
+      sys.exit(0)
+    (code, output) = request(path, args)
+  except (socket.error, ValueError) as ex:
+    print("Could not request Vermin daemon at {}: {}".format(path, ex))
+    sys.exit(1)
+  sys.stdout.write(output)
+  sys.exit(code)
+
+if __name__ == "__main__":
+  main()